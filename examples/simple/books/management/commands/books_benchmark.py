@@ -0,0 +1,238 @@
+"""
+Benchmark ``rest_framework_tricks`` hot paths on the example models.
+"""
+
+from copy import deepcopy
+from decimal import Decimal
+import timeit
+
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+from rest_framework_tricks.helpers import (
+    flatten_nested_data,
+    unflatten_nested_data,
+)
+from rest_framework_tricks.serializers import build_write_plan
+
+from books.serializers import AuthorSerializer, ProfileSerializer
+
+import factories
+
+
+DEFAULT_NUMBER_OF_ROWS = 1_000
+DEFAULT_NUMBER_OF_REPEATS = 5
+
+
+class Command(BaseCommand):
+    """Benchmark."""
+
+    help = "Benchmark rest_framework_tricks on the example models."
+
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            action="store",
+            dest="rows",
+            type=int,
+            default=DEFAULT_NUMBER_OF_ROWS,
+            help="Number of (unsaved) rows to benchmark against.",
+        )
+        parser.add_argument(
+            "--repeat",
+            action="store",
+            dest="repeat",
+            type=int,
+            default=DEFAULT_NUMBER_OF_REPEATS,
+            help="Number of repeats (best one is reported).",
+        )
+
+    def report(self, name, func, rows, repeat, unit="row"):
+        """Time ``func`` and print the best per-row timing.
+
+        :param name: Name of the benchmark.
+        :param func: Callable processing all of the rows once.
+        :param rows: Number of rows processed by a single ``func`` call.
+        :param repeat: Number of repeats.
+        :param unit: Name of the unit processed.
+        """
+        best = min(timeit.repeat(func, number=1, repeat=repeat))
+        self.stdout.write(
+            "{:<48} {:>10.3f} us/{}".format(
+                name, best * 1_000_000 / rows, unit
+            )
+        )
+
+    def benchmark_nested_proxy_field(self, rows, repeat):
+        """Benchmark reading NestedProxyField values."""
+        profiles = factories.ProfileFactory.build_batch(rows)
+        authors = factories.AuthorFactory.build_batch(rows)
+        books = factories.BookFactory.build_batch(rows)
+
+        self.report(
+            "NestedProxyField: Profile.information",
+            lambda: [__p.information for __p in profiles],
+            rows,
+            repeat,
+        )
+        self.report(
+            "NestedProxyField: Author.contact_information",
+            lambda: [__a.contact_information for __a in authors],
+            rows,
+            repeat,
+        )
+        self.report(
+            "NestedProxyField: Book.publishing_information",
+            lambda: [__b.publishing_information for __b in books],
+            rows,
+            repeat,
+        )
+        self.report(
+            "NestedProxyField: dict(Profile.information)",
+            lambda: [dict(__p.information) for __p in profiles],
+            rows,
+            repeat,
+        )
+        self.report(
+            "NestedProxyField: Profile.information (one key)",
+            lambda: [
+                __p.information["data"]["bank_information"]["bank_name"]
+                for __p in profiles
+            ],
+            rows,
+            repeat,
+        )
+
+    def benchmark_serializers(self, rows, repeat):
+        """Benchmark list serialization of nested proxy serializers."""
+        profiles = factories.ProfileFactory.build_batch(rows)
+        authors = factories.AuthorFactory.build_batch(rows)
+
+        for __serializer_class, __instances in (
+            (ProfileSerializer, profiles),
+            (AuthorSerializer, authors),
+        ):
+            __meta = type(
+                "Meta",
+                (__serializer_class.Meta,),
+                {"compiled_representation": False},
+            )
+            __generic_serializer_class = type(
+                __serializer_class.__name__,
+                (__serializer_class,),
+                {"Meta": __meta},
+            )
+            for __name, __klass in (
+                ("generic", __generic_serializer_class),
+                ("compiled", __serializer_class),
+            ):
+                self.report(
+                    "Serializer: {} ({})".format(
+                        __serializer_class.__name__, __name
+                    ),
+                    lambda: __klass(__instances, many=True).data,
+                    rows,
+                    repeat,
+                )
+
+    def benchmark_serializer_setup(self, repeat):
+        """Benchmark setting up nested proxy serializers (all fields)."""
+
+        def walk(serializer):
+            for __field in serializer.fields.values():
+                if isinstance(__field, serializers.Serializer):
+                    walk(__field)
+
+        def clear_cache(serializer_class):
+            for __klass in serializer_class.__mro__:
+                if "_nested_proxy_field_prototypes" in __klass.__dict__:
+                    delattr(__klass, "_nested_proxy_field_prototypes")
+            for __field in serializer_class._declared_fields.values():
+                if isinstance(__field, serializers.Serializer):
+                    clear_cache(__field.__class__)
+
+        for __serializer_class in (ProfileSerializer, AuthorSerializer):
+            __uncached_serializer_class = type(
+                __serializer_class.__name__,
+                (__serializer_class,),
+                {"get_fields": serializers.ModelSerializer.get_fields},
+            )
+            clear_cache(__serializer_class)
+            self.report(
+                "Setup: {} (startup)".format(__serializer_class.__name__),
+                lambda: walk(__serializer_class()),
+                1,
+                1,
+                "serializer",
+            )
+            for __name, __klass in (
+                ("uncached", __uncached_serializer_class),
+                ("cached", __serializer_class),
+            ):
+                self.report(
+                    "Setup: {} (per request, {})".format(
+                        __serializer_class.__name__, __name
+                    ),
+                    lambda: walk(__klass()),
+                    1,
+                    repeat * 100,
+                    "serializer",
+                )
+
+    def benchmark_helpers(self, rows, repeat):
+        """Benchmark flattening (and unflattening) large nested payloads."""
+
+        def flatten_nested_data_deepcopy(validated_data, nested_field_names):
+            # Former implementation (one level deep)
+            validated_data = deepcopy(validated_data)
+            for __name in nested_field_names:
+                data = validated_data.pop(__name, None)
+                if data:
+                    validated_data.update(data)
+            return validated_data
+
+        write_plan = build_write_plan(ProfileSerializer())
+        payloads = []
+        for __profile in factories.ProfileFactory.build_batch(rows):
+            __data = ProfileSerializer(__profile).data
+            __data["tags"] = [Decimal(__i) for __i in range(100)]
+            payloads.append(__data)
+        flat_payloads = [
+            flatten_nested_data(__data, write_plan) for __data in payloads
+        ]
+
+        self.report(
+            "Helpers: flatten_nested_data (deepcopy)",
+            lambda: [
+                flatten_nested_data_deepcopy(__data, list(write_plan))
+                for __data in payloads
+            ],
+            rows,
+            repeat,
+        )
+        self.report(
+            "Helpers: flatten_nested_data",
+            lambda: [
+                flatten_nested_data(__data, write_plan) for __data in payloads
+            ],
+            rows,
+            repeat,
+        )
+        self.report(
+            "Helpers: unflatten_nested_data",
+            lambda: [
+                unflatten_nested_data(__data, write_plan)
+                for __data in flat_payloads
+            ],
+            rows,
+            repeat,
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        self.benchmark_nested_proxy_field(rows, repeat)
+        self.benchmark_serializers(rows, repeat)
+        self.benchmark_serializer_setup(repeat)
+        self.benchmark_helpers(rows, repeat)
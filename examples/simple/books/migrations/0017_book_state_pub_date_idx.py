@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0016_auto_20170714_1020"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["state", "publication_date", "id"],
+                name="books_book_state_pub_date_idx",
+            ),
+        ),
+    ]
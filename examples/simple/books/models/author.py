@@ -4,6 +4,7 @@ Author model.
 
 from django.db import models
 
+from rest_framework_tricks.models import NestedProxyManager
 from rest_framework_tricks.models.fields import NestedProxyField
 
 __all__ = (
@@ -30,6 +31,8 @@ class Author(models.Model):
     company_email = models.EmailField(null=True, blank=True)
     company_website = models.URLField(null=True, blank=True)
 
+    objects = NestedProxyManager()
+
     # # This does not cause a model change
     # personal_contact_information = NestedProxyField(
     #     'email',
@@ -4,6 +4,7 @@ Book model.
 
 from django.db import models
 
+from rest_framework_tricks.models import NestedProxyManager
 from rest_framework_tricks.models.fields import NestedProxyField
 
 from ..constants import (
@@ -46,6 +47,8 @@ class Book(models.Model):
         "books.Tag", related_name="books", blank=True
     )
 
+    objects = NestedProxyManager()
+
     # This does not cause a model change
     publishing_information = NestedProxyField(
         "publication_date",
@@ -64,6 +67,12 @@ class Book(models.Model):
         """Meta options."""
 
         ordering = ["isbn"]
+        indexes = [
+            models.Index(
+                fields=["state", "publication_date", "id"],
+                name="books_book_state_pub_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -4,6 +4,7 @@ Profile models.
 
 from django.db import models
 
+from rest_framework_tricks.models import NestedProxyManager
 from rest_framework_tricks.models.fields import NestedProxyField
 
 __all__ = ("Profile",)
@@ -33,6 +34,8 @@ class Profile(models.Model):
         max_length=200, null=True, blank=True
     )
 
+    objects = NestedProxyManager()
+
     # This does not cause a model change
     personal_information = NestedProxyField(
         "salutation", "first_name", "last_name", "birth_date", "biography"
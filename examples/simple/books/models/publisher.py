@@ -4,6 +4,7 @@ Publisher models.
 
 from django.db import models
 
+from rest_framework_tricks.models import NestedProxyManager
 from rest_framework_tricks.models.fields import NestedProxyField
 
 __all__ = ("Publisher",)
@@ -20,6 +21,8 @@ class Publisher(models.Model):
     country = models.CharField(max_length=255, null=True, blank=True)
     website = models.URLField()
 
+    objects = NestedProxyManager()
+
     # This does not cause a model change
     address_information = NestedProxyField(
         "address", "city", "state_province", "country", as_object=True
@@ -12,6 +12,7 @@ from ..models import Book, BookProxy, BookProxy2
 
 __all__ = (
     "BookSerializer",
+    "BookStockSerializer",
     "BookProxySerializer",
     "BookProxy2Serializer",
 )
@@ -76,6 +77,22 @@ class BookSerializer(HyperlinkedModelSerializer):
         )
 
 
+class BookStockSerializer(ModelSerializer):
+    """Book stock serializer (updated without fetching the book)."""
+
+    stock_information = StockInformationSerializer(required=False)
+
+    class Meta:
+        """Meta options."""
+
+        model = Book
+        fields = (
+            "id",
+            "stock_information",
+        )
+        direct_update = True
+
+
 # ****************************************************************************
 # ***************************** BookProxy ************************************
 # ****************************************************************************
@@ -3,6 +3,7 @@ Profile serializers.
 """
 
 from rest_framework import serializers
+from rest_framework_tricks.fields import RawJSONField
 from rest_framework_tricks.serializers import (
     HyperlinkedModelSerializer,
     ModelSerializer,
@@ -10,7 +11,10 @@ from rest_framework_tricks.serializers import (
 
 from ..models import Profile
 
-__all__ = ("ProfileSerializer",)
+__all__ = (
+    "ProfileJSONSerializer",
+    "ProfileSerializer",
+)
 
 # ****************************************************************************
 # ******************************* Profile ************************************
@@ -146,3 +150,18 @@ class ProfileSerializer(ModelSerializer):
             "id",
             "information",
         )
+
+
+class ProfileJSONSerializer(serializers.ModelSerializer):
+    """Profile serializer (nested data is JSON built by the database)."""
+
+    information = RawJSONField(source="information_json")
+
+    class Meta:
+        """Meta options."""
+
+        model = Profile
+        fields = (
+            "id",
+            "information",
+        )
@@ -26,8 +26,11 @@ from .viewsets import (
     AuthorViewSet,
     AuthorProxyViewSet,
     BookViewSet,
+    BookStockViewSet,
     BookProxyViewSet,
+    BookProxyKeysetViewSet,
     BookProxy2ViewSet,
+    ProfileJSONViewSet,
     ProfileViewSet,
     PublisherViewSet,
 )
@@ -48,14 +51,26 @@ router = DefaultRouter()
 
 router.register(r"books", BookViewSet, **{BASENAME: "book"})
 
+router.register(r"books-stock", BookStockViewSet, **{BASENAME: "bookstock"})
+
 router.register(r"proxy-books", BookProxyViewSet, **{BASENAME: "bookproxy"})
 
+router.register(
+    r"proxy-books-keyset",
+    BookProxyKeysetViewSet,
+    **{BASENAME: "bookproxykeyset"},
+)
+
 router.register(r"proxy2-books", BookProxy2ViewSet, **{BASENAME: "bookproxy2"})
 
 router.register(r"publishers", PublisherViewSet, **{BASENAME: "publisher"})
 
 router.register(r"profiles", ProfileViewSet, **{BASENAME: "profile"})
 
+router.register(
+    r"profiles-json", ProfileJSONViewSet, **{BASENAME: "profilejson"}
+)
+
 router.register(r"authors", AuthorViewSet, **{BASENAME: "author"})
 
 router.register(
@@ -2,10 +2,16 @@
 View sets.
 """
 
-from rest_framework.viewsets import ModelViewSet
+from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 from rest_framework.permissions import AllowAny
 
 from rest_framework_tricks.filters import OrderingFilter
+from rest_framework_tricks.mixins import (
+    DirectUpdateModelMixin,
+    SparseFieldsetsMixin,
+)
+from rest_framework_tricks.pagination import KeysetPagination
+from rest_framework_tricks.renderers import JSONRenderer
 
 from .models import (
     Author,
@@ -20,9 +26,11 @@ from .serializers import (
     AuthorSerializer,
     AuthorProxySerializer,
     BookSerializer,
+    BookStockSerializer,
     BookProxySerializer,
     BookProxy2Serializer,
     PublisherSerializer,
+    ProfileJSONSerializer,
     ProfileSerializer,
 )
 
@@ -30,21 +38,32 @@ __all__ = (
     "AuthorViewSet",
     "AuthorProxyViewSet",
     "BookViewSet",
+    "BookStockViewSet",
     "BookProxyViewSet",
+    "BookProxyKeysetViewSet",
     "BookProxy2ViewSet",
     "PublisherViewSet",
+    "ProfileJSONViewSet",
     "ProfileViewSet",
 )
 
 
-class BookViewSet(ModelViewSet):
-    """Book ViewSet."""
+class BookViewSet(SparseFieldsetsMixin, ModelViewSet):
+    """Book ViewSet (supports sparse fieldsets, e.g. ``?fields=id,title``)."""
 
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [AllowAny]
 
 
+class BookStockViewSet(DirectUpdateModelMixin, ReadOnlyModelViewSet):
+    """Book stock ViewSet (updates do not fetch the book)."""
+
+    queryset = Book.objects.all()
+    serializer_class = BookStockSerializer
+    permission_classes = [AllowAny]
+
+
 class BookProxyViewSet(ModelViewSet):
     """Book proxy ViewSet."""
 
@@ -58,6 +77,16 @@ class BookProxyViewSet(ModelViewSet):
         "status": ["state", "publication_date"],
     }
     ordering = ("id",)
+    ordering_tie_breaker = "id"
+    ordering_indexes = {
+        "status": "books_book_state_pub_date_idx",
+    }
+
+
+class BookProxyKeysetViewSet(BookProxyViewSet):
+    """Book proxy ViewSet (keyset pagination)."""
+
+    pagination_class = KeysetPagination
 
 
 class BookProxy2ViewSet(ModelViewSet):
@@ -104,3 +133,14 @@ class ProfileViewSet(ModelViewSet):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
     permission_classes = [AllowAny]
+
+
+class ProfileJSONViewSet(ReadOnlyModelViewSet):
+    """Profile ViewSet (nested data is JSON built by the database)."""
+
+    queryset = Profile.objects.annotate_nested_json(
+        information_json="information"
+    )
+    serializer_class = ProfileJSONSerializer
+    permission_classes = [AllowAny]
+    renderer_classes = (JSONRenderer,)
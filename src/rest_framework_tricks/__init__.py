@@ -7,3 +7,12 @@ __version__ = "0.2.14"
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
 __copyright__ = "2017-2022 Artur Barseghyan"
 __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+
+try:
+    import django
+
+    # Django < 3.2 does not discover the app config automatically
+    if django.VERSION < (3, 2):
+        default_app_config = "rest_framework_tricks.apps.Config"
+except ImportError:
+    pass
@@ -15,3 +15,13 @@ class Config(AppConfig):
 
     name = "rest_framework_tricks"
     label = "rest_framework_tricks"
+
+    def ready(self):
+        """Populate the nested proxy metadata registry, register checks."""
+        from django.core import checks
+
+        from .checks import check_ordering_indexes
+        from .models.registry import populate_registry
+
+        populate_registry()
+        checks.register(check_ordering_indexes, checks.Tags.urls)
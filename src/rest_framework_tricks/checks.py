@@ -0,0 +1,109 @@
+"""
+System checks.
+"""
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import get_resolver, URLResolver
+
+from .filters.ordering import compile_ordering_fields, OrderingFilter
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "check_ordering_indexes",
+    "iter_url_views",
+)
+
+
+def iter_url_views(patterns):
+    """Iterate over the (class based) views of the URL patterns.
+
+    :param patterns: URL patterns (for instance, ``urlpatterns``).
+    :return: Generator of ``(view class, initkwargs)`` pairs.
+    """
+    for __pattern in patterns:
+        if isinstance(__pattern, URLResolver):
+            yield from iter_url_views(__pattern.url_patterns)
+            continue
+        __view_class = getattr(__pattern.callback, "cls", None)
+        if __view_class is not None:
+            yield __view_class, getattr(__pattern.callback, "initkwargs", {})
+
+
+def check_ordering_indexes(app_configs=None, **kwargs):
+    """Check ``ordering_indexes`` of the views using the ``OrderingFilter``.
+
+    Views are collected from the URL patterns. Each view class is checked
+    once, views without the ``queryset`` attribute or without explicit
+    ``ordering_fields`` (a list or a dict) are skipped (with a warning).
+
+    :param app_configs: Not used (views are not bound to apps).
+    :return: List of errors and warnings.
+    :rtype: list
+    """
+    messages = []
+    seen = set()
+    for __view_class, __initkwargs in iter_url_views(
+        get_resolver().url_patterns
+    ):
+        if __view_class in seen:
+            continue
+        seen.add(__view_class)
+
+        for __backend_class in getattr(__view_class, "filter_backends", ()):
+            if not (
+                isinstance(__backend_class, type)
+                and issubclass(__backend_class, OrderingFilter)
+            ):
+                continue
+            backend = __backend_class()
+            view = __view_class(**__initkwargs)
+            if not getattr(view, "ordering_indexes", backend.ordering_indexes):
+                continue
+
+            queryset = getattr(view, "queryset", None)
+            if queryset is None:
+                messages.append(
+                    checks.Warning(
+                        "ordering_indexes of {} can't be checked, the view "
+                        "has no queryset.".format(__view_class.__name__),
+                        obj=__view_class,
+                        id="rest_framework_tricks.W001",
+                    )
+                )
+                continue
+
+            valid_fields = getattr(
+                view, "ordering_fields", backend.ordering_fields
+            )
+            if isinstance(valid_fields, (list, tuple)):
+                valid_fields = {__f: __f for __f in valid_fields}
+            elif not isinstance(valid_fields, dict):
+                # ``"__all__"`` or unset, resolved from the serializer (and
+                # the request) of the view
+                messages.append(
+                    checks.Warning(
+                        "ordering_indexes of {} can't be checked, the "
+                        "ordering_fields of the view are not an explicit "
+                        "list or dict.".format(__view_class.__name__),
+                        obj=__view_class,
+                        id="rest_framework_tricks.W002",
+                    )
+                )
+                continue
+            try:
+                backend.check_ordering_indexes(
+                    view,
+                    queryset.model,
+                    compile_ordering_fields(valid_fields),
+                )
+            except ImproperlyConfigured as err:
+                messages.append(
+                    checks.Error(
+                        str(err),
+                        obj=__view_class,
+                        id="rest_framework_tricks.E001",
+                    )
+                )
+    return messages
@@ -1 +1,2 @@
 from .file import *
+from .raw_json import *
@@ -0,0 +1,70 @@
+from rest_framework.fields import Field
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "RawJSON",
+    "RawJSONField",
+)
+
+
+class RawJSON:
+    """Already encoded JSON, to be output as is.
+
+    Understood by ``rest_framework_tricks.renderers.JSONRenderer``.
+
+    :param json: JSON string.
+    """
+
+    __slots__ = ("json",)
+
+    def __init__(self, json):
+        self.json = json
+
+    def __eq__(self, other):
+        return isinstance(other, RawJSON) and self.json == other.json
+
+    def __str__(self):
+        return self.json
+
+    def __repr__(self):
+        return "RawJSON({!r})".format(self.json)
+
+
+class RawJSONField(Field):
+    """A read-only field for JSON encoded by the database.
+
+    Passes the JSON string through, without decoding and re-encoding it.
+    Requires ``rest_framework_tricks.renderers.JSONRenderer``.
+
+    Example:
+
+        >>> class ProfileJSONSerializer(serializers.ModelSerializer):
+        >>>
+        >>>     information = RawJSONField(source='information_json')
+        >>>
+        >>>     class Meta:
+        >>>
+        >>>         model = Profile
+        >>>         fields = ('id', 'information')
+        >>>
+        >>>
+        >>> class ProfileJSONViewSet(viewsets.ReadOnlyModelViewSet):
+        >>>
+        >>>     queryset = Profile.objects.annotate_nested_json(
+        >>>         information_json='information'
+        >>>     )
+        >>>     serializer_class = ProfileJSONSerializer
+        >>>     renderer_classes = (JSONRenderer,)
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        # Already decoded (for instance, by a JSONField)
+        if not isinstance(value, str):
+            return value
+        return RawJSON(value)
@@ -7,4 +7,11 @@ from .ordering import *
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
 __copyright__ = "2017-2022 Artur Barseghyan"
 __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
-__all__ = ("OrderingFilter",)
+__all__ = (
+    "add_tie_breaker",
+    "check_ordering_index",
+    "compile_ordering_fields",
+    "invert_ordering",
+    "OrderingFilter",
+    "parse_ordering",
+)
@@ -1,12 +1,164 @@
 """
 Ordering filter.
 """
+from functools import lru_cache, partial
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import OrderBy
 from rest_framework.filters import OrderingFilter as DjangoOrderingFilter
 
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
 __copyright__ = "2017-2022 Artur Barseghyan"
 __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
-__all__ = ("OrderingFilter",)
+__all__ = (
+    "add_tie_breaker",
+    "check_ordering_index",
+    "compile_ordering_fields",
+    "invert_ordering",
+    "OrderingFilter",
+    "parse_ordering",
+)
+
+
+def invert_ordering(value):
+    """Invert direction of an ordering term.
+
+    :param value: Ordering term (for instance, ``"user__email"``).
+    :type value: str
+    :return: Inverted ordering term (for instance, ``"-user__email"``).
+    :rtype: str
+    """
+    return value[1:] if value.startswith("-") else "-{}".format(value)
+
+
+def compile_ordering_fields(ordering_fields):
+    """Compile mapped ordering fields into ascending/descending lookups.
+
+    Example:
+
+        >>> compile_ordering_fields({
+        >>>     'email': 'user__email',
+        >>>     'status': ['state', 'publication_date'],
+        >>> })
+        {'email': ('user__email',),
+         '-email': ('-user__email',),
+         'status': ('state', 'publication_date'),
+         '-status': ('-state', '-publication_date')}
+
+    :param ordering_fields: Ordering field name => model field(s).
+    :type ordering_fields: dict
+    :return: Ordering term (``"name"`` or ``"-name"``) => ``order_by``
+        terms.
+    :rtype: dict
+    """
+    ordering_map = {}
+    for __name, __value in ordering_fields.items():
+        if isinstance(__value, (tuple, list)):
+            __value = tuple(__value)
+        else:
+            __value = (__value,)
+        ordering_map[__name] = __value
+        ordering_map["-{}".format(__name)] = tuple(
+            invert_ordering(__v) for __v in __value
+        )
+    return ordering_map
+
+
+def add_tie_breaker(ordering, tie_breaker):
+    """Append the tie breaker to the ordering, unless present already.
+
+    The tie breaker follows the direction of the last term, so that the
+    whole ordering can be served by a (backward) index scan.
+
+    Example:
+
+        >>> add_tie_breaker(('-user__is_active',), 'pk')
+        ('-user__is_active', '-pk')
+
+    :param ordering: ``order_by`` terms.
+    :param tie_breaker: Unique field name (for instance, ``"pk"``).
+    :type ordering: tuple
+    :type tie_breaker: str
+    :return: ``order_by`` terms.
+    :rtype: tuple
+    """
+    if not ordering or not tie_breaker:
+        return ordering
+    if isinstance(ordering, str):
+        ordering = (ordering,)
+    last = ordering[-1]
+    if isinstance(last, OrderBy):
+        descending = last.descending
+    else:
+        descending = isinstance(last, str) and last.startswith("-")
+    for __term in ordering:
+        if isinstance(__term, str) and __term.lstrip("-") == tie_breaker:
+            return tuple(ordering)
+    return tuple(ordering) + (
+        "-{}".format(tie_breaker) if descending else tie_breaker,
+    )
+
+
+def check_ordering_index(model, index_name, ordering):
+    """Check if the model index can serve the ordering.
+
+    That is the case if the ordering terms are the leading fields of the
+    index, in the same (or the exact opposite) directions.
+
+    :param model: Model class.
+    :param index_name: Name of the index (in the ``indexes`` ``Meta``
+        option of the model).
+    :param ordering: ``order_by`` terms.
+    :type index_name: str
+    :type ordering: tuple
+    :raise django.core.exceptions.ImproperlyConfigured: If the index does
+        not exist or can't serve the ordering.
+    """
+    # Indexes of the proxy models are the ones of their concrete models
+    for __index in model._meta.concrete_model._meta.indexes:
+        if __index.name == index_name:
+            break
+    else:
+        raise ImproperlyConfigured(
+            "{} has no index named {}.".format(model.__name__, index_name)
+        )
+
+    def normalise(term):
+        name = term.lstrip("-")
+        return model._meta.pk.name if name == "pk" else name, term[:1] == "-"
+
+    index_terms = [normalise(__f) for __f in __index.fields]
+    terms = [normalise(__t) for __t in ordering]
+    inverted = [(__n, not __d) for __n, __d in terms]
+    if index_terms[: len(terms)] not in (terms, inverted):
+        raise ImproperlyConfigured(
+            "Index {} of {} ({}) can't serve the ordering {}.".format(
+                index_name,
+                model.__name__,
+                ", ".join(__index.fields),
+                ", ".join(ordering),
+            )
+        )
+
+
+def parse_ordering(ordering_map, params, tie_breaker=None):
+    """Parse the ordering query parameter.
+
+    :param ordering_map: Compiled ordering fields (as returned by
+        ``compile_ordering_fields``).
+    :param params: Comma delimited ordering terms.
+    :param tie_breaker: Unique field name appended to the ordering (see
+        ``add_tie_breaker``).
+    :type ordering_map: dict
+    :type params: str
+    :type tie_breaker: str
+    :return: ``order_by`` terms or None if no valid terms were given.
+    :rtype: tuple
+    """
+    ordering = ()
+    for __param in params.split(","):
+        ordering += ordering_map.get(__param.strip(), ())
+    return add_tie_breaker(ordering, tie_breaker) or None
 
 
 class OrderingFilter(DjangoOrderingFilter):
@@ -34,8 +186,107 @@ class OrderingFilter(DjangoOrderingFilter):
     Then it can be used in a view set as follows:
 
         GET /books/api/proxy-books/?ordering=email
+
+    Mapped ordering fields are compiled once per view class, and the
+    ``order_by`` terms of the most recently used ordering query parameters
+    are cached (see ``ordering_cache_size``).
+
+    To make the ordering deterministic, set ``ordering_tie_breaker`` on the
+    view (or the filter) to the primary key (``"pk"``) or another unique
+    field: it's appended to every ordering (unless present already). The
+    composite indexes expected to serve mapped orderings may be declared
+    using ``ordering_indexes`` (ordering field name => name of the model
+    index), those are checked by the system checks (``manage.py check``,
+    see ``rest_framework_tricks.checks.check_ordering_indexes``) of the
+    views in the URL patterns:
+
+    >>> class BooksViewSet(viewsets.ReadOnlyModelViewSet):
+    >>>
+    >>>     queryset = Book.objects.all()
+    >>>     serializer_class = BookSerializer
+    >>>     filter_backends = (OrderingFilter,)
+    >>>     ordering_fields = {
+    >>>         'status': ['state', 'publication_date'],
+    >>>     }
+    >>>     ordering_tie_breaker = 'id'
+    >>>     ordering_indexes = {
+    >>>         'status': 'books_book_state_pub_date_idx',
+    >>>     }
     """
 
+    ordering_cache_size = 256
+    ordering_tie_breaker = None
+    ordering_indexes = None
+
+    def get_tie_breaker(self, view):
+        """Get tie breaker of the view.
+
+        :param view:
+        :return: Unique field name or None.
+        :rtype: str
+        """
+        return getattr(view, "ordering_tie_breaker", self.ordering_tie_breaker)
+
+    def check_ordering_indexes(self, view, model, ordering_map):
+        """Check the indexes declared serve the (mapped) orderings.
+
+        :param view:
+        :param model: Model class.
+        :param ordering_map: Compiled ordering fields (as returned by
+            ``compile_ordering_fields``).
+        :type ordering_map: dict
+        :raise django.core.exceptions.ImproperlyConfigured: If they don't.
+        """
+        indexes = getattr(view, "ordering_indexes", self.ordering_indexes)
+        tie_breaker = self.get_tie_breaker(view)
+        for __name, __index_name in (indexes or {}).items():
+            if __name not in ordering_map:
+                raise ImproperlyConfigured(
+                    "{} is not an ordering field of {}.".format(
+                        __name, view.__class__.__name__
+                    )
+                )
+            check_ordering_index(
+                model,
+                __index_name,
+                add_tie_breaker(ordering_map[__name], tie_breaker),
+            )
+
+    def get_ordering_parser(self, view):
+        """Get ordering parser of the view (mapped ordering fields only).
+
+        Compiled once per view class (stored on the class itself), and
+        compiled again if the ``ordering_fields`` (or the tie breaker) of
+        the view change.
+
+        :param view:
+        :return: Function turning the ordering query parameter into the
+            ``order_by`` terms (see ``parse_ordering``), cached.
+        :rtype: callable
+        """
+        valid_fields = getattr(view, "ordering_fields", self.ordering_fields)
+        tie_breaker = self.get_tie_breaker(view)
+        compiled = view.__class__.__dict__.get("_ordering_parser")
+        if (
+            compiled is None
+            or compiled[0] is not valid_fields
+            or compiled[1] != tie_breaker
+        ):
+            ordering_map = compile_ordering_fields(valid_fields)
+            compiled = (
+                valid_fields,
+                tie_breaker,
+                lru_cache(maxsize=self.ordering_cache_size)(
+                    partial(
+                        parse_ordering,
+                        ordering_map,
+                        tie_breaker=tie_breaker,
+                    )
+                ),
+            )
+            view.__class__._ordering_parser = compiled
+        return compiled[2]
+
     def get_valid_fields(self, queryset, view, context=None):
         """Done.
 
@@ -76,34 +327,20 @@ class OrderingFilter(DjangoOrderingFilter):
             params = request.query_params.get(self.ordering_param)
 
             if params:
-                fields = [param.strip() for param in params.split(",")]
-                _ordering = self.remove_invalid_fields(
-                    queryset, fields, view, request
-                )
-
-                ordering = []
-                for item in _ordering:
-                    if "-" in item:
-                        value = valid_fields.get(item[1:])
-                        if isinstance(value, (tuple, list)):
-                            value = ["-{}".format(__v) for __v in value]
-                            ordering += value
-                        else:
-                            ordering.append("-{}".format(value))
-                    else:
-                        value = valid_fields.get(item)
-                        if isinstance(value, (tuple, list)):
-                            ordering += value
-                        else:
-                            ordering.append(value)
+                ordering = self.get_ordering_parser(view)(params)
                 if ordering:
                     return ordering
 
             # No ordering was included, or all the ordering fields were invalid
-            return self.get_default_ordering(view)
+            return add_tie_breaker(
+                self.get_default_ordering(view), self.get_tie_breaker(view)
+            )
 
         # In all other cases, use default behaviour
         else:
-            return super(OrderingFilter, self).get_ordering(
-                request, queryset, view
+            return add_tie_breaker(
+                super(OrderingFilter, self).get_ordering(
+                    request, queryset, view
+                ),
+                self.get_tie_breaker(view),
             )
@@ -1,46 +1,206 @@
-from copy import deepcopy
-from typing import List, Dict, Any
+from copy import copy
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Optional, Union
+
+from .serializers.nested_proxy import get_class_fields, is_nested_proxy_field
 
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
 __copyright__ = "2017-2022 Artur Barseghyan"
 __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
 __all__ = (
     "get_nested_data_field_names",
+    "get_path_map",
     "flatten_nested_data",
+    "unflatten_nested_data",
 )
 
+PathMap = Dict[str, Optional[dict]]
+
+
+def _build_field_map(serializer, is_nested: bool, static: list) -> PathMap:
+    """Build path map of the nested fields of the serializer."""
+    fields = get_class_fields(serializer)
+    if fields is None:
+        static[0] = False
+        fields = serializer.fields
+    # Prototypes are not bound (and never pruned), source may be missing
+    path_map = {}
+    for __name, __field in fields.items():
+        if is_nested_proxy_field(__field):
+            path_map[__field.source or __name] = _build_field_map(
+                __field, True, static
+            )
+        elif is_nested:
+            path_map[__field.source or __name] = None
+    return path_map
+
+
+def get_nested_data_field_names(serializer) -> PathMap:
+    """Get nested data field names.
 
-def get_nested_data_field_names(serializer) -> List[str]:
-    """Get nested data field names."""
-    nested_field_names = []
-    for field_name, field in serializer.fields.items():
-        if getattr(field, "Meta", None) and getattr(
-            field.Meta, "nested_proxy_field", False
-        ):
-            nested_field_names.append(field_name)
-    return nested_field_names
+    Returns a path map (see ``get_path_map``) of the nested proxy fields of
+    the serializer, to any depth: nested fields map to their own path maps,
+    leaves (model attributes) map to None. Iterating it gives the (top
+    level) nested field names, as it used to.
+
+    The path map is built once per serializer class and stored on the class
+    itself (never on its subclasses), so it goes away together with
+    serializer classes created dynamically. Serializers whose fields may
+    depend on the serializer instance (see
+    ``rest_framework_tricks.serializers.nested_proxy.has_static_fields``)
+    are not cached. Treat the path map as read only.
+
+    Example:
+
+        >>> get_nested_data_field_names(BookSerializer())
+        {'publishing_information': {'publication_date': None,
+                                    'isbn': None,
+                                    'pages': None},
+         'stock_information': {'stock_count': None,
+                               'price': None,
+                               'state': None}}
+    """
+    path_map = serializer.__class__.__dict__.get("_nested_data_field_names")
+    if path_map is None:
+        static = [True]
+        path_map = _build_field_map(serializer, False, static)
+        if static[0]:
+            serializer.__class__._nested_data_field_names = path_map
+    return path_map
+
+
+@lru_cache(maxsize=256)
+def _compile_path_map(nested_field_names: tuple) -> PathMap:
+    """Compile (dotted) nested field names into a path map."""
+    path_map = {}
+    for __path in nested_field_names:
+        node = path_map
+        for __name in __path.split("."):
+            if node.get(__name) is None:
+                node[__name] = {}
+            node = node[__name]
+    return path_map
+
+
+def get_path_map(nested_field_names: Union[PathMap, Iterable[str]]) -> PathMap:
+    """Get path map of the nested fields.
+
+    A path map maps names of the nested fields to their own path maps,
+    recursively. Leaves (model attributes) map to None, keys not present in
+    the path map are treated as leaves as well. A write plan (as returned by
+    ``rest_framework_tricks.serializers.build_write_plan``) is a path map.
+
+    Nested field names may be dotted (for instance, ``"information.data"``)
+    to describe nested fields of any depth. Path maps compiled from names
+    are cached.
+
+    Example:
+
+        >>> get_path_map(['information', 'information.data'])
+        {'information': {'data': {}}}
+
+    :param nested_field_names: Path map or (dotted) nested field names.
+    :return: Path map.
+    """
+    if isinstance(nested_field_names, dict):
+        return nested_field_names
+    return _compile_path_map(tuple(nested_field_names))
+
+
+def _flatten(path_map: PathMap, data: Dict[str, Any], target: Dict[str, Any]):
+    """Move flattened values of the nested data into the target."""
+    for __key, __value in data.items():
+        __sub_map = path_map.get(__key)
+        if __sub_map is None:
+            target[__key] = __value
+        elif __value:
+            _flatten(__sub_map, __value, target)
 
 
 def flatten_nested_data(
-    validated_data: Dict[str, Any], nested_field_names: List[str]
+    validated_data: Dict[str, Any],
+    nested_field_names: Union[PathMap, Iterable[str]],
+    inplace: bool = False,
 ) -> Dict[str, Any]:
     """Flatten nested data.
 
+    Nested data is flattened to any depth (see ``get_path_map``). Values
+    are never copied: unless ``inplace`` is set, a shallow copy of the
+    top level dictionary is returned, otherwise, the ``validated_data``
+    is flattened (and returned) as is.
+
     Usage example:
 
         class MySerializer(serializers.ModelSerializer):
 
             def create(self, validated_data):
                 # Do something else
-                nested_field_names = get_nested_field_names(self)
+                nested_field_names = get_nested_data_field_names(self)
                 validated_data = flatten_nested_data(
                     validated_data, nested_field_names
                 )
                 return super().create(validated_data)
     """
-    validated_data = deepcopy(validated_data)
-    for field_name in nested_field_names:
-        data = validated_data.pop(field_name, None)
+    path_map = get_path_map(nested_field_names)
+    if not inplace:
+        validated_data = copy(validated_data)
+    for __name, __sub_map in path_map.items():
+        if __sub_map is None or __name not in validated_data:
+            continue
+        data = validated_data.pop(__name)
         if data:
-            validated_data.update(data)
+            _flatten(__sub_map, data, validated_data)
     return validated_data
+
+
+def _unflatten(path_map: PathMap, data: Dict[str, Any], take) -> dict:
+    """Collect nested data of the path map from the flat data."""
+    nested_data = {}
+    for __key, __sub_map in path_map.items():
+        if __sub_map is None:
+            if __key in data:
+                nested_data[__key] = take(__key)
+        else:
+            __value = _unflatten(__sub_map, data, take)
+            if __value:
+                nested_data[__key] = __value
+    return nested_data
+
+
+def unflatten_nested_data(
+    data: Dict[str, Any], path_map: PathMap, inplace: bool = False
+) -> Dict[str, Any]:
+    """Unflatten data, the inverse of ``flatten_nested_data``.
+
+    Leaves of the path map (see ``get_path_map``) present in the data are
+    moved into the nested dictionaries. Empty nested dictionaries are
+    omitted. Values are never copied: unless ``inplace`` is set, a shallow
+    copy of the top level dictionary is returned.
+
+    Example:
+
+        >>> unflatten_nested_data(
+        >>>     {'id': 1, 'isbn': '978-0-13', 'pages': 200},
+        >>>     build_write_plan(BookSerializer()),
+        >>> )
+        {'id': 1, 'publishing_information': {'isbn': '978-0-13', 'pages': 200}}
+    """
+    path_map = get_path_map(path_map)
+    if not inplace:
+        data = copy(data)
+    # Leaves shared by several nested fields go into each of them
+    taken = set()
+
+    def take(key):
+        taken.add(key)
+        return data[key]
+
+    for __name, __sub_map in path_map.items():
+        if __sub_map is None:
+            continue
+        __value = _unflatten(__sub_map, data, take)
+        if __value:
+            data[__name] = __value
+    for __key in taken.difference(path_map):
+        del data[__key]
+    return data
@@ -0,0 +1,312 @@
+"""
+View mixins.
+"""
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework import mixins, serializers, status
+from rest_framework.permissions import BasePermission, SAFE_METHODS
+from rest_framework.response import Response
+
+from .models.fields.nested_proxy import get_concrete_attname
+from .models.registry import get_nested_proxy_meta
+from .serializers import is_nested_proxy_field
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "DirectUpdateModelMixin",
+    "get_sparse_columns",
+    "parse_sparse_fields",
+    "prune_fields",
+    "SparseFieldsetsMixin",
+)
+
+
+def parse_sparse_fields(value):
+    """Parse sparse fieldset.
+
+    Example:
+
+        >>> parse_sparse_fields('id,publishing_information.isbn')
+        {'id': None, 'publishing_information': {'isbn': None}}
+
+    :param value: Comma separated (dotted) field names.
+    :type value: str
+    :return: Nested dictionary. None stands for the whole field.
+    :rtype: dict
+    """
+    tree = {}
+    for __path in value.split(","):
+        __names = [__name for __name in __path.strip().split(".") if __name]
+        if not __names:
+            continue
+        node = tree
+        for __name in __names[:-1]:
+            # Whole field requested already
+            if __name in node and node[__name] is None:
+                break
+            node = node.setdefault(__name, {})
+        else:
+            node[__names[-1]] = None
+    return tree
+
+
+def prune_fields(serializer, tree):
+    """Remove fields of the serializer not present in the sparse fieldset.
+
+    Nested serializers are pruned as well.
+
+    :param serializer: Serializer instance.
+    :param tree: Sparse fieldset (as returned by ``parse_sparse_fields``).
+    :type serializer: rest_framework.serializers.Serializer
+    :type tree: dict
+    """
+    fields = serializer.fields
+    for __name in list(fields):
+        if __name not in tree:
+            del fields[__name]
+        elif tree[__name] is not None:
+            if isinstance(fields[__name], serializers.Serializer):
+                prune_fields(fields[__name], tree[__name])
+
+
+def get_sparse_columns(serializer, queryset):
+    """Get concrete columns needed to represent the (pruned) serializer.
+
+    :param serializer: Serializer instance (pruned).
+    :param queryset: QuerySet.
+    :type serializer: rest_framework.serializers.Serializer
+    :type queryset: django.db.models.QuerySet
+    :return: List of columns to be passed to ``QuerySet.only`` or None
+        (if some of the fields can't be resolved into columns).
+    :rtype: list
+    """
+    model = queryset.model
+    meta = get_nested_proxy_meta(model)
+    select_related = queryset.query.select_related
+    if select_related is True:
+        return None
+
+    columns = dict.fromkeys([model._meta.pk.attname])
+    # Relations followed by ``select_related`` can't be deferred
+    if select_related:
+        columns.update(dict.fromkeys(select_related))
+
+    def add(field, path):
+        if (
+            isinstance(field, serializers.Serializer)
+            and is_nested_proxy_field(field)
+            and meta.get_columns(path) is not None
+        ):
+            for __field in field._readable_fields:
+                if not add(__field, "{}.{}".format(path, __field.source)):
+                    return False
+            return True
+
+        __columns = meta.get_columns(path)
+        if __columns is not None:
+            columns.update(dict.fromkeys(__columns))
+            return True
+        return False
+
+    for __field in serializer._readable_fields:
+        if isinstance(__field, serializers.HyperlinkedIdentityField):
+            if __field.lookup_field == "pk":
+                continue
+            __attname = get_concrete_attname(model, __field.lookup_field)
+            if __attname is None:
+                return None
+            columns[__attname] = None
+        elif not __field.source_attrs:
+            # ``source="*"`` (for instance, ``SerializerMethodField``) may
+            # read anything
+            return None
+        elif meta.get_columns(__field.source_attrs[0]) is not None:
+            if not add(__field, __field.source):
+                return None
+        elif get_concrete_attname(model, __field.source_attrs[0]) is not None:
+            # Relations are not deferred as a whole
+            columns[__field.source_attrs[0]] = None
+        else:
+            return None
+    return list(columns)
+
+
+class DirectUpdateModelMixin(mixins.UpdateModelMixin):
+    """Update a model instance without fetching it first.
+
+    To be used with serializers having the ``direct_update`` ``Meta``
+    option set (see
+    ``rest_framework_tricks.serializers.NestedProxySerializerMixin``). The
+    serializer gets an instance holding the primary key only, the update is
+    restricted to the (filtered) queryset of the view.
+
+    The instance is fetched after the update only if the response body is
+    needed (``direct_update_response`` set to True, default). Otherwise,
+    an empty response (204) is returned.
+
+    Object level permissions can't be checked, since the object is not
+    fetched. Therefore, views with permission classes implementing
+    ``has_object_permission`` fall back to the regular update, unless
+    ``direct_update_skip_object_permissions`` is explicitly set to True.
+    Only lookups by primary key are supported, views with other lookup
+    fields fall back to the regular update as well, so do views whose
+    serializers don't have the ``direct_update`` option set.
+
+    Example:
+
+    >>> from rest_framework.viewsets import GenericViewSet
+    >>> from rest_framework_tricks.mixins import DirectUpdateModelMixin
+    >>>
+    >>>
+    >>> class BookStockViewSet(DirectUpdateModelMixin, GenericViewSet):
+    >>>
+    >>>     queryset = Book.objects.all()
+    >>>     serializer_class = BookStockSerializer
+    >>>     direct_update_response = False
+    """
+
+    direct_update_response = True
+    direct_update_skip_object_permissions = False
+
+    def has_object_permissions(self):
+        """Check if any of the permissions checks objects.
+
+        :return: True or False
+        :rtype: bool
+        """
+        return any(
+            __permission.__class__.has_object_permission
+            is not BasePermission.has_object_permission
+            for __permission in self.get_permissions()
+        )
+
+    def is_direct_update(self):
+        """Check if the object can be updated without fetching it.
+
+        That is the case if the serializer has the ``direct_update``
+        ``Meta`` option set.
+
+        :return: True or False
+        :rtype: bool
+        """
+        serializer_class = self.get_serializer_class()
+        if not getattr(
+            getattr(serializer_class, "Meta", None), "direct_update", False
+        ):
+            return False
+        if (
+            not self.direct_update_skip_object_permissions
+            and self.has_object_permissions()
+        ):
+            return False
+        return self.lookup_field in (
+            "pk",
+            self.get_queryset().model._meta.pk.name,
+        )
+
+    def get_object_stub(self):
+        """Get an instance holding the primary key only.
+
+        :return: Model instance (all fields but the primary key deferred).
+        :raise django.http.Http404: If the primary key is malformed.
+        """
+        model = self.get_queryset().model
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            pk = model._meta.pk.to_python(self.kwargs[lookup_url_kwarg])
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        return model.from_db(
+            self.get_queryset().db, [model._meta.pk.attname], [pk]
+        )
+
+    def update(self, request, *args, **kwargs):
+        """Update."""
+        if not self.is_direct_update():
+            return super().update(request, *args, **kwargs)
+
+        partial = kwargs.pop("partial", False)
+        instance = self.get_object_stub()
+        # The update is restricted to the (filtered) queryset of the view
+        context = self.get_serializer_context()
+        context["update_queryset"] = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer(
+            instance, data=request.data, partial=partial, context=context
+        )
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+
+        if not self.direct_update_response:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer.instance = serializer.context["update_queryset"].get(
+            pk=instance.pk
+        )
+        return Response(serializer.data)
+
+
+class SparseFieldsetsMixin:
+    """Sparse fieldsets.
+
+    Clients may ask for a subset of the fields using a query parameter,
+    nested fields included (for instance,
+    ``?fields=id,publishing_information.isbn,stock_information``). The
+    serializer is pruned down to the fields requested, and the queryset is
+    restricted to the columns needed (using ``QuerySet.only``). Applies to
+    safe (read) requests only.
+
+    Example:
+
+    >>> from rest_framework.viewsets import ModelViewSet
+    >>> from rest_framework_tricks.mixins import SparseFieldsetsMixin
+    >>>
+    >>>
+    >>> class BookViewSet(SparseFieldsetsMixin, ModelViewSet):
+    >>>
+    >>>     queryset = Book.objects.all()
+    >>>     serializer_class = BookSerializer
+    """
+
+    sparse_fieldsets_param = "fields"
+
+    def get_sparse_fields(self):
+        """Get sparse fieldset requested.
+
+        :return: Sparse fieldset (as returned by ``parse_sparse_fields``)
+            or None.
+        :rtype: dict
+        """
+        request = getattr(self, "request", None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        value = request.query_params.get(self.sparse_fieldsets_param)
+        if not value:
+            return None
+        return parse_sparse_fields(value)
+
+    def get_serializer(self, *args, **kwargs):
+        """Get serializer, pruned down to the sparse fieldset."""
+        serializer = super().get_serializer(*args, **kwargs)
+        tree = self.get_sparse_fields()
+        if tree is not None:
+            prune_fields(
+                getattr(serializer, "child", serializer),
+                tree,
+            )
+        return serializer
+
+    def get_queryset(self):
+        """Get queryset, restricted to the columns of the sparse fieldset."""
+        queryset = super().get_queryset()
+        tree = self.get_sparse_fields()
+        if tree is not None:
+            serializer = self.get_serializer_class()(
+                context=self.get_serializer_context()
+            )
+            prune_fields(serializer, tree)
+            columns = get_sparse_columns(serializer, queryset)
+            if columns is not None:
+                queryset = queryset.only(*columns)
+        return queryset
@@ -0,0 +1,13 @@
+"""
+Models.
+"""
+from .query import *
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "NestedProxyManager",
+    "NestedProxyQuerySet",
+    "NestedProxyQuerySetMixin",
+)
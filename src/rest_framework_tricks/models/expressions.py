@@ -0,0 +1,69 @@
+"""
+Database expressions for models with NestedProxyField fields.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import ExpressionWrapper, F, TextField
+
+try:
+    from django.db.models.functions import JSONObject
+except ImportError:  # Django < 3.2
+    JSONObject = None
+
+from .registry import get_nested_proxy_meta
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = ("nested_proxy_json_object",)
+
+
+def nested_proxy_json_object(model, path, raw=True):
+    """Build a (nested) ``JSONObject`` expression for a nested proxy field.
+
+    The database then returns the whole nested document in a single
+    column. Requires Django 3.2 or later (and a database supporting
+    ``JSONObject``, such as SQLite with JSON1 or PostgreSQL). Note, that
+    values are encoded by the database (for instance, decimals become
+    JSON numbers).
+
+    Example:
+
+        >>> Profile.objects.annotate(
+        >>>     information_json=nested_proxy_json_object(
+        >>>         Profile, 'information'
+        >>>     )
+        >>> )
+
+    :param model: Model class.
+    :param path: Nested proxy field name or dotted path (for instance,
+        ``"information.data.bank_information"``).
+    :param raw: If True, the annotated value is the JSON string, as
+        returned by the database. Otherwise, it's decoded by Django.
+    :return: Expression.
+    """
+    if JSONObject is None:
+        raise ImproperlyConfigured(
+            "nested_proxy_json_object requires Django 3.2 or later."
+        )
+
+    node = get_nested_proxy_meta(model).build_values_tree([path])
+    for __key in path.split("."):
+        node = node.get(__key) if isinstance(node, dict) else None
+    if not isinstance(node, dict):
+        raise ValueError(
+            "{} is not a nested proxy field path of {}.".format(
+                path, model.__name__
+            )
+        )
+
+    def to_expression(node):
+        if isinstance(node, dict):
+            return JSONObject(
+                **{__k: to_expression(__v) for __k, __v in node.items()}
+            )
+        return F(node)
+
+    expression = to_expression(node)
+    if raw:
+        return ExpressionWrapper(expression, output_field=TextField())
+    return expression
@@ -6,4 +6,7 @@ from .nested_proxy import *
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
 __copyright__ = "2017-2022 Artur Barseghyan"
 __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
-__all__ = ("NestedProxyField",)
+__all__ = (
+    "NestedProxyField",
+    "pop_nested_proxy_dirty_fields",
+)
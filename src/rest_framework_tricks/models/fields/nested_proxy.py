@@ -1,17 +1,94 @@
 """
 Nested proxy field.
 """
-from ...utils import DictProxy
+from collections.abc import Mapping
+from operator import attrgetter
+import warnings
+
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.db.models.signals import class_prepared
+
+from ...utils import DictProxy, to_dict
 
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
 __copyright__ = "2017-2022 Artur Barseghyan"
 __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
-__all__ = ("NestedProxyField",)
+__all__ = (
+    "compile_nested_proxy_fields",
+    "get_concrete_attname",
+    "NestedProxyField",
+    "NestedProxyMapping",
+    "pop_nested_proxy_dirty_fields",
+)
+
+DIRTY_FIELDS_ATTR = "_nested_proxy_dirty_fields"
+
+_MISSING = object()
+
+
+class NestedProxyMapping(Mapping):
+    """Read-only mapping view of a NestedProxyField value.
+
+    Bound to the model instance. Values are resolved only when accessed
+    (or iterated), nested proxies resolve to nested views. Use ``to_dict``
+    (or ``copy``) to get plain (nested) dictionaries, for instance, to
+    serialize the value as JSON.
+
+    :param instance: Model instance.
+    :param getters: Compiled getters (key => getter accepting an instance).
+    """
+
+    __slots__ = ("_instance", "_getters")
+
+    def __init__(self, instance, getters):
+        self._instance = instance
+        self._getters = getters
+
+    def __getitem__(self, key):
+        return self._getters[key](self._instance)
+
+    def __iter__(self):
+        return iter(self._getters)
+
+    def __len__(self):
+        return len(self._getters)
+
+    def __contains__(self, key):
+        return key in self._getters
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def to_dict(self):
+        """Convert into a plain dictionary, nested views included.
 
+        :return: Dictionary.
+        :rtype: dict
+        """
+        return to_dict(self)
 
-def NestedProxyField(*fields, **options):
+    copy = to_dict
+
+
+class NestedProxyField:
     """NestedProxyField field.
 
+    A descriptor, compiled once per model class (on ``class_prepared``)
+    into a flat getter and a setter plan. Values are returned as lazy,
+    read-only ``NestedProxyMapping`` views (use ``value.to_dict()`` to get
+    plain, nested dictionaries). Assigning a (possibly partial) nested mapping writes
+    the leaves to the underlying attributes; the concrete fields written
+    are collected (see ``pop_nested_proxy_dirty_fields``).
+
+    Options:
+
+    - ``as_object`` (bool): Return a ``DictProxy`` instead of a mapping.
+    - ``on_deferred`` (str): What to do when some of the leaves are deferred
+      (by ``.only()`` or ``.defer()``). ``"load"`` (default) loads all of
+      them in a single query (instead of one query per leaf), ``"warn"``
+      does the same, but issues a ``RuntimeWarning``, ``"raise"`` raises
+      a ``FieldError``.
+
     Example:
 
         >>> from django.db import models
@@ -123,29 +200,244 @@ def NestedProxyField(*fields, **options):
         >>>     )
     """
 
-    __as_object = options.get("as_object", False)
+    def __init__(self, *fields, **options):
+        self.fields = fields
+        self.as_object = options.get("as_object", False)
+        self.on_deferred = options.get("on_deferred", "load")
+        self.name = None
+        self.model = None
+        # Sub-proxies declared using the dictionary form of the spec
+        self.children = {
+            __key: NestedProxyField(*__values)
+            for __field in fields
+            if isinstance(__field, dict)
+            for __key, __values in __field.items()
+        }
+        # Compiled getters per model class
+        self._getters = {}
+        # Concrete field attnames of all (nested) leaves per model class
+        self._attnames = {}
+        # Compiled setter plans per model class
+        self._setters = {}
+
+    def contribute_to_class(self, cls, name):
+        """Attach the descriptor to the model class.
+
+        Called by Django when the model class is created. Sub-proxies
+        declared using the dictionary form of the spec are attached to the
+        class as well, once, so that reading the field never modifies the
+        class. Compilation is postponed until ``class_prepared``, when all
+        of the attributes referenced in the spec are available on the
+        class.
+
+        :param cls: Model class.
+        :param name: Attribute name.
+        """
+        self.name = name
+        self.model = cls
+        setattr(cls, name, self)
+        for __key, __child in self.children.items():
+            __child.contribute_to_class(cls, __key)
 
-    @property
-    def proxy_field(self):
-        """Proxy field."""
-        obj = options.get("obj") if "obj" in options else self
-        __dict = {}
-        for __field in fields:
+    # Same for classes which are not Django models
+    __set_name__ = contribute_to_class
+
+    def resolve(self, owner):
+        """Resolve the spec against the given class.
+
+        Attributes which do not exist on the class are skipped.
+
+        :param owner: Class.
+        :return: Tuple of ``(key, child)`` pairs, where ``child`` is either
+            a ``NestedProxyField`` (nested proxy) or None (leaf attribute).
+        :rtype: tuple
+        """
+        resolved = []
+        for __field in self.fields:
             # If dictionary
             if isinstance(__field, dict):
-                for __key, __values in __field.items():
-                    setattr(
-                        obj.__class__,
-                        __key,
-                        NestedProxyField(*__values, obj=obj),
-                    )
-                    __dict.update({__key: getattr(obj, __key)})
+                for __key in __field:
+                    resolved.append((__key, self.children[__key]))
             # If string
             else:
-                if hasattr(self, __field):
-                    __dict.update({__field: getattr(obj, __field)})
-        if __as_object is True:
-            return DictProxy(__dict)
-        return __dict
+                __value = getattr(owner, __field, _MISSING)
+                if isinstance(__value, NestedProxyField):
+                    resolved.append((__field, __value))
+                elif __value is not _MISSING:
+                    resolved.append((__field, None))
+        return tuple(resolved)
+
+    def compile(self, owner):
+        """Compile the spec into a getter for the given class.
+
+        The getter returns a ``NestedProxyMapping`` over flat, precomputed
+        ``key => getter`` pairs, where each getter is either an
+        ``operator.attrgetter`` for a leaf attribute or the compiled getter
+        of a child proxy. No type checks are done at access time.
+
+        :param owner: Class the instances of which will be read.
+        :return: Getter, accepting an instance.
+        :rtype: callable
+        """
+        getter = self._getters.get(owner)
+        if getter is not None:
+            return getter
+
+        plan = []
+        setters = {}
+        attnames = set()
+        for __key, __child in self.resolve(owner):
+            if __child is not None:
+                plan.append((__key, __child.compile(owner)))
+                setters[__key] = __child._setters[owner]
+                attnames.update(__child._attnames[owner])
+            else:
+                plan.append((__key, attrgetter(__key)))
+                __attname = get_concrete_attname(owner, __key)
+                setters[__key] = (__key, __attname)
+                if __attname:
+                    attnames.add(__attname)
+        plan = dict(plan)
+
+        if self.as_object is True:
+
+            def getter(instance):
+                return DictProxy(NestedProxyMapping(instance, plan))
+
+        else:
+
+            def getter(instance):
+                return NestedProxyMapping(instance, plan)
+
+        self._attnames[owner] = frozenset(attnames)
+        self._setters[owner] = setters
+        self._getters[owner] = getter
+        return getter
+
+    def load_deferred(self, instance, attnames):
+        """Load deferred leaves of the instance in a single query.
+
+        :param instance: Model instance.
+        :param attnames: Concrete field attnames of the leaves.
+        """
+        deferred = [__a for __a in attnames if __a not in instance.__dict__]
+        message = "{}.{} accessed with deferred fields: {}".format(
+            instance.__class__.__name__,
+            self.name,
+            ", ".join(sorted(deferred)),
+        )
+        if self.on_deferred == "raise":
+            raise FieldError(message)
+        if self.on_deferred == "warn":
+            warnings.warn(message, RuntimeWarning, stacklevel=3)
+        instance.refresh_from_db(fields=deferred)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            getter = self._getters[instance.__class__]
+        except KeyError:
+            getter = self.compile(instance.__class__)
+        attnames = self._attnames[instance.__class__]
+        if not instance.__dict__.keys() >= attnames:
+            self.load_deferred(instance, attnames)
+        return getter(instance)
+
+    def set_values(self, instance, value):
+        """Scatter a (possibly partial) nested mapping into the attributes.
+
+        Does not perform any save actions.
+
+        :param instance: Model instance.
+        :param value: Nested mapping.
+        :return: Concrete field attnames written.
+        :rtype: set
+        """
+        try:
+            setters = self._setters[instance.__class__]
+        except KeyError:
+            self.compile(instance.__class__)
+            setters = self._setters[instance.__class__]
+
+        touched = set()
+        stack = [(setters, value)]
+        while stack:
+            __setters, __value = stack.pop()
+            for __key, __item in __value.items():
+                try:
+                    __setter = __setters[__key]
+                except KeyError:
+                    raise FieldError(
+                        "{}.{} has no {} key.".format(
+                            instance.__class__.__name__, self.name, __key
+                        )
+                    )
+                if __setter.__class__ is dict:
+                    stack.append((__setter, __item))
+                else:
+                    setattr(instance, __setter[0], __item)
+                    if __setter[1]:
+                        touched.add(__setter[1])
+        return touched
+
+    def __set__(self, instance, value):
+        touched = self.set_values(instance, value)
+        dirty = instance.__dict__.get(DIRTY_FIELDS_ATTR)
+        if dirty is None:
+            instance.__dict__[DIRTY_FIELDS_ATTR] = touched
+        else:
+            dirty.update(touched)
+
+
+def pop_nested_proxy_dirty_fields(instance):
+    """Pop concrete field attnames written by assigning NestedProxyFields.
+
+    Example:
+
+        >>> book.publishing_information = {'isbn': '978-0-00-000000-0'}
+        >>> book.save(update_fields=pop_nested_proxy_dirty_fields(book))
+
+    :param instance: Model instance.
+    :return: Concrete field attnames.
+    :rtype: set
+    """
+    return instance.__dict__.pop(DIRTY_FIELDS_ATTR, set())
+
+
+def get_concrete_attname(model, name):
+    """Get attname of a concrete model field.
+
+    :param model: Model class.
+    :param name: Field name.
+    :return: Attname or None (if not a concrete model field).
+    :rtype: str
+    """
+    meta = getattr(model, "_meta", None)
+    if meta is None:
+        return None
+    try:
+        field = meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    if getattr(field, "concrete", False):
+        return field.attname
+    return None
+
+
+def compile_nested_proxy_fields(sender, **kwargs):
+    """Compile all NestedProxyField descriptors of a prepared model.
+
+    Connected to the ``class_prepared`` signal, so that inherited
+    descriptors (for instance, on proxy models) are compiled for each
+    model class separately.
+
+    :param sender: Model class.
+    """
+    for __klass in sender.__mro__:
+        for __value in tuple(vars(__klass).values()):
+            if isinstance(__value, NestedProxyField):
+                __value.compile(sender)
+
 
-    return proxy_field
+class_prepared.connect(compile_nested_proxy_fields)
@@ -0,0 +1,107 @@
+"""
+QuerySet and manager for models with NestedProxyField fields.
+"""
+from django.db import models
+
+from .expressions import nested_proxy_json_object
+from .registry import get_nested_proxy_meta
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "NestedProxyManager",
+    "NestedProxyQuerySet",
+    "NestedProxyQuerySetMixin",
+)
+
+
+class NestedProxyQuerySetMixin:
+    """QuerySet mixin for models with NestedProxyField fields.
+
+    Nested proxy field paths (at any depth) are expanded into the concrete
+    columns they cover, using the nested proxy metadata registry.
+
+    Example:
+
+        >>> Book.objects.only_nested('id', 'title', 'publishing_information')
+        >>> Profile.objects.defer_nested('bank_information')
+        >>> Profile.objects.only_nested('information.data.bank_information')
+        >>> Book.objects.values_nested('id', 'title', 'publishing_information')
+        >>> Profile.objects.annotate_nested_json(information_json='information')
+    """
+
+    def expand_nested(self, fields):
+        """Expand nested proxy field paths into concrete columns.
+
+        :param fields: Field names and/or nested proxy field paths.
+        :return: List of field names.
+        :rtype: list
+        """
+        return get_nested_proxy_meta(self.model).expand(fields)
+
+    def only_nested(self, *fields):
+        """Same as ``only``, but accepts nested proxy field paths.
+
+        :param fields: Field names and/or nested proxy field paths.
+        :return: QuerySet.
+        """
+        return self.only(*self.expand_nested(fields))
+
+    def defer_nested(self, *fields):
+        """Same as ``defer``, but accepts nested proxy field paths.
+
+        :param fields: Field names and/or nested proxy field paths.
+        :return: QuerySet.
+        """
+        return self.defer(*self.expand_nested(fields))
+
+    def values_nested(self, *fields, chunk_size=2000):
+        """Nested dictionaries straight from the database rows.
+
+        Runs a flat ``values_list`` query (streamed with ``iterator``) and
+        reshapes each row into the nested structure declared by the
+        NestedProxyField fields. No model instances are created. Leaves
+        which are not concrete fields (for instance, properties) are left
+        out.
+
+        :param fields: Field names and/or nested proxy field paths. If
+            not given, all concrete fields are used.
+        :param chunk_size: Chunk size passed to ``iterator``.
+        :return: Iterator of dictionaries.
+        """
+        if not fields:
+            fields = [__f.attname for __f in self.model._meta.concrete_fields]
+        columns, shape_row = get_nested_proxy_meta(self.model).get_row_shaper(
+            fields
+        )
+        return map(
+            shape_row,
+            self.values_list(*columns).iterator(chunk_size=chunk_size),
+        )
+
+    def annotate_nested_json(self, **annotations):
+        """Annotate nested proxy fields as JSON built by the database.
+
+        See ``nested_proxy_json_object`` for details. The annotated values
+        are JSON strings, to be used with the ``RawJSONField`` serializer
+        field and ``rest_framework_tricks.renderers.JSONRenderer``.
+
+        :param annotations: Annotation name => nested proxy field path.
+        :return: QuerySet.
+        """
+        return self.annotate(
+            **{
+                __name: nested_proxy_json_object(self.model, __path)
+                for __name, __path in annotations.items()
+            }
+        )
+
+
+class NestedProxyQuerySet(NestedProxyQuerySetMixin, models.QuerySet):
+    """QuerySet for models with NestedProxyField fields."""
+
+
+NestedProxyManager = models.Manager.from_queryset(
+    NestedProxyQuerySet, "NestedProxyManager"
+)
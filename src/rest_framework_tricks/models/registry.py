@@ -0,0 +1,292 @@
+"""
+Nested proxy metadata registry.
+"""
+from functools import lru_cache
+from operator import itemgetter
+
+from django.apps import apps
+
+from .fields.nested_proxy import NestedProxyField, get_concrete_attname
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "get_nested_proxy_meta",
+    "NestedProxyMeta",
+    "populate_registry",
+    "ROW_SHAPER_CACHE_SIZE",
+)
+
+ROW_SHAPER_CACHE_SIZE = 256
+
+
+class NestedProxyMeta:
+    """Nested proxy metadata of a model.
+
+    Available as ``Model._nested_proxy_meta`` (once the registry is
+    populated) or through ``get_nested_proxy_meta(Model)``.
+
+    Attributes (all of them keyed by the nested proxy field name):
+
+    - ``fields``: The ``NestedProxyField`` descriptors.
+    - ``tree``: Nested structure. Leaves map to attribute names.
+    - ``leaf_paths``: Leaf attribute name => full path (starting with the
+      nested proxy field name).
+    - ``columns``: Tuple of concrete field attnames covered.
+
+    And ``proxies_by_column``, the reverse mapping (concrete field attname
+    => tuple of nested proxy field names covering it).
+
+    Example:
+
+        >>> meta = get_nested_proxy_meta(Profile)
+        >>> meta.leaf_paths['information']['bank_name']
+        ('information', 'data', 'bank_information', 'bank_name')
+        >>> meta.proxies_by_column['bank_name']
+        ('bank_information', 'data', 'information')
+
+    :param model: Model class.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.fields = {}
+        for __klass in reversed(model.__mro__):
+            for __name, __value in vars(__klass).items():
+                if isinstance(__value, NestedProxyField):
+                    self.fields[__name] = __value
+
+        self.tree = {}
+        self.leaf_paths = {}
+        self.columns = {}
+        proxies_by_column = {}
+        for __name, __field in self.fields.items():
+            self.tree[__name] = self.build_tree(__field)
+            self.leaf_paths[__name] = dict(
+                self.iter_leaf_paths(self.tree[__name], (__name,))
+            )
+            columns = []
+            for __leaf in self.leaf_paths[__name]:
+                __attname = get_concrete_attname(model, __leaf)
+                if __attname and __attname not in columns:
+                    columns.append(__attname)
+                    proxies_by_column.setdefault(__attname, []).append(__name)
+            self.columns[__name] = tuple(columns)
+        self.proxies_by_column = {
+            __column: tuple(__names)
+            for __column, __names in proxies_by_column.items()
+        }
+        self._path_columns = {}
+        self._serializers = {}
+
+    def __repr__(self):
+        return "<NestedProxyMeta: {}>".format(self.model.__name__)
+
+    def get_columns(self, path):
+        """Get concrete field attnames covered by a (dotted) path.
+
+        The path starts with a nested proxy field name, optionally followed
+        by dot separated keys (for instance, ``"information.data"`` or
+        ``"publishing_information.isbn"``).
+
+        :param path: Path.
+        :return: Tuple of attnames or None (if path is not a nested proxy
+            field path).
+        :rtype: tuple
+        """
+        try:
+            return self._path_columns[path]
+        except KeyError:
+            pass
+
+        __name, *__keys = path.split(".")
+        node = self.tree.get(__name)
+        for __key in __keys:
+            if not isinstance(node, dict):
+                node = None
+                break
+            node = node.get(__key)
+
+        if node is None:
+            columns = None
+        else:
+            columns = []
+            leaves = (
+                (__l for __l, __p in self.iter_leaf_paths(node, ()))
+                if isinstance(node, dict)
+                else (node,)
+            )
+            for __leaf in leaves:
+                __attname = get_concrete_attname(self.model, __leaf)
+                if __attname and __attname not in columns:
+                    columns.append(__attname)
+            columns = tuple(columns)
+
+        self._path_columns[path] = columns
+        return columns
+
+    def expand(self, names):
+        """Expand nested proxy field paths into concrete field attnames.
+
+        Other names are passed as is.
+
+        :param names: Iterable of names and/or nested proxy field paths.
+        :return: List of names, without duplicates.
+        :rtype: list
+        """
+        expanded = {}
+        for __name in names:
+            columns = self.get_columns(__name)
+            if columns is None:
+                expanded[__name] = None
+            else:
+                expanded.update(dict.fromkeys(columns))
+        return list(expanded)
+
+    def build_values_tree(self, fields):
+        """Build output structure for the given names and paths.
+
+        :param fields: Field names and/or nested proxy field paths.
+        :return: Nested dictionary. Leaves map to column names.
+        :rtype: dict
+        """
+        tree = {}
+        for __field in fields:
+            __name, *__keys = __field.split(".")
+            node = self.tree.get(__name)
+            for __key in __keys:
+                node = node.get(__key) if isinstance(node, dict) else None
+
+            # Not a nested proxy field path, use as is
+            if node is None:
+                tree[__field] = __field
+                continue
+
+            *__parents, __key = [__name] + __keys
+            parent = tree
+            for __parent in __parents:
+                parent = parent.setdefault(__parent, {})
+            value = self.to_columns_tree(node)
+            if isinstance(value, dict) and isinstance(parent.get(__key), dict):
+                parent[__key].update(value)
+            elif value is not None:
+                parent[__key] = value
+        return tree
+
+    def to_columns_tree(self, node):
+        """Map leaves of the (sub)tree to concrete field attnames.
+
+        Leaves which are not concrete fields are left out.
+
+        :param node: Nested structure (or a leaf).
+        :return: Nested dictionary, attname or None.
+        """
+        if not isinstance(node, dict):
+            return get_concrete_attname(self.model, node)
+        tree = {}
+        for __key, __value in node.items():
+            __value = self.to_columns_tree(__value)
+            if __value is not None:
+                tree[__key] = __value
+        return tree
+
+    def get_row_shaper(self, fields):
+        """Get (cached) row shaper for the given names and paths.
+
+        The row shaper is a function, built once per set of names (out of
+        ``operator.itemgetter`` closures), which turns a flat
+        ``values_list`` row into the nested structure. The most recently
+        used row shapers are cached (``ROW_SHAPER_CACHE_SIZE``).
+
+        :param fields: Field names and/or nested proxy field paths.
+        :return: Tuple of columns (to be passed to ``values_list``) and
+            the row shaper.
+        :rtype: tuple
+        """
+        return self._get_row_shaper(tuple(fields))
+
+    @lru_cache(maxsize=ROW_SHAPER_CACHE_SIZE)
+    def _get_row_shaper(self, fields):
+        columns = []
+
+        def get_index(column):
+            if column not in columns:
+                columns.append(column)
+            return columns.index(column)
+
+        def build(node):
+            if not isinstance(node, dict):
+                return itemgetter(get_index(node))
+            keys = tuple(node)
+            if any(isinstance(__value, dict) for __value in node.values()):
+                items = tuple(zip(keys, map(build, node.values())))
+                return lambda row: {
+                    __key: __getter(row) for __key, __getter in items
+                }
+            indexes = tuple(map(get_index, node.values()))
+            if len(indexes) > 1:
+                getter = itemgetter(*indexes)
+                return lambda row: dict(zip(keys, getter(row)))
+            if indexes:
+                (key,), (index,) = keys, indexes
+                return lambda row: {key: row[index]}
+            return lambda row: {}
+
+        shape_row = build(self.build_values_tree(fields))
+        return tuple(columns), shape_row
+
+    def build_tree(self, field):
+        """Build nested structure of the given nested proxy field.
+
+        :param field: NestedProxyField.
+        :return: Nested dictionary. Leaves map to attribute names.
+        :rtype: dict
+        """
+        return {
+            __key: (self.build_tree(__child) if __child is not None else __key)
+            for __key, __child in field.resolve(self.model)
+        }
+
+    def iter_leaf_paths(self, tree, path):
+        """Iterate over leaves of the tree.
+
+        :param tree: Nested structure (as returned by ``build_tree``).
+        :param path: Path of the tree.
+        :return: Generator of ``(leaf attribute name, path)`` pairs.
+        """
+        for __key, __value in tree.items():
+            if isinstance(__value, dict):
+                yield from self.iter_leaf_paths(__value, path + (__key,))
+            else:
+                yield __value, path + (__key,)
+
+
+def get_nested_proxy_meta(model):
+    """Get nested proxy metadata of a model.
+
+    Built (and registered) on first use, if the registry has not been
+    populated yet for the given model.
+
+    :param model: Model class.
+    :return: Nested proxy metadata.
+    :rtype: rest_framework_tricks.models.registry.NestedProxyMeta
+    """
+    # Look into the own ``__dict__`` only, since metadata of the parent
+    # model is inherited by (for instance) proxy models.
+    meta = model.__dict__.get("_nested_proxy_meta")
+    if meta is None:
+        meta = NestedProxyMeta(model)
+        model._nested_proxy_meta = meta
+    return meta
+
+
+def populate_registry():
+    """Build nested proxy metadata of all models that have them.
+
+    Called in ``rest_framework_tricks.apps.Config.ready``.
+    """
+    for __model in apps.get_models():
+        meta = NestedProxyMeta(__model)
+        if meta.fields:
+            __model._nested_proxy_meta = meta
@@ -0,0 +1,448 @@
+"""
+Pagination.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import decimal
+import json
+from zlib import crc32
+
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    ValidationError,
+)
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils import encoders
+from rest_framework.utils.urls import replace_query_param
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "build_keyset_filter",
+    "CursorEncoder",
+    "get_path_field",
+    "is_nullable_path",
+    "is_unique_path",
+    "KeysetPagination",
+)
+
+KEYSET_ANNOTATION = "_keyset_{}"
+
+
+class CursorEncoder(encoders.JSONEncoder):
+    """JSON encoder of the cursor values, keeping decimals exact."""
+
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+def is_nullable_path(model, path):
+    """Check if the lookup path may resolve into NULL.
+
+    That is the case if the field (or any relation on the way) is nullable.
+    Paths which can't be resolved (annotations, for instance) are treated as
+    nullable.
+
+    :param model: Model class.
+    :param path: Lookup path (for instance, ``"publisher__city"``).
+    :type path: str
+    :return: True or False
+    :rtype: bool
+    """
+    for __name in path.split("__"):
+        if model is None:
+            return True
+        try:
+            field = (
+                model._meta.pk
+                if __name == "pk"
+                else model._meta.get_field(__name)
+            )
+        except FieldDoesNotExist:
+            return True
+        if field.null or field.many_to_many or field.one_to_many:
+            return True
+        model = field.related_model
+    return False
+
+
+def get_path_field(model, path):
+    """Get the model field the lookup path resolves into.
+
+    :param model: Model class.
+    :param path: Lookup path (for instance, ``"publisher__city"``).
+    :type path: str
+    :return: Field or None (if the path can't be resolved, for annotations,
+        for instance).
+    :rtype: django.db.models.Field
+    """
+    field = None
+    for __name in path.split("__"):
+        if model is None:
+            return None
+        try:
+            field = (
+                model._meta.pk
+                if __name == "pk"
+                else model._meta.get_field(__name)
+            )
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    return field
+
+
+def is_unique_path(model, path):
+    """Check if the lookup path is a unique, not nullable field of the model.
+
+    :param model: Model class.
+    :param path: Lookup path.
+    :type path: str
+    :return: True or False
+    :rtype: bool
+    """
+    if path == "pk":
+        return True
+    try:
+        field = model._meta.get_field(path)
+    except FieldDoesNotExist:
+        return False
+    return field.concrete and field.unique and not field.null
+
+
+def build_keyset_filter(terms, values):
+    """Build filter of the rows following the keyset position.
+
+    NULL values sort as the largest ones (as ``nulls_last`` in ascending
+    order, ``nulls_first`` in descending order). The leading term is
+    bounded on its own as well (``>=``/``<=``), so that an index on it can
+    be used.
+
+    Example:
+
+        >>> build_keyset_filter(
+        >>>     [('state', False, False), ('id', False, False)], ['new', 42]
+        >>> )
+        <Q: (AND: ('state__gte', 'new'),
+                  (OR: ('state__gt', 'new'),
+                       (AND: ('state', 'new'), ('id__gt', 42))))>
+
+    :param terms: List of ``(path, descending, nullable)``.
+    :param values: Values of the terms (of the row at the position).
+    :type terms: list
+    :type values: list
+    :return: Filter or None (if no rows follow).
+    :rtype: django.db.models.Q
+    """
+    keyset_filter = None
+    equal = Q()
+    for (__path, __descending, __nullable), __value in zip(terms, values):
+        if __value is None:
+            __following = (
+                Q(**{"{}__isnull".format(__path): False})
+                if __descending
+                else None
+            )
+            __equal = Q(**{"{}__isnull".format(__path): True})
+        else:
+            __following = Q(
+                **{
+                    "{}__{}".format(
+                        __path, "lt" if __descending else "gt"
+                    ): __value
+                }
+            )
+            if __nullable and not __descending:
+                __following |= Q(**{"{}__isnull".format(__path): True})
+            __equal = Q(**{__path: __value})
+
+        if __following is not None:
+            __following = equal & __following
+            keyset_filter = (
+                __following
+                if keyset_filter is None
+                else keyset_filter | __following
+            )
+        equal &= __equal
+
+    if keyset_filter is None or len(terms) < 2 or values[0] is None:
+        return keyset_filter
+    __path, __descending, __nullable = terms[0]
+    __lookup = "{}__{}".format(__path, "lte" if __descending else "gte")
+    bound = Q(**{__lookup: values[0]})
+    if __nullable and not __descending:
+        bound |= Q(**{"{}__isnull".format(__path): True})
+    return bound & keyset_filter
+
+
+class KeysetPagination(CursorPagination):
+    """Keyset (seek) pagination.
+
+    Rows are paginated by the position of the last row of the page (the
+    values of all the ordering terms), instead of an offset: deep pages
+    cost the same as the first one, given an index on the ordering.
+
+    The ordering is the one applied to the queryset (for instance, the
+    mapped ordering resolved by the ``OrderingFilter``, multi-column
+    mappings and descending variants included), otherwise the
+    ``ordering`` of the pagination class, otherwise the default ordering of
+    the model. A unique ``tie_breaker`` (the primary key, by default) is
+    appended, unless a unique field is part of the ordering already (terms
+    following it are dropped). Lookups across relations are
+    supported. The position is encoded into an opaque cursor.
+
+    Example:
+
+    >>> from rest_framework_tricks.filters import OrderingFilter
+    >>> from rest_framework_tricks.pagination import KeysetPagination
+    >>>
+    >>> class BooksViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    >>>
+    >>>     serializer_class = BookSerializer
+    >>>     filter_backends = (OrderingFilter,)
+    >>>     pagination_class = KeysetPagination
+    >>>     ordering_fields = {
+    >>>         'city': 'publisher__city',
+    >>>         'status': ['state', 'publication_date'],
+    >>>     }
+    >>>     ordering = ('id',)
+    """
+
+    ordering = None
+    tie_breaker = "pk"
+
+    def get_ordering(self, request, queryset, view):
+        """Get ordering terms, the tie breaker included.
+
+        :param request:
+        :param queryset:
+        :param view:
+        :return: List of ``(path, descending, nullable)``.
+        :rtype: list
+        """
+        query = queryset.query
+        ordering = query.order_by or self.ordering
+        if not ordering and query.default_ordering:
+            ordering = queryset.model._meta.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        model = queryset.model
+        terms = []
+        for __term in ordering or ():
+            if isinstance(__term, OrderBy) and isinstance(
+                __term.expression, F
+            ):
+                __path = __term.expression.name
+                __descending = __term.descending
+            elif isinstance(__term, str) and __term != "?":
+                __path = __term.lstrip("-")
+                __descending = __term.startswith("-")
+            else:
+                raise ImproperlyConfigured(
+                    "Keyset pagination supports orderings by fields only, "
+                    "got {!r}.".format(__term)
+                )
+            terms.append(
+                (__path, __descending, is_nullable_path(model, __path))
+            )
+            # Terms following a unique one make no difference
+            if __path == self.tie_breaker or is_unique_path(model, __path):
+                return terms
+
+        terms.append(
+            (
+                self.tie_breaker,
+                terms[-1][1] if terms else False,
+                is_nullable_path(model, self.tie_breaker),
+            )
+        )
+        return terms
+
+    def get_order_by(self, terms, reverse=False):
+        """Get ``order_by`` arguments of the ordering terms.
+
+        :param terms: Ordering terms (as returned by ``get_ordering``).
+        :param reverse: Reverse the ordering.
+        :type terms: list
+        :type reverse: bool
+        :return: ``order_by`` arguments.
+        :rtype: list
+        """
+        order_by = []
+        for __path, __descending, __nullable in terms:
+            __descending = __descending != reverse
+            if __nullable:
+                order_by.append(
+                    F(__path).desc(nulls_first=True)
+                    if __descending
+                    else F(__path).asc(nulls_last=True)
+                )
+            else:
+                order_by.append(
+                    "-{}".format(__path) if __descending else __path
+                )
+        return order_by
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(request)
+        reverse, position = self.cursor or (False, None)
+
+        queryset = queryset.annotate(
+            **{
+                KEYSET_ANNOTATION.format(__i): F(__term[0])
+                for __i, __term in enumerate(self.ordering)
+            }
+        ).order_by(*self.get_order_by(self.ordering, reverse))
+        if position is not None:
+            keyset_filter = build_keyset_filter(
+                [
+                    (__path, __descending != reverse, __nullable)
+                    for __path, __descending, __nullable in self.ordering
+                ],
+                position,
+            )
+            if keyset_filter is None:
+                queryset = queryset.none()
+            else:
+                queryset = queryset.filter(keyset_filter)
+
+        results = list(queryset[: self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        positions = [self.get_position(__row) for __row in self.page]
+        if reverse:
+            self.page.reverse()
+            positions.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None
+
+        if positions:
+            self.previous_position = positions[0]
+            self.next_position = positions[-1]
+        else:
+            # Empty page: both links point back to where we came from
+            self.previous_position = self.next_position = position
+        return self.page
+
+    def get_position(self, row):
+        """Get position (values of the ordering terms) of a row.
+
+        Keyset annotations are removed from dictionaries (``values``
+        querysets).
+
+        :param row: Model instance or dictionary.
+        :return: List of values.
+        :rtype: list
+        """
+        names = [
+            KEYSET_ANNOTATION.format(__i) for __i in range(len(self.ordering))
+        ]
+        if isinstance(row, dict):
+            return [row.pop(__name) for __name in names]
+        return [getattr(row, __name) for __name in names]
+
+    def get_ordering_checksum(self):
+        """Get checksum of the ordering, to detect cursors of others.
+
+        :return: Checksum.
+        :rtype: int
+        """
+        return crc32(repr(self.ordering).encode("utf-8"))
+
+    def decode_cursor(self, request):
+        """Decode the cursor.
+
+        :param request:
+        :return: Tuple of ``(reverse, position)`` or None.
+        :rtype: tuple
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            checksum, reverse, position = json.loads(
+                urlsafe_b64decode(encoded.encode("ascii"))
+            )
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            checksum != self.get_ordering_checksum()
+            or not isinstance(position, list)
+            or len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return bool(reverse), self.to_python_position(position)
+
+    def to_python_position(self, position):
+        """Convert values of the decoded position by the model fields.
+
+        Cursors are supplied by the client, values of the paths which can't
+        be resolved into a model field are only checked to be scalars.
+
+        :param position: Decoded values of the ordering terms.
+        :type position: list
+        :return: List of values.
+        :rtype: list
+        :raise rest_framework.exceptions.NotFound: If a value is invalid.
+        """
+        values = []
+        for (__path, __descending, __nullable), __value in zip(
+            self.ordering, position
+        ):
+            if isinstance(__value, (list, dict)):
+                raise NotFound(self.invalid_cursor_message)
+            __field = get_path_field(self.model, __path)
+            if __value is not None and __field is not None:
+                try:
+                    __value = __field.to_python(__value)
+                except (TypeError, ValueError, ValidationError):
+                    raise NotFound(self.invalid_cursor_message)
+            values.append(__value)
+        return values
+
+    def encode_cursor(self, cursor):
+        """Encode the cursor into the URL.
+
+        :param cursor: Tuple of ``(reverse, position)``.
+        :type cursor: tuple
+        :return: URL.
+        :rtype: str
+        """
+        reverse, position = cursor
+        encoded = urlsafe_b64encode(
+            json.dumps(
+                [self.get_ordering_checksum(), int(reverse), position],
+                cls=CursorEncoder,
+                separators=(",", ":"),
+            ).encode("ascii")
+        ).decode("ascii")
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor((False, self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor((True, self.previous_position))
@@ -0,0 +1,79 @@
+"""
+Renderers.
+"""
+from functools import partial
+from uuid import uuid4
+
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+from .fields.raw_json import RawJSON
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "JSONEncoder",
+    "JSONRenderer",
+)
+
+
+class JSONEncoder(encoders.JSONEncoder):
+    """JSON encoder, replacing ``RawJSON`` values with placeholders.
+
+    :param raw_json_fragments: List, collecting the ``RawJSON`` values
+        (in the order of their occurrence).
+    :param raw_json_placeholder: Placeholder.
+    """
+
+    def __init__(
+        self, *args, raw_json_fragments=None, raw_json_placeholder="", **kwargs
+    ):
+        self.raw_json_fragments = raw_json_fragments
+        self.raw_json_placeholder = raw_json_placeholder
+        super().__init__(*args, **kwargs)
+
+    def default(self, obj):
+        if isinstance(obj, RawJSON) and self.raw_json_fragments is not None:
+            self.raw_json_fragments.append(obj.json)
+            return self.raw_json_placeholder
+        return super().default(obj)
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """JSON renderer, outputting ``RawJSON`` values as is.
+
+    JSON built by the database (see ``RawJSONField``) is spliced into the
+    output, without being decoded and re-encoded.
+    """
+
+    encoder_class = JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render ``data`` into JSON, returning a bytestring."""
+        fragments = []
+        placeholder = uuid4().hex
+        # Renderers are instantiated per request
+        self.encoder_class = partial(
+            type(self).encoder_class,
+            raw_json_fragments=fragments,
+            raw_json_placeholder=placeholder,
+        )
+        try:
+            ret = super().render(data, accepted_media_type, renderer_context)
+        finally:
+            del self.encoder_class
+
+        if not fragments:
+            return ret
+
+        parts = ret.split('"{}"'.format(placeholder).encode())
+        rendered = [parts[0]]
+        for __fragment, __part in zip(fragments, parts[1:]):
+            rendered.append(
+                __fragment.replace("\u2028", "\\u2028")
+                .replace("\u2029", "\\u2029")
+                .encode()
+            )
+            rendered.append(__part)
+        return b"".join(rendered)
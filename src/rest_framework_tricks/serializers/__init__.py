@@ -2,16 +2,34 @@
 Serializers.
 """
 
+from .factory import *
 from .nested_proxy import *
 
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
 __copyright__ = "2017-2022 Artur Barseghyan"
 __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
 __all__ = (
+    "build_read_plan",
+    "build_write_plan",
+    "clone_fields",
     "extract_nested_serializers",
+    "get_all_update_fields",
+    "get_class_fields",
+    "get_field_prototypes",
+    "get_non_field_names",
+    "get_update_fields",
     "HyperlinkedModelSerializer",
+    "is_changed",
     "is_nested_proxy_field",
     "ModelSerializer",
+    "NestedProxyFieldCacheMixin",
     "NestedProxyFieldIdentifier",
+    "NestedProxyListSerializer",
+    "NestedProxyRepresentationMixin",
+    "NestedProxySerializerMixin",
+    "nested_proxy_serializer_for",
+    "pop_nested_data",
     "set_instance_values",
+    "STATIC_FIELDS_HOOKS",
+    "UpdateConflict",
 )
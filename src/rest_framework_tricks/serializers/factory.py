@@ -0,0 +1,135 @@
+"""
+Nested proxy serializers generated from the model declarations.
+"""
+from rest_framework import serializers
+
+from ..models.fields.nested_proxy import get_concrete_attname
+from ..models.registry import get_nested_proxy_meta
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = ("nested_proxy_serializer_for",)
+
+
+def to_camel_case(name):
+    """Convert snake case name into camel case.
+
+    :param name: Name.
+    :type name: str
+    :return: Camel case name.
+    :rtype: str
+    """
+    return "".join(__part.title() for __part in name.split("_"))
+
+
+def is_writable_leaf(model, name):
+    """Check if a leaf of a nested proxy field is writable.
+
+    :param model: Model class.
+    :param name: Attribute name of the leaf.
+    :return: True or False
+    :rtype: bool
+    """
+    if get_concrete_attname(model, name) is None:
+        return False
+    field = model._meta.get_field(name)
+    return field.editable and not field.primary_key
+
+
+def nested_proxy_serializer_for(model, path):
+    """Get nested proxy serializer class of a nested proxy field.
+
+    The whole nested serializer tree is generated from the nested proxy
+    field declarations of the model, once (serializer classes are cached).
+    Leaves which are model fields are built by the ``ModelSerializer``, as
+    usual, other attributes are read only. Nested serializers are not
+    required.
+
+    The generated classes carry their write plan (and the nested structure
+    of the nested proxy field), so nothing is introspected on write.
+
+    Example:
+
+    >>> from rest_framework_tricks.serializers import (
+    >>>     ModelSerializer,
+    >>>     nested_proxy_serializer_for,
+    >>> )
+    >>>
+    >>>
+    >>> class ProfileSerializer(ModelSerializer):
+    >>>
+    >>>     information = nested_proxy_serializer_for(
+    >>>         Profile, 'information'
+    >>>     )(required=False)
+    >>>
+    >>>     class Meta:
+    >>>
+    >>>         model = Profile
+    >>>         fields = ('id', 'information')
+
+    :param model: Model class.
+    :param path: Nested proxy field name, optionally followed by dot
+        separated keys (for instance, ``"information.data"``).
+    :type path: str
+    :return: Serializer class.
+    :rtype: rest_framework.serializers.ModelSerializer
+    :raise ValueError: If path is not a nested proxy field path.
+    """
+    meta = get_nested_proxy_meta(model)
+    try:
+        return meta._serializers[path]
+    except KeyError:
+        pass
+
+    __name, *__keys = path.split(".")
+    tree = meta.tree.get(__name)
+    for __key in __keys:
+        tree = tree.get(__key) if isinstance(tree, dict) else None
+    if not isinstance(tree, dict):
+        raise ValueError(
+            "{} is not a nested proxy field path of {}.".format(
+                path, model.__name__
+            )
+        )
+
+    attrs = {}
+    write_plan = {}
+    for __key, __node in tree.items():
+        if isinstance(__node, dict):
+            # Share serializers of nested proxy fields declared on the model
+            __path = (
+                __key
+                if meta.tree.get(__key) == __node
+                else "{}.{}".format(path, __key)
+            )
+            __serializer_class = nested_proxy_serializer_for(model, __path)
+            attrs[__key] = __serializer_class(required=False)
+            write_plan[__key] = __serializer_class._nested_proxy_write_plan
+        elif is_writable_leaf(model, __node):
+            write_plan[__key] = None
+        elif get_concrete_attname(model, __node) is None:
+            attrs[__key] = serializers.ReadOnlyField()
+
+    attrs["Meta"] = type(
+        "Meta",
+        (),
+        {
+            "model": model,
+            "fields": tuple(tree),
+            "nested_proxy_field": True,
+        },
+    )
+    attrs["__module__"] = __name__
+    attrs["__doc__"] = "{}.{} serializer.".format(model.__name__, path)
+    attrs["_nested_proxy_write_plan"] = write_plan
+
+    serializer_class = type(
+        "{}{}Serializer".format(
+            model.__name__, to_camel_case(path.rsplit(".", 1)[-1])
+        ),
+        (serializers.ModelSerializer,),
+        attrs,
+    )
+    meta._serializers[path] = serializer_class
+    return serializer_class
@@ -38,19 +38,77 @@ and ``HyperlinkedModelSerializer`` classes.
     >>>         )
     >>>         nested_proxy_field = True
 """
-from rest_framework import serializers
+from collections import OrderedDict
+import copy
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from rest_framework import exceptions, serializers, status
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.serializers import raise_errors_on_nested_writes
+from rest_framework.utils import model_meta
+from rest_framework.utils.serializer_helpers import BindingDict
+
+from ..models.fields.nested_proxy import (
+    get_concrete_attname,
+    pop_nested_proxy_dirty_fields,
+)
+from ..models.registry import get_nested_proxy_meta
 
 
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
 __copyright__ = "2017-2022 Artur Barseghyan"
 __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
 __all__ = (
+    "build_read_plan",
+    "build_write_plan",
+    "clone_fields",
     "extract_nested_serializers",
+    "get_all_update_fields",
+    "get_class_fields",
+    "get_field_prototypes",
+    "get_non_field_names",
+    "get_update_fields",
     "HyperlinkedModelSerializer",
+    "is_changed",
     "is_nested_proxy_field",
     "ModelSerializer",
+    "NestedProxyFieldCacheMixin",
     "NestedProxyFieldIdentifier",
+    "NestedProxyListSerializer",
+    "NestedProxyRepresentationMixin",
+    "NestedProxySerializerMixin",
+    "pop_nested_data",
     "set_instance_values",
+    "STATIC_FIELDS_HOOKS",
+    "UpdateConflict",
+)
+
+# Methods building the fields of the serializers
+STATIC_FIELDS_HOOKS = (
+    "__init__",
+    "get_fields",
+    "get_field_names",
+    "get_default_field_names",
+    "build_field",
+    "build_standard_field",
+    "build_relational_field",
+    "build_nested_field",
+    "build_property_field",
+    "build_url_field",
+    "build_unknown_field",
+    "include_extra_kwargs",
+    "get_extra_kwargs",
+    "get_uniqueness_extra_kwargs",
+)
+
+# Modules known to build fields depending on the serializer class only
+STATIC_FIELDS_MODULES = (
+    "rest_framework.fields",
+    "rest_framework.serializers",
+    __name__,
 )
 
 
@@ -112,119 +170,1081 @@ def set_instance_values(nested_serializers, nested_serializers_data, instance):
     :type nested_serializers:
     :type nested_serializers_data:
     :type instance:
-    :return: Same instance with values set.
-    :rtype:
+    :return: Names of the attributes set.
+    :rtype: set
     """
+    field_names = set()
     for __serializer_name, __serializer in nested_serializers_data.items():
         for __field_name, __field_value in __serializer.items():
             if is_nested_proxy_field(
                 nested_serializers[__serializer_name][__field_name]
             ):
-                set_instance_values(
-                    {
-                        __field_name: nested_serializers[__serializer_name][
-                            __field_name
-                        ]
-                    },
-                    {__field_name: __field_value},
-                    instance,
+                field_names.update(
+                    set_instance_values(
+                        {
+                            __field_name: nested_serializers[
+                                __serializer_name
+                            ][__field_name]
+                        },
+                        {__field_name: __field_value},
+                        instance,
+                    )
                 )
             else:
                 setattr(instance, __field_name, __field_value)
+                field_names.add(__field_name)
+    return field_names
+
+
+def get_update_fields(instance, field_names):
+    """Get ``update_fields`` for saving the given attributes.
+
+    Attributes which are not concrete fields and the primary key are left
+    out. Fields with ``auto_now=True`` are included, unless there is nothing
+    else to write.
+
+    :param instance: Instance.
+    :param field_names: Names of the attributes set.
+    :type instance: django.db.models.Model
+    :type field_names: iterable
+    :return: Concrete field attnames.
+    :rtype: set
+    """
+    model = instance.__class__
+    update_fields = {
+        get_concrete_attname(model, __field_name)
+        for __field_name in field_names
+    }
+    update_fields.discard(None)
+    update_fields.discard(model._meta.pk.attname)
+    if update_fields:
+        update_fields.update(
+            __field.attname
+            for __field in model._meta.concrete_fields
+            if getattr(__field, "auto_now", False)
+        )
+    return update_fields
+
+
+def get_non_field_names(model, field_names):
+    """Get names of the attributes which are not fields of the model.
+
+    That is, neither concrete fields nor ``NestedProxyField`` fields (for
+    instance, properties). Assigning those may write any field, so the
+    instance has to be saved without ``update_fields``.
+
+    :param model: Model class.
+    :param field_names: Names of the attributes set.
+    :type field_names: iterable
+    :return: Attribute names.
+    :rtype: set
+    """
+    nested_proxy_fields = get_nested_proxy_meta(model).fields
+    return {
+        __field_name
+        for __field_name in field_names
+        if __field_name not in nested_proxy_fields
+        and get_concrete_attname(model, __field_name) is None
+    }
+
+
+def get_all_update_fields(model):
+    """Get concrete field attnames written by saving without update_fields.
+
+    :param model: Model class.
+    :return: Concrete field attnames.
+    :rtype: set
+    """
+    return {
+        __field.attname
+        for __field in model._meta.concrete_fields
+        if not __field.primary_key
+    }
+
+
+def is_changed(instance, name, value):
+    """Check if assigning the value would change the stored field value.
+
+    Deferred fields and attributes which are not concrete fields are always
+    considered changed (no queries are made).
+
+    :param instance: Instance.
+    :param name: Attribute name.
+    :param value: Value to assign.
+    :type instance: django.db.models.Model
+    :type name: str
+    :return: True or False
+    :rtype: bool
+    """
+    try:
+        field = instance._meta.get_field(name)
+    except FieldDoesNotExist:
+        return True
+    if not field.concrete or field.many_to_many:
+        return True
+    try:
+        current = instance.__dict__[field.attname]
+    except KeyError:
+        return True
+    if field.is_relation and isinstance(value, models.Model):
+        value = getattr(value, field.target_field.attname)
+    return current != value
+
+
+def build_write_plan(serializer, fields=None):
+    """Build write plan of a serializer.
+
+    The write plan maps the (source) names of the nested proxy fields of the
+    serializer to their own plans, recursively. Within a nested proxy
+    serializer, other fields map to None, meaning that the value is assigned
+    to the model attribute of the same name.
+
+    Example:
+
+        >>> build_write_plan(BookSerializer())
+        {'publishing_information': {'publication_date': None,
+                                    'isbn': None,
+                                    'pages': None},
+         'stock_information': {'stock_count': None,
+                               'price': None,
+                               'state': None}}
+
+    :param serializer: Serializer instance.
+    :param fields: Fields to walk (defaults to the fields of the serializer
+        instance). Fields of nested proxy serializers are taken from their
+        classes, if possible (see ``get_class_fields``).
+    :type serializer: rest_framework.serializers.Serializer
+    :type fields: dict
+    :return: Write plan.
+    :rtype: dict
+    """
+    # Generated nested proxy serializers carry their write plan
+    plan = serializer.__class__.__dict__.get("_nested_proxy_write_plan")
+    if plan is not None and is_nested_proxy_field(serializer):
+        return plan
+
+    if fields is None:
+        fields = serializer.fields
+    is_nested = is_nested_proxy_field(serializer)
+    plan = {}
+    # Prototypes are not bound, source may be missing
+    for __name, __field in fields.items():
+        if __field.read_only:
+            continue
+        if is_nested_proxy_field(__field):
+            plan[__field.source or __name] = build_write_plan(
+                __field, get_class_fields(__field)
+            )
+        elif is_nested:
+            plan[__field.source or __name] = None
+    return plan
+
+
+def pop_nested_data(write_plan, validated_data):
+    """Pop nested proxy data from the validated data, flattened.
+
+    :param write_plan: Write plan (as returned by ``build_write_plan``).
+    :param validated_data: Validated data.
+    :type write_plan: dict
+    :type validated_data: dict
+    :return: Model attribute name => value.
+    :rtype: dict
+    """
+    values = {}
+    stack = [
+        (__plan, validated_data.pop(__name))
+        for __name, __plan in write_plan.items()
+        if __name in validated_data
+    ]
+    while stack:
+        __plan, __data = stack.pop()
+        if not __data:
+            continue
+        for __key, __value in __data.items():
+            __sub_plan = __plan.get(__key)
+            if __sub_plan is None:
+                values[__key] = __value
+            else:
+                stack.append((__sub_plan, __value))
+    return values
+
+
+def get_field_prototypes(serializer, get_fields=None):
+    """Get fields of the serializer class, built once per class.
+
+    The fields returned are prototypes: they are never bound, use
+    ``clone_fields`` to get fields for a serializer instance.
+
+    :param serializer: Serializer instance.
+    :param get_fields: Function building the fields (defaults to the
+        ``get_fields`` of the serializer).
+    :type serializer: rest_framework.serializers.Serializer
+    :type get_fields: callable
+    :return: Field name => field.
+    :rtype: dict
+    """
+    # Look into the own ``__dict__`` only, since subclasses may have other
+    # fields.
+    prototypes = serializer.__class__.__dict__.get(
+        "_nested_proxy_field_prototypes"
+    )
+    if prototypes is None:
+        prototypes = (get_fields or serializer.get_fields)()
+        serializer.__class__._nested_proxy_field_prototypes = prototypes
+    return prototypes
+
+
+def has_static_fields(serializer):
+    """Check if fields of the serializer depend on the class only.
+
+    That is the case if none of the methods building the fields (see
+    ``STATIC_FIELDS_HOOKS``), ``__init__`` included, are customised, since
+    those may depend on the serializer instance (for instance, on the
+    ``context``). Set the ``static_fields`` ``Meta`` option to True (or
+    False) to tell explicitly. Checked once per serializer class.
+
+    :param serializer: Serializer instance.
+    :type serializer: rest_framework.serializers.Serializer
+    :return: True or False
+    :rtype: bool
+    """
+    klass = serializer.__class__
+    static = klass.__dict__.get("_nested_proxy_static_fields")
+    if static is not None:
+        return static
+
+    static = getattr(getattr(klass, "Meta", None), "static_fields", None)
+    if static is None:
+        static = True
+        for __name in STATIC_FIELDS_HOOKS:
+            for __klass in klass.__mro__:
+                if __name in __klass.__dict__:
+                    if __klass.__module__ not in STATIC_FIELDS_MODULES:
+                        static = False
+                    break
+    klass._nested_proxy_static_fields = static
+    return static
+
+
+def get_class_fields(serializer):
+    """Get fields of the serializer class.
+
+    Unlike the fields of a serializer instance, those are never pruned (for
+    instance, by sparse fieldsets).
+
+    :param serializer: Serializer instance.
+    :type serializer: rest_framework.serializers.Serializer
+    :return: Field name => field (prototypes, as returned by
+        ``get_field_prototypes``) or None, if fields depend on the
+        serializer instance (see ``has_static_fields``).
+    :rtype: dict
+    """
+    if not has_static_fields(serializer):
+        return None
+    if (
+        serializer.__class__.get_fields
+        is NestedProxyFieldCacheMixin.get_fields
+    ):
+        return get_field_prototypes(
+            serializer,
+            super(NestedProxyFieldCacheMixin, serializer).get_fields,
+        )
+    return get_field_prototypes(serializer)
+
+
+def clone_fields(prototypes):
+    """Clone field prototypes.
+
+    Fields of nested proxy serializers are cloned (from the prototypes of
+    their own classes) and bound right away, instead of being built on
+    first access.
+
+    :param prototypes: Field name => field (as returned by
+        ``get_field_prototypes``).
+    :type prototypes: dict
+    :return: Field name => field.
+    :rtype: dict
+    """
+    fields = {}
+    for __name, __prototype in prototypes.items():
+        __field = copy.deepcopy(__prototype)
+        __prototypes = (
+            get_class_fields(__field)
+            if isinstance(__field, serializers.Serializer)
+            and is_nested_proxy_field(__field)
+            else None
+        )
+        if __prototypes is not None:
+            __nested_fields = BindingDict(__field)
+            for __key, __value in clone_fields(__prototypes).items():
+                __nested_fields[__key] = __value
+            # ``fields`` is a ``cached_property``
+            __field.__dict__["fields"] = __nested_fields
+        fields[__name] = __field
+    return fields
+
+
+# Kinds of the read plan steps
+READ_LEAF = 0
+READ_FIELD = 1
+READ_NESTED = 2
+READ_DEFERRED = 3
+
+
+def can_flatten_representation(serializer, tree):
+    """Check if representation of a nested proxy serializer can be flattened.
+
+    That is the case if the representation is not customised and all of the
+    (readable) fields map to the structure of the nested proxy field. Leaves
+    must not customise ``get_attribute`` either (as the relational fields
+    do), since flattened leaves are read directly from the instance.
+
+    :param serializer: Nested proxy serializer.
+    :param tree: Nested structure of the nested proxy field (sub)tree.
+    :type serializer: rest_framework.serializers.Serializer
+    :type tree: dict
+    :return: True or False
+    :rtype: bool
+    """
+    if (
+        not isinstance(tree, dict)
+        or not isinstance(serializer, serializers.Serializer)
+        or serializer.__class__.to_representation
+        is not serializers.Serializer.to_representation
+    ):
+        return False
+    for __field in serializer._readable_fields:
+        __node = tree.get(__field.source)
+        if __node is None:
+            return False
+        if isinstance(__field, serializers.BaseSerializer):
+            if not (
+                is_nested_proxy_field(__field)
+                and can_flatten_representation(__field, __node)
+            ):
+                return False
+        elif (
+            isinstance(__node, dict)
+            or __field.__class__.get_attribute
+            is not serializers.Field.get_attribute
+        ):
+            return False
+    return True
+
+
+def build_read_plan(serializer):
+    """Build read plan of a serializer.
+
+    The read plan is a flat list of steps, producing the same output as
+    ``Serializer.to_representation`` does. Leaves of the nested proxy
+    serializers are read directly from the model instance (the nested proxy
+    field values are never built). Steps are tuples of ``(kind, parent
+    index, key, getter, to_representation)``:
+
+    - ``READ_LEAF``: ``getter`` reads the attribute from the instance.
+    - ``READ_FIELD``: ``getter`` is the ``get_attribute`` of a (not
+      flattened) field.
+    - ``READ_NESTED``: Creates a nested dictionary, ``getter`` is its index.
+    - ``READ_DEFERRED``: Loads deferred leaves of a nested proxy field
+      (``getter`` is the descriptor, ``to_representation`` the attnames).
+
+    The read plan is bound to the fields of the given serializer instance.
+
+    :param serializer: Serializer instance.
+    :type serializer: rest_framework.serializers.Serializer
+    :return: Tuple of steps and number of dictionaries to create.
+    :rtype: tuple
+    """
+    model = serializer.Meta.model
+    meta = get_nested_proxy_meta(model)
+    steps = []
+    size = 1
+
+    def add_nested(nested_serializer, tree, parent, attnames):
+        nonlocal size
+        for __field in nested_serializer._readable_fields:
+            __node = tree[__field.source]
+            if isinstance(__node, dict):
+                __index = size
+                size += 1
+                steps.append(
+                    (READ_NESTED, parent, __field.field_name, __index, None)
+                )
+                add_nested(__field, __node, __index, attnames)
+            else:
+                __attname = get_concrete_attname(model, __node)
+                if __attname is not None:
+                    attnames.add(__attname)
+                steps.append(
+                    (
+                        READ_LEAF,
+                        parent,
+                        __field.field_name,
+                        attrgetter(__node),
+                        __field.to_representation,
+                    )
+                )
+
+    for __field in serializer._readable_fields:
+        __tree = meta.tree.get(__field.source)
+        if is_nested_proxy_field(__field) and can_flatten_representation(
+            __field, __tree
+        ):
+            # Deferred leaves read (only) are loaded in a single query. The
+            # step is filled in once the leaves are known.
+            __attnames = set()
+            __position = len(steps)
+            steps.append(None)
+            __index = size
+            size += 1
+            steps.append((READ_NESTED, 0, __field.field_name, __index, None))
+            add_nested(__field, __tree, __index, __attnames)
+            steps[__position] = (
+                READ_DEFERRED,
+                None,
+                None,
+                meta.fields[__field.source],
+                frozenset(__attnames),
+            )
+        else:
+            steps.append(
+                (
+                    READ_FIELD,
+                    0,
+                    __field.field_name,
+                    __field.get_attribute,
+                    __field.to_representation,
+                )
+            )
+    return steps, size
+
+
+class UpdateConflict(exceptions.APIException):
+    """Direct update did not match any row."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The object does not exist or has been modified."
+    default_code = "conflict"
 
 
 class NestedProxyFieldIdentifier:
     """NestedProxyField identifier."""
 
 
-class ModelSerializer(serializers.ModelSerializer):
-    """ModelSerializer for models with NestedProxyField fields.
+class NestedProxyListSerializer(serializers.ListSerializer):
+    """List serializer for models with NestedProxyField fields.
+
+    Creates all the instances using a single ``bulk_create`` (split into
+    batches of ``batch_size``, if set). Primary keys are set on the
+    instances returned, if the database backend supports it.
+
+    Updates (for instance, ``partial=True`` with a list of partial payloads
+    containing the primary keys) fetch all the instances in a single query
+    and write the changed ones using a single ``bulk_update``, covering all
+    the fields changed in any of the payloads (available as
+    ``changed_fields``).
+
+    Note, that ``save`` is not called and no ``pre_save``/``post_save``
+    signals are sent.
+
+    Opt-in, set it as the ``list_serializer_class`` option of the ``Meta``
+    of the (child) serializer. Not suitable for models relying on ``save``
+    or the signals, nor for multi-table inherited models (not supported by
+    ``bulk_create``). The batch sizes can be set using the
+    ``bulk_create_batch_size`` and ``bulk_update_batch_size`` options of
+    the ``Meta`` of the (child) serializer.
 
     Example:
 
-    >>> from rest_framework_tricks.serializers import ModelSerializer
-    >>>
-    >>>
-    >>> class BookSerializer(ModelSerializer):
-    >>>
-    >>>     publishing_information = PublishingInformationSerializer(
-    >>>         required=False
-    >>>     )
-    >>>     stock_information = StockInformationSerializer(required=False)
+    >>> class BookSerializer(HyperlinkedModelSerializer):
     >>>
     >>>     class Meta:
     >>>
     >>>         model = Book
-    >>>         fields = (
-    >>>             'url',
-    >>>             'id',
-    >>>             'title',
-    >>>             'description',
-    >>>             'summary',
-    >>>             'publishing_information',
-    >>>             'stock_information',
-    >>>         )
+    >>>         fields = (...)
+    >>>         list_serializer_class = NestedProxyListSerializer
+    >>>         bulk_create_batch_size = 1000
+    >>>         bulk_update_batch_size = 500
+    >>>
+    >>>
+    >>> serializer = BookSerializer(
+    >>>     Book.objects.all(),
+    >>>     data=[
+    >>>         {'id': 1, 'stock_information': {'stock_count': 10}},
+    >>>         {'id': 2, 'publishing_information': {'pages': 200}},
+    >>>     ],
+    >>>     many=True,
+    >>>     partial=True,
+    >>> )
+    >>> serializer.is_valid(raise_exception=True)
+    >>> serializer.save()
     """
 
+    batch_size = None
+
+    def get_batch_size(self, option="bulk_create_batch_size"):
+        """Get batch size.
+
+        :param option: Name of the ``Meta`` option.
+        :type option: str
+        :return: Batch size.
+        :rtype: int
+        """
+        return getattr(
+            getattr(self.child, "Meta", None),
+            option,
+            self.batch_size,
+        )
+
+    def get_item_pk(self, index, attrs):
+        """Get primary key of an item to update.
+
+        Taken from the validated data (if the primary key field is
+        writable) or from the initial data.
+
+        :param index: Index of the item.
+        :param attrs: Validated data of the item.
+        :type index: int
+        :type attrs: dict
+        :return: Primary key.
+        :raise rest_framework.serializers.ValidationError: If the primary
+            key is missing or malformed.
+        """
+        pk_field = self.child.Meta.model._meta.pk
+        if pk_field.name in attrs:
+            return attrs.pop(pk_field.name)
+        try:
+            __item = self.initial_data[index]
+        except (AttributeError, IndexError, KeyError, TypeError):
+            __item = {}
+        __pk = __item.get(pk_field.name, __item.get("pk"))
+        if __pk is None:
+            raise serializers.ValidationError(
+                {pk_field.name: "This field is required."}
+            )
+        try:
+            return pk_field.to_python(__pk)
+        except (TypeError, ValueError, ValidationError):
+            raise serializers.ValidationError(
+                {pk_field.name: "Invalid value: {}.".format(__pk)}
+            )
+
+    def get_update_objects(self, validated_data):
+        """Resolve the primary keys and the instances of the items to update.
+
+        All the instances are fetched in a single query.
+
+        :param validated_data: List of validated data.
+        :type validated_data: list
+        :return: Tuple of the list of primary keys and a dictionary of the
+            instances by primary key.
+        :rtype: tuple
+        :raise rest_framework.serializers.ValidationError: With a list of
+            errors (one per item), if primary keys are missing, malformed or
+            unknown.
+        """
+        pk_name = self.child.Meta.model._meta.pk.name
+        pks = []
+        errors = []
+        for __index, __attrs in enumerate(validated_data):
+            try:
+                pks.append(self.get_item_pk(__index, __attrs))
+            except serializers.ValidationError as err:
+                pks.append(None)
+                errors.append(err.detail)
+            else:
+                errors.append({})
+
+        if isinstance(self.instance, models.QuerySet):
+            objects = self.instance.in_bulk(
+                [__pk for __pk in pks if __pk is not None]
+            )
+        else:
+            objects = {__obj.pk: __obj for __obj in self.instance}
+        for __pk, __errors in zip(pks, errors):
+            if __pk is not None and __pk not in objects:
+                __errors[pk_name] = ["Not found: {}.".format(__pk)]
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return pks, objects
+
+    def to_internal_value(self, data):
+        """List of validated data <- list of items.
+
+        On updates, the primary keys of the items are resolved and the
+        instances fetched here, so that missing, malformed or unknown
+        primary keys are reported by ``is_valid``.
+
+        :param data: List of items.
+        :type data: list
+        :return: List of validated data.
+        :rtype: list
+        """
+        validated_data = super().to_internal_value(data)
+        if self.instance is not None:
+            self.update_objects = self.get_update_objects(validated_data)
+        return validated_data
+
+    def create(self, validated_data):
+        """Create.
+
+        :param validated_data: List of validated data.
+        :return: List of instances.
+        """
+        # Respect customised ``create`` of the child serializer
+        if (
+            self.child.__class__.create
+            is not NestedProxySerializerMixin.create
+        ):
+            return super().create(validated_data)
+
+        model = self.child.Meta.model
+        write_plan = self.child.get_write_plan()
+        instances = []
+        for __attrs in validated_data:
+            __attrs.update(pop_nested_data(write_plan, __attrs))
+            instances.append(model(**__attrs))
+
+        return model._default_manager.bulk_create(
+            instances, batch_size=self.get_batch_size()
+        )
+
+    def update(self, instance, validated_data):
+        """Update.
+
+        :param instance: QuerySet or list of instances.
+        :param validated_data: List of validated data.
+        :return: List of instances.
+        """
+        model = self.child.Meta.model
+        write_plan = self.child.get_write_plan()
+        # Resolved on validation
+        pks, objects = self.__dict__.pop(
+            "update_objects", None
+        ) or self.get_update_objects(validated_data)
+
+        info = model_meta.get_field_info(model)
+        instances = []
+        changed = {}
+        field_names = set()
+        m2m_fields = []
+        for __pk, __attrs in zip(pks, validated_data):
+            __instance = objects[__pk]
+            __attrs.update(pop_nested_data(write_plan, __attrs))
+            for __attr, __value in __attrs.items():
+                if __attr in info.relations and info.relations[__attr].to_many:
+                    m2m_fields.append((__instance, __attr, __value))
+                else:
+                    if is_changed(__instance, __attr, __value):
+                        field_names.add(__attr)
+                        changed[__pk] = __instance
+                    setattr(__instance, __attr, __value)
+            # Concrete fields written by assigning NestedProxyField fields
+            __dirty = pop_nested_proxy_dirty_fields(__instance)
+            if __dirty:
+                field_names.update(__dirty)
+                changed[__pk] = __instance
+            instances.append(__instance)
+
+        # Write the changed instances only
+        self.changed_fields = frozenset()
+        if changed and get_non_field_names(model, field_names):
+            # Properties (for instance) may write any field
+            self.changed_fields = frozenset(get_all_update_fields(model))
+            for __instance in changed.values():
+                __instance.save()
+        elif changed:
+            self.changed_fields = frozenset(
+                get_update_fields(instances[0], field_names)
+            )
+            for __field in model._meta.concrete_fields:
+                if getattr(__field, "auto_now", False):
+                    for __instance in changed.values():
+                        __field.pre_save(__instance, False)
+            if self.changed_fields:
+                model._default_manager.bulk_update(
+                    list(changed.values()),
+                    self.changed_fields,
+                    batch_size=self.get_batch_size("bulk_update_batch_size"),
+                )
+
+        for __instance, __attr, __value in m2m_fields:
+            getattr(__instance, __attr).set(__value)
+
+        return instances
+
+
+class NestedProxyFieldCacheMixin:
+    """Build fields of the serializer once per class.
+
+    DRF builds the fields (introspecting the model) every time a serializer
+    is instantiated, fields of nested serializers included. Here, fields are
+    built once per serializer class (and once per nested proxy serializer
+    class) and cloned for every serializer instance.
+
+    Serializers customising the way fields are built (see
+    ``has_static_fields``) build them for every instance, as usual.
+    """
+
+    def get_fields(self):
+        """Get fields (cloned from the prototypes of the class).
+
+        :return: Field name => field.
+        :rtype: dict
+        """
+        if not has_static_fields(self):
+            return super().get_fields()
+        return clone_fields(get_field_prototypes(self, super().get_fields))
+
+
+class NestedProxyRepresentationMixin:
+    """Flat (compiled) representation of nested proxy serializers.
+
+    Nested proxy serializers are not called on read. Instead, the
+    serializer is compiled into a flat read plan (see ``build_read_plan``)
+    once per serializer instance (for lists, once per request), and the
+    leaves are read directly from the model instance.
+
+    Nested proxy serializers with a customised ``to_representation``, or
+    with fields not mapping to the structure of the nested proxy field,
+    are represented as usual. Set the ``compiled_representation``
+    ``Meta`` option to False to disable.
+    """
+
+    def get_read_plan(self):
+        """Get read plan of the serializer instance.
+
+        :return: Tuple of steps and number of dictionaries to create.
+        :rtype: tuple
+        """
+        try:
+            return self._read_plan
+        except AttributeError:
+            self._read_plan = build_read_plan(self)
+            return self._read_plan
+
+    def to_representation(self, instance):
+        """Object instance -> Dict of primitive datatypes."""
+        if instance.__class__ is not self.Meta.model or not getattr(
+            self.Meta, "compiled_representation", True
+        ):
+            return super().to_representation(instance)
+
+        steps, size = self.get_read_plan()
+        ret = OrderedDict()
+        containers = [ret] * size
+        for __kind, __parent, __key, __getter, __to_repr in steps:
+            if __kind == READ_LEAF:
+                __value = __getter(instance)
+                containers[__parent][__key] = (
+                    None if __value is None else __to_repr(__value)
+                )
+            elif __kind == READ_NESTED:
+                containers[__getter] = containers[__parent][
+                    __key
+                ] = OrderedDict()
+            elif __kind == READ_FIELD:
+                try:
+                    __value = __getter(instance)
+                except SkipField:
+                    continue
+                if (
+                    __value.pk
+                    if isinstance(__value, PKOnlyObject)
+                    else __value
+                ) is None:
+                    ret[__key] = None
+                else:
+                    ret[__key] = __to_repr(__value)
+            elif not instance.__dict__.keys() >= __to_repr:
+                __getter.load_deferred(instance, __to_repr)
+        return ret
+
+
+class NestedProxySerializerMixin:
+    """Create and update for models with NestedProxyField fields.
+
+    The nested structure of the serializer is compiled into a write plan
+    once per serializer class (see ``get_write_plan``).
+
+    ``Meta`` options:
+
+    - ``direct_update``: If set to True, updates are written using a single
+      ``QuerySet.update`` (see ``direct_update``), without loading or saving
+      the instance.
+    - ``version_field``: Name of an integer field used for optimistic
+      concurrency control of direct updates. The version sent by the client
+      must match the one stored, and is incremented on every update.
+    """
+
+    def get_write_plan(self):
+        """Get write plan of the serializer class.
+
+        Built on first use, from the fields of the class (never from the
+        possibly pruned fields of the instance), and stored on the class
+        itself (subclasses get their own). If fields depend on the
+        serializer instance (see ``get_class_fields``), the write plan is
+        built for (and stored on) the instance.
+
+        :return: Write plan.
+        :rtype: dict
+        """
+        # Look into the own ``__dict__`` only, since a plan of the parent
+        # serializer does not cover the fields added by subclasses.
+        write_plan = self.__class__.__dict__.get("_nested_proxy_write_plan")
+        if write_plan is not None:
+            return write_plan
+
+        fields = get_class_fields(self)
+        if fields is None:
+            try:
+                return self._write_plan
+            except AttributeError:
+                self._write_plan = build_write_plan(self)
+                return self._write_plan
+
+        write_plan = build_write_plan(self, fields)
+        self.__class__._nested_proxy_write_plan = write_plan
+        return write_plan
+
     def create(self, validated_data):
         """Create.
 
         :param validated_data:
         :return:
         """
-        # Collect information on nested serializers
-        (
-            __nested_serializers,
-            __nested_serializers_data,
-        ) = extract_nested_serializers(
-            self,
-            validated_data,
+        validated_data.update(
+            pop_nested_data(self.get_write_plan(), validated_data)
         )
-
-        # Create instance, but don't save it yet
         instance = self.Meta.model(**validated_data)
+        instance.save()
+        return instance
 
-        # Assign fields to the `instance` one by one
-        set_instance_values(
-            __nested_serializers, __nested_serializers_data, instance
-        )
+    def get_update_queryset(self, instance):
+        """Get queryset of the direct update.
+
+        The ``update_queryset`` of the serializer context (if given) is
+        used as a base, which allows to restrict the rows that may be
+        updated (see ``DirectUpdateModelMixin``).
+
+        :param instance: Instance.
+        :return: QuerySet matching the instance.
+        :rtype: django.db.models.QuerySet
+        """
+        queryset = self.context.get("update_queryset")
+        if queryset is None:
+            queryset = self.Meta.model._default_manager.all()
+        return queryset.filter(pk=instance.pk)
+
+    def get_update_where(self, instance, validated_data):
+        """Get additional predicate of the direct update.
+
+        :param instance: Instance.
+        :param validated_data: Validated (flattened) data.
+        :return: Q object or None.
+        :rtype: django.db.models.Q
+        """
+        return None
+
+    def write_direct_update(self, instance, queryset, updates, conditional):
+        """Write the direct update.
+
+        :param instance: Instance.
+        :param queryset: QuerySet matching the instance (and the version or
+            the additional predicate, if any).
+        :param updates: Field name => value.
+        :param conditional: True if the version or the additional
+            predicate are part of the queryset.
+        :type updates: dict
+        :type conditional: bool
+        :raise rest_framework.exceptions.NotFound: If the row does not
+            exist.
+        :raise UpdateConflict: If the row did not match.
+        """
+        for __field in self.Meta.model._meta.concrete_fields:
+            if getattr(__field, "auto_now", False):
+                updates[__field.name] = __field.pre_save(instance, False)
+
+        self.changed_fields = frozenset(get_update_fields(instance, updates))
+        if queryset.update(**updates):
+            return
+        # Tell a missing row from a conflicting one
+        if not conditional or not self.get_update_queryset(instance).exists():
+            raise exceptions.NotFound()
+        raise UpdateConflict()
+
+    def direct_update(self, instance, validated_data):
+        """Update using a single ``QuerySet.update``.
+
+        The instance is not loaded (it may as well be an unsaved instance
+        holding the primary key only) and not saved. Concrete fields of the
+        validated data (including the nested ones) are written, values are
+        set on the instance. No ``pre_save``/``post_save`` signals are sent.
+
+        Nothing is written if there is nothing to write (the row is checked
+        to exist though).
+
+        :param instance: Instance.
+        :param validated_data: Validated data.
+        :return: Instance.
+        :raise rest_framework.exceptions.NotFound: If the row does not exist
+            (in the ``update_queryset``).
+        :raise UpdateConflict: If the row did not match the version or the
+            additional predicate.
+        """
+        model = self.Meta.model
+        values = pop_nested_data(self.get_write_plan(), validated_data)
+        raise_errors_on_nested_writes("update", self, validated_data)
+        validated_data.update(values)
+        info = model_meta.get_field_info(model)
+
+        queryset = self.get_update_queryset(instance)
+        where = self.get_update_where(instance, validated_data)
+        if where is not None:
+            queryset = queryset.filter(where)
+
+        updates = {}
+        m2m_fields = []
+        for __attr, __value in validated_data.items():
+            if __attr in info.relations and info.relations[__attr].to_many:
+                m2m_fields.append((__attr, __value))
+            else:
+                setattr(instance, __attr, __value)
+                if get_concrete_attname(model, __attr) is not None:
+                    updates[__attr] = __value
+
+        version_field = getattr(self.Meta, "version_field", None)
+        if version_field:
+            if version_field not in updates:
+                raise serializers.ValidationError(
+                    {version_field: "This field is required."}
+                )
+            version = updates[version_field]
+            queryset = queryset.filter(**{version_field: version})
+            updates[version_field] = models.F(version_field) + 1
+
+        if updates:
+            self.write_direct_update(
+                instance,
+                queryset,
+                updates,
+                bool(version_field) or where is not None,
+            )
+        else:
+            self.changed_fields = frozenset()
+            if not self.get_update_queryset(instance).exists():
+                raise exceptions.NotFound()
+
+        if version_field:
+            setattr(instance, version_field, version + 1)
+
+        for __attr, __value in m2m_fields:
+            getattr(instance, __attr).set(__value)
 
-        # Save the instance and return
-        instance.save()
         return instance
 
     def update(self, instance, validated_data):
         """Update.
 
+        The instance is saved once, only the fields present in the
+        ``validated_data`` (including the nested ones) whose values differ
+        from the current ones are written. If none of them changed, the
+        instance is not saved at all. Fields written by assigning
+        ``NestedProxyField`` fields are included. If attributes which are not
+        fields (for instance, properties) are set, the instance is saved
+        without ``update_fields``. The concrete fields written are
+        available as ``changed_fields`` (and as ``update_fields`` in the
+        ``pre_save``/``post_save`` signals).
+
         :param instance:
         :param validated_data:
         :return:
         """
-        # Collect information on nested serializers
-        (
-            __nested_serializers,
-            __nested_serializers_data,
-        ) = extract_nested_serializers(
-            self,
-            validated_data,
-        )
+        if getattr(self.Meta, "direct_update", False):
+            return self.direct_update(instance, validated_data)
 
-        # Update the instance
-        instance = super(ModelSerializer, self).update(
-            instance, validated_data
-        )
+        values = pop_nested_data(self.get_write_plan(), validated_data)
+        raise_errors_on_nested_writes("update", self, validated_data)
+        validated_data.update(values)
+        info = model_meta.get_field_info(instance)
 
-        # Assign fields to the `instance` one by one
-        set_instance_values(
-            __nested_serializers, __nested_serializers_data, instance
-        )
+        # Update the instance (same as ``ModelSerializer.update`` does,
+        # except for saving)
+        field_names = set()
+        m2m_fields = []
+        for __attr, __value in validated_data.items():
+            if __attr in info.relations and info.relations[__attr].to_many:
+                m2m_fields.append((__attr, __value))
+            else:
+                if is_changed(instance, __attr, __value):
+                    field_names.add(__attr)
+                setattr(instance, __attr, __value)
+        # Concrete fields written by assigning NestedProxyField fields
+        field_names.update(pop_nested_proxy_dirty_fields(instance))
+
+        # Save the instance once, writing the changed fields only. Skip
+        # saving if nothing changed. Attributes which are not fields (for
+        # instance, properties) may write any field, save all of them then.
+        if get_non_field_names(instance.__class__, field_names):
+            self.changed_fields = frozenset(
+                get_all_update_fields(instance.__class__)
+            )
+            instance.save()
+        else:
+            self.changed_fields = frozenset(
+                get_update_fields(instance, field_names)
+            )
+            if self.changed_fields:
+                instance.save(update_fields=self.changed_fields)
+
+        for __attr, __value in m2m_fields:
+            getattr(instance, __attr).set(__value)
 
-        # Save the instance and return
-        instance.save()
         return instance
 
 
-class HyperlinkedModelSerializer(serializers.HyperlinkedModelSerializer):
+class ModelSerializer(
+    NestedProxyFieldCacheMixin,
+    NestedProxyRepresentationMixin,
+    NestedProxySerializerMixin,
+    serializers.ModelSerializer,
+):
+    """ModelSerializer for models with NestedProxyField fields.
+
+    Example:
+
+    >>> from rest_framework_tricks.serializers import ModelSerializer
+    >>>
+    >>>
+    >>> class BookSerializer(ModelSerializer):
+    >>>
+    >>>     publishing_information = PublishingInformationSerializer(
+    >>>         required=False
+    >>>     )
+    >>>     stock_information = StockInformationSerializer(required=False)
+    >>>
+    >>>     class Meta:
+    >>>
+    >>>         model = Book
+    >>>         fields = (
+    >>>             'url',
+    >>>             'id',
+    >>>             'title',
+    >>>             'description',
+    >>>             'summary',
+    >>>             'publishing_information',
+    >>>             'stock_information',
+    >>>         )
+    """
+
+
+class HyperlinkedModelSerializer(
+    NestedProxyFieldCacheMixin,
+    NestedProxyRepresentationMixin,
+    NestedProxySerializerMixin,
+    serializers.HyperlinkedModelSerializer,
+):
     """HyperlinkedModelSerializer for models with NestedProxyField fields.
 
     Example:
@@ -254,60 +1274,3 @@ class HyperlinkedModelSerializer(serializers.HyperlinkedModelSerializer):
     >>>             'stock_information',
     >>>         )
     """
-
-    def create(self, validated_data):
-        """Create.
-
-        :param validated_data:
-        :return:
-        """
-        # Collect information on nested serializers
-        (
-            __nested_serializers,
-            __nested_serializers_data,
-        ) = extract_nested_serializers(
-            self,
-            validated_data,
-        )
-
-        # Create instance, but don't save it yet
-        instance = self.Meta.model(**validated_data)
-
-        # Assign fields to the `instance` one by one
-        set_instance_values(
-            __nested_serializers, __nested_serializers_data, instance
-        )
-
-        # Save the instance and return
-        instance.save()
-        return instance
-
-    def update(self, instance, validated_data):
-        """Update.
-
-        :param instance:
-        :param validated_data:
-        :return:
-        """
-        # Collect information on nested serializers
-        (
-            __nested_serializers,
-            __nested_serializers_data,
-        ) = extract_nested_serializers(
-            self,
-            validated_data,
-        )
-
-        # Update the instance
-        instance = super(HyperlinkedModelSerializer, self).update(
-            instance, validated_data
-        )
-
-        # Assign fields to the `instance` one by one
-        set_instance_values(
-            __nested_serializers, __nested_serializers_data, instance
-        )
-
-        # Save the instance and return
-        instance.save()
-        return instance
@@ -0,0 +1,243 @@
+"""
+Test helpers.
+"""
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+import pytest
+
+from books.serializers import BookSerializer, ProfileSerializer
+
+from ..helpers import (
+    flatten_nested_data,
+    get_nested_data_field_names,
+    get_path_map,
+    unflatten_nested_data,
+)
+from ..serializers import build_write_plan
+
+from .base import BaseTestCase
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = ("TestHelpers",)
+
+
+@pytest.mark.django_db
+class TestHelpers(BaseTestCase):
+    """Test helpers."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_get_path_map(self):
+        """Test path map compiled from (dotted) names, once."""
+        names = ["information", "information.data", "bank_information"]
+        path_map = get_path_map(names)
+        self.assertEqual(
+            path_map,
+            {"information": {"data": {}}, "bank_information": {}},
+        )
+        self.assertIs(get_path_map(names), path_map)
+        self.assertIs(get_path_map(path_map), path_map)
+
+    def test_flatten_nested_data(self):
+        """Test flatten nested data to any depth, without copying values."""
+        price = Decimal("9.99")
+        upload = SimpleUploadedFile("cover.png", b"")
+        tags = ["a", "b"]
+        validated_data = {
+            "title": "Title",
+            "tags": tags,
+            "information": {
+                "data": {
+                    "personal_information": {"first_name": "Artur"},
+                    "price": price,
+                },
+                "cover": upload,
+            },
+            "stock_information": {"stock_count": 1},
+            "empty_information": {},
+        }
+        flat_data = flatten_nested_data(
+            validated_data,
+            [
+                "information",
+                "information.data",
+                "information.data.personal_information",
+                "stock_information",
+                "empty_information",
+            ],
+        )
+        self.assertEqual(
+            flat_data,
+            {
+                "title": "Title",
+                "tags": tags,
+                "first_name": "Artur",
+                "price": price,
+                "cover": upload,
+                "stock_count": 1,
+            },
+        )
+        self.assertIs(flat_data["tags"], tags)
+        self.assertIs(flat_data["price"], price)
+        self.assertIs(flat_data["cover"], upload)
+        # Original data is left untouched
+        self.assertIn("information", validated_data)
+        self.assertNotIn("first_name", validated_data)
+
+    def test_flatten_nested_data_top_level(self):
+        """Test nested dictionaries not in the names are values."""
+        validated_data = {"information": {"data": {"first_name": "Artur"}}}
+        self.assertEqual(
+            flatten_nested_data(validated_data, ["information"]),
+            {"data": {"first_name": "Artur"}},
+        )
+
+    def test_flatten_nested_data_inplace(self):
+        """Test flatten nested data in place."""
+        validated_data = {"title": "Title", "stock_information": {"price": 1}}
+        flat_data = flatten_nested_data(
+            validated_data, ["stock_information"], inplace=True
+        )
+        self.assertIs(flat_data, validated_data)
+        self.assertEqual(validated_data, {"title": "Title", "price": 1})
+
+    def test_unflatten_nested_data(self):
+        """Test unflatten data using a write plan."""
+        write_plan = build_write_plan(BookSerializer())
+        validated_data = {
+            "title": "Title",
+            "publishing_information": {"isbn": "978-0-13", "pages": 200},
+            "stock_information": {"price": Decimal("9.99")},
+        }
+        flat_data = flatten_nested_data(validated_data, write_plan)
+        self.assertEqual(
+            flat_data,
+            {
+                "title": "Title",
+                "isbn": "978-0-13",
+                "pages": 200,
+                "price": Decimal("9.99"),
+            },
+        )
+        self.assertEqual(
+            unflatten_nested_data(flat_data, write_plan), validated_data
+        )
+        self.assertIn("isbn", flat_data)
+
+        unflatten_nested_data(flat_data, write_plan, inplace=True)
+        self.assertEqual(flat_data, validated_data)
+
+    def test_unflatten_nested_data_depth(self):
+        """Test unflatten data (nested fields of any depth)."""
+        path_map = {
+            "information": {
+                "data": {"first_name": None, "last_name": None},
+                "company": None,
+            },
+        }
+        self.assertEqual(
+            unflatten_nested_data(
+                {"id": 1, "first_name": "Artur", "company": "GW20e"},
+                path_map,
+            ),
+            {
+                "id": 1,
+                "information": {
+                    "data": {"first_name": "Artur"},
+                    "company": "GW20e",
+                },
+            },
+        )
+        self.assertEqual(unflatten_nested_data({"id": 1}, path_map), {"id": 1})
+
+    def test_get_nested_data_field_names(self):
+        """Test nested data field names (path map) of any depth."""
+        field_names = get_nested_data_field_names(ProfileSerializer())
+        self.assertEqual(list(field_names), ["information"])
+        self.assertEqual(
+            field_names["information"]["data"]["contact_information"][
+                "personal_contact_information"
+            ],
+            {"email": None, "phone_number": None, "website": None},
+        )
+        self.assertEqual(
+            get_nested_data_field_names(BookSerializer()),
+            build_write_plan(BookSerializer()),
+        )
+
+    def test_get_nested_data_field_names_cached(self):
+        """Test nested data field names are built once per class."""
+
+        class MyBookSerializer(BookSerializer):
+            class Meta(BookSerializer.Meta):
+                fields = ("id", "title", "stock_information")
+
+        field_names = get_nested_data_field_names(MyBookSerializer())
+        self.assertEqual(list(field_names), ["stock_information"])
+        self.assertIs(
+            MyBookSerializer.__dict__["_nested_data_field_names"], field_names
+        )
+        # Fields are not built again, pruned instances make no difference
+        serializer = MyBookSerializer()
+        del serializer.fields["stock_information"]
+        with mock.patch.object(
+            MyBookSerializer,
+            "get_fields",
+            side_effect=AssertionError("get_fields should not be called"),
+        ):
+            self.assertIs(get_nested_data_field_names(serializer), field_names)
+        # Not inherited
+        self.assertNotEqual(
+            get_nested_data_field_names(BookSerializer()), field_names
+        )
+
+    def test_get_nested_data_field_names_dynamic(self):
+        """Test fields depending on the instance are not cached."""
+
+        class DynamicBookSerializer(BookSerializer):
+            def get_fields(self):
+                fields = super().get_fields()
+                if self.context.get("brief"):
+                    del fields["stock_information"]
+                return fields
+
+        self.assertIn(
+            "stock_information",
+            get_nested_data_field_names(DynamicBookSerializer()),
+        )
+        self.assertNotIn(
+            "stock_information",
+            get_nested_data_field_names(
+                DynamicBookSerializer(context={"brief": True})
+            ),
+        )
+        self.assertNotIn(
+            "_nested_data_field_names", DynamicBookSerializer.__dict__
+        )
+
+    def test_get_nested_data_field_names_custom_field_names(self):
+        """Test fields built depending on the context are not cached."""
+
+        class CtxBookSerializer(BookSerializer):
+            def get_field_names(self, declared_fields, info):
+                if self.context.get("brief"):
+                    return ["id", "publishing_information"]
+                return super().get_field_names(declared_fields, info)
+
+        self.assertEqual(
+            list(
+                get_nested_data_field_names(
+                    CtxBookSerializer(context={"brief": True})
+                )
+            ),
+            ["publishing_information"],
+        )
+        self.assertIn(
+            "stock_information",
+            get_nested_data_field_names(CtxBookSerializer()),
+        )
+        self.assertNotIn("_nested_data_field_names", vars(CtxBookSerializer))
@@ -0,0 +1,345 @@
+"""
+Test mixins.
+"""
+from unittest import mock
+
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+from rest_framework import serializers, status
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APIRequestFactory
+
+from books.models import Book
+from books.serializers import BookSerializer, BookStockSerializer
+from books.viewsets import BookStockViewSet, BookViewSet
+
+import factories
+
+from ..mixins import parse_sparse_fields, SparseFieldsetsMixin
+from ..serializers import UpdateConflict
+
+from .base import BaseRestFrameworkTestCase
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "TestDirectUpdate",
+    "TestSparseFieldsets",
+)
+
+
+class DenyObjects(BasePermission):
+    """Deny access to any object."""
+
+    def has_object_permission(self, request, view, obj):
+        return False
+
+
+@pytest.mark.django_db
+class TestDirectUpdate(BaseRestFrameworkTestCase):
+    """Test direct (fetch-free) updates."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up."""
+        super(TestDirectUpdate, cls).setUpClass()
+
+        cls.book = factories.BookFactory()
+        cls.book_stock_detail_url = reverse(
+            "bookstock-detail", kwargs={"pk": cls.book.pk}
+        )
+
+    def _patch(self, url, data):
+        """Make a partial update.
+
+        :param url: Detail URL.
+        :param data: Data to send.
+        :return: Response and the SQL statements.
+        :rtype: tuple
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(url, data, format="json")
+        return response, [__q["sql"] for __q in context.captured_queries]
+
+    def test_direct_update(self):
+        """Test the book is updated first, and fetched for the response."""
+        response, queries = self._patch(
+            self.book_stock_detail_url,
+            {"stock_information": {"stock_count": 42}},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["stock_information"]["stock_count"], 42)
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(queries[0].startswith("UPDATE"))
+        self.assertIn('"stock_count"', queries[0])
+        self.assertNotIn('"price"', queries[0])
+        self.assertTrue(queries[1].startswith("SELECT"))
+        self.assertEqual(Book.objects.get(pk=self.book.pk).stock_count, 42)
+
+    def test_direct_update_no_response(self):
+        """Test the book is not fetched if the response body is not needed."""
+        with mock.patch.object(
+            BookStockViewSet, "direct_update_response", False
+        ):
+            response, queries = self._patch(
+                self.book_stock_detail_url,
+                {"stock_information": {"stock_count": 7}},
+            )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(Book.objects.get(pk=self.book.pk).stock_count, 7)
+
+    def test_direct_update_not_found(self):
+        """Test updating a book which does not exist."""
+        response, queries = self._patch(
+            reverse("bookstock-detail", kwargs={"pk": 0}),
+            {"stock_information": {"stock_count": 7}},
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_direct_update_empty(self):
+        """Test nothing is written if there is nothing to write."""
+        response, queries = self._patch(self.book_stock_detail_url, {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [__q for __q in queries if __q.startswith("UPDATE")], []
+        )
+
+        response, queries = self._patch(
+            reverse("bookstock-detail", kwargs={"pk": 0}), {}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_direct_update_queryset(self):
+        """Test rows outside of the queryset of the view are not updated."""
+        Book.objects.filter(pk=self.book.pk).update(stock_count=5)
+
+        class RegularBookStockSerializer(BookStockSerializer):
+            class Meta(BookStockSerializer.Meta):
+                direct_update = False
+
+        for __serializer_class in (
+            BookStockSerializer,
+            RegularBookStockSerializer,
+        ):
+            with mock.patch.object(
+                BookStockViewSet, "queryset", Book.objects.none()
+            ), mock.patch.object(
+                BookStockViewSet, "serializer_class", __serializer_class
+            ):
+                response, queries = self._patch(
+                    self.book_stock_detail_url,
+                    {"stock_information": {"stock_count": 77}},
+                )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(Book.objects.get(pk=self.book.pk).stock_count, 5)
+
+    def test_with_sparse_fieldsets(self):
+        """Test the mixin combined with sparse fieldsets."""
+
+        class SparseBookStockViewSet(SparseFieldsetsMixin, BookStockViewSet):
+            pass
+
+        view = SparseBookStockViewSet.as_view({"get": "list"})
+        response = view(APIRequestFactory().get("/", {"fields": "id"}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data["results"][0]), ["id"])
+
+    def test_direct_update_malformed_pk(self):
+        """Test updating a book by a malformed primary key."""
+        response, queries = self._patch(
+            reverse("bookstock-detail", kwargs={"pk": "abc"}),
+            {"stock_information": {"stock_count": 7}},
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(queries, [])
+
+    def test_object_permissions(self):
+        """Test object level permissions are checked by default."""
+        with mock.patch.object(
+            BookStockViewSet, "permission_classes", [DenyObjects]
+        ):
+            response, queries = self._patch(
+                self.book_stock_detail_url,
+                {"stock_information": {"stock_count": 11}},
+            )
+            # Denied (401 or 403, depending on the authentication)
+            self.assertTrue(status.is_client_error(response.status_code))
+            self.assertTrue(queries[0].startswith("SELECT"))
+            self.assertNotEqual(
+                Book.objects.get(pk=self.book.pk).stock_count, 11
+            )
+
+            with mock.patch.object(
+                BookStockViewSet, "direct_update_skip_object_permissions", True
+            ):
+                response, queries = self._patch(
+                    self.book_stock_detail_url,
+                    {"stock_information": {"stock_count": 11}},
+                )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(queries[0].startswith("UPDATE"))
+        self.assertEqual(Book.objects.get(pk=self.book.pk).stock_count, 11)
+
+    def test_version_field(self):
+        """Test optimistic concurrency control using a version field."""
+
+        class VersionedBookStockSerializer(BookStockSerializer):
+            class Meta(BookStockSerializer.Meta):
+                fields = ("id", "pages", "stock_information")
+                version_field = "pages"
+
+        pages = self.book.pages
+        serializer = VersionedBookStockSerializer(
+            Book(pk=self.book.pk),
+            data={"pages": pages, "stock_information": {"stock_count": 3}},
+            partial=True,
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        instance = serializer.save()
+        self.assertEqual(instance.pages, pages + 1)
+        book = Book.objects.get(pk=self.book.pk)
+        self.assertEqual((book.pages, book.stock_count), (pages + 1, 3))
+
+        # Stale version
+        serializer = VersionedBookStockSerializer(
+            Book(pk=self.book.pk),
+            data={"pages": pages, "stock_information": {"stock_count": 5}},
+            partial=True,
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.assertRaises(UpdateConflict):
+            serializer.save()
+        self.assertEqual(Book.objects.get(pk=self.book.pk).stock_count, 3)
+
+    def test_update_where(self):
+        """Test additional predicate of the direct update."""
+
+        class ConditionalBookStockSerializer(BookStockSerializer):
+            def get_update_where(self, instance, validated_data):
+                return Q(stock_count__gte=validated_data["stock_count"])
+
+        Book.objects.filter(pk=self.book.pk).update(stock_count=10)
+        for __stock_count, __expected in ((5, 5), (8, 5)):
+            serializer = ConditionalBookStockSerializer(
+                Book(pk=self.book.pk),
+                data={"stock_information": {"stock_count": __stock_count}},
+                partial=True,
+            )
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            if __stock_count == __expected:
+                serializer.save()
+            else:
+                with self.assertRaises(UpdateConflict):
+                    serializer.save()
+            self.assertEqual(
+                Book.objects.get(pk=self.book.pk).stock_count, __expected
+            )
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets(BaseRestFrameworkTestCase):
+    """Test sparse fieldsets."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up."""
+        super(TestSparseFieldsets, cls).setUpClass()
+
+        cls.books = factories.BookFactory.create_batch(3)
+        cls.book_listing_url = reverse("book-list", kwargs={})
+
+    def _get(self, fields):
+        """List books.
+
+        :param fields: Sparse fieldset.
+        :return: Response data and the SQL statements.
+        :rtype: tuple
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                self.book_listing_url, {"fields": fields}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"], [
+            __q["sql"]
+            for __q in context.captured_queries
+            if __q["sql"].startswith("SELECT") and "COUNT(" not in __q["sql"]
+        ]
+
+    def test_parse_sparse_fields(self):
+        """Test parse sparse fieldset."""
+        self.assertEqual(
+            parse_sparse_fields("id, a.b.c,a.d,e,e.f,,g.h,g"),
+            {
+                "id": None,
+                "a": {"b": {"c": None}, "d": None},
+                "e": None,
+                "g": None,
+            },
+        )
+
+    def test_sparse_fieldsets(self):
+        """Test nested paths are pruned, and only their columns loaded."""
+        data, queries = self._get(
+            "id,publishing_information.isbn,stock_information"
+        )
+        self.assertEqual(len(data), Book.objects.count())
+        for __item in data:
+            self.assertEqual(
+                list(__item),
+                ["id", "publishing_information", "stock_information"],
+            )
+            self.assertEqual(list(__item["publishing_information"]), ["isbn"])
+            self.assertEqual(
+                list(__item["stock_information"]),
+                ["stock_count", "price", "state"],
+            )
+        self.assertEqual(len(queries), 1)
+        for __column in ("id", "isbn", "stock_count", "price", "state"):
+            self.assertIn('"{}"'.format(__column), queries[0])
+        for __column in ("title", "description", "pages", "publication_date"):
+            self.assertNotIn('"{}"'.format(__column), queries[0])
+
+    def test_sparse_fieldsets_url(self):
+        """Test hyperlinked identity field needs the primary key only."""
+        data, queries = self._get("url,title")
+        self.assertEqual(list(data[0]), ["url", "title"])
+        self.assertEqual(len(queries), 1)
+        # Default ordering of the books is by isbn, check the columns only
+        columns = queries[0].split(" FROM ")[0]
+        self.assertIn('"title"', columns)
+        self.assertNotIn('"isbn"', columns)
+
+    def test_sparse_fieldsets_source_any(self):
+        """Test fields with ``source="*"`` do not restrict the columns."""
+
+        class ShoutBookSerializer(BookSerializer):
+            shout = serializers.SerializerMethodField()
+
+            class Meta(BookSerializer.Meta):
+                fields = BookSerializer.Meta.fields + ("shout",)
+
+            def get_shout(self, obj):
+                return obj.title.upper()
+
+        with mock.patch.object(
+            BookViewSet, "serializer_class", ShoutBookSerializer
+        ):
+            data, queries = self._get("id,shout")
+        self.assertEqual(list(data[0]), ["id", "shout"])
+        self.assertIn('"description"', queries[0])
+
+    def test_no_sparse_fieldsets(self):
+        """Test all fields are returned by default."""
+        data, queries = self._get("")
+        self.assertIn("description", data[0])
+        self.assertIn('"description"', queries[0])
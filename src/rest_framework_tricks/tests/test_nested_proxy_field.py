@@ -4,10 +4,15 @@ Test NestedProxyField.
 from decimal import Decimal
 from typing import Callable
 
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 import pytest
 from rest_framework import status
 
+from books.models import Profile
+
 import factories
 
 from .base import BaseRestFrameworkTestCase
@@ -18,6 +23,7 @@ __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
 __all__ = (
     "TestNestedProxyFieldCreateAction",
     "TestNestedProxyFieldUpdateAction",
+    "TestNestedProxyFieldUpdateQueries",
 )
 
 
@@ -624,3 +630,136 @@ class TestNestedProxyFieldUpdateAction(TestNestedProxyFieldActionBase):
         self._nested_proxy_field_model_serializer_depth_more_missing_fields(
             self.profile_detail_url
         )
+
+
+@pytest.mark.django_db
+class TestNestedProxyFieldUpdateQueries(BaseRestFrameworkTestCase):
+    """Test NestedProxyField - queries made by the update action."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up."""
+        super(TestNestedProxyFieldUpdateQueries, cls).setUpClass()
+
+        cls.book = factories.BookFactory()
+        cls.profile = factories.ProfileFactory()
+
+        cls.book_detail_url = reverse(
+            "book-detail", kwargs={"pk": cls.book.pk}
+        )
+        cls.profile_detail_url = reverse(
+            "profile-detail", kwargs={"pk": cls.profile.pk}
+        )
+
+    def _get_update_queries(self, url, data):
+        """Make a partial update and return the UPDATE queries made.
+
+        :param url: Detail URL.
+        :param data: Data to send.
+        :return: List of SQL statements.
+        :rtype: list
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            __query["sql"]
+            for __query in context.captured_queries
+            if __query["sql"].startswith("UPDATE")
+        ]
+
+    def test_hyperlinked_model_serializer_single_save(self):
+        """Test a single UPDATE of the fields sent (hyperlinked)."""
+        queries = self._get_update_queries(
+            self.book_detail_url,
+            {
+                "title": "Title",
+                "publishing_information": {"isbn": "1234567890123"},
+            },
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"title"', queries[0])
+        self.assertIn('"isbn"', queries[0])
+        for __column in ("description", "pages", "price", "state"):
+            self.assertNotIn('"{}"'.format(__column), queries[0])
+
+    def test_model_serializer_depth_single_save(self):
+        """Test a single UPDATE of the fields sent (ModelSerializer)."""
+        queries = self._get_update_queries(
+            self.profile_detail_url,
+            {
+                "information": {
+                    "data": {
+                        "personal_information": {"first_name": "Artur"},
+                        "bank_information": {"bank_name": "Bank"},
+                    }
+                }
+            },
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"first_name"', queries[0])
+        self.assertIn('"bank_name"', queries[0])
+        for __column in ("last_name", "email", "bank_account_name"):
+            self.assertNotIn('"{}"'.format(__column), queries[0])
+
+    def test_empty_partial_update(self):
+        """Test nothing is written when no fields are sent."""
+        self.assertEqual(
+            self._get_update_queries(self.profile_detail_url, {}), []
+        )
+
+    def test_unchanged_not_saved(self):
+        """Test nothing is written when no values changed."""
+        profile = Profile.objects.get(pk=self.profile.pk)
+        self.assertEqual(
+            self._get_update_queries(
+                self.profile_detail_url,
+                {
+                    "information": {
+                        "data": {
+                            "personal_information": {
+                                "first_name": profile.first_name,
+                                "last_name": profile.last_name,
+                            },
+                            "bank_information": {
+                                "bank_name": profile.bank_name,
+                            },
+                        }
+                    }
+                },
+            ),
+            [],
+        )
+
+    def test_changed_fields_only(self):
+        """Test only changed values are written, and signalled."""
+        profile = Profile.objects.get(pk=self.profile.pk)
+        signalled = []
+
+        def receiver(sender, instance, update_fields, **kwargs):
+            signalled.append(update_fields)
+
+        post_save.connect(receiver, sender=Profile)
+        try:
+            queries = self._get_update_queries(
+                self.profile_detail_url,
+                {
+                    "information": {
+                        "data": {
+                            "personal_information": {
+                                "first_name": profile.first_name,
+                                "last_name": profile.last_name + "-Changed",
+                            },
+                        }
+                    }
+                },
+            )
+        finally:
+            post_save.disconnect(receiver, sender=Profile)
+
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"last_name"', queries[0])
+        self.assertNotIn('"first_name"', queries[0])
+        self.assertEqual(signalled, [frozenset({"last_name"})])
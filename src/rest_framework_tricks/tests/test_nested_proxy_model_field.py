@@ -0,0 +1,379 @@
+"""
+Test NestedProxyField model field.
+"""
+from collections.abc import Mapping
+import json
+import pickle
+from threading import Barrier, Thread
+from unittest import mock
+
+from django.core.exceptions import FieldError
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Author, AuthorProxy, Book, Profile, Publisher
+
+import factories
+
+from ..models.fields import NestedProxyField, pop_nested_proxy_dirty_fields
+from ..models.fields.nested_proxy import NestedProxyMapping
+from ..utils import DictProxy
+
+from .base import BaseTestCase
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "TestNestedProxyModelField",
+    "TestNestedProxyModelFieldDeferred",
+)
+
+
+@pytest.mark.django_db
+class TestNestedProxyModelField(BaseTestCase):
+    """Test NestedProxyField model field."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_class_access(self):
+        """Test class level access returns the descriptor."""
+        self.assertIsInstance(Profile.information, NestedProxyField)
+        self.assertEqual(Profile.information.name, "information")
+        self.assertEqual(Profile.information.model, Profile)
+
+    def test_compiled_on_class_prepared(self):
+        """Test descriptors are compiled when the model is prepared."""
+        self.assertIn(Profile, Profile.information._getters)
+        self.assertIn(Profile, Profile.bank_information._getters)
+        self.assertIn(Author, Author.contact_information._getters)
+        self.assertIn(AuthorProxy, AuthorProxy.contact_information._getters)
+
+    def test_nested_values(self):
+        """Test nested values."""
+        profile = factories.ProfileFactory.build()
+        self.assertEqual(
+            profile.information,
+            {
+                "data": {
+                    "personal_information": {
+                        "salutation": profile.salutation,
+                        "first_name": profile.first_name,
+                        "last_name": profile.last_name,
+                        "birth_date": profile.birth_date,
+                        "biography": profile.biography,
+                    },
+                    "contact_information": {
+                        "personal_contact_information": {
+                            "email": profile.email,
+                            "phone_number": profile.phone_number,
+                            "website": profile.website,
+                        },
+                        "business_contact_information": {
+                            "company": profile.company,
+                            "company_email": profile.company_email,
+                            "company_phone_number": (
+                                profile.company_phone_number
+                            ),
+                            "company_website": profile.company_website,
+                        },
+                    },
+                    "bank_information": {
+                        "bank_name": profile.bank_name,
+                        "bank_account_name": profile.bank_account_name,
+                        "bank_account_number": profile.bank_account_number,
+                    },
+                }
+            },
+        )
+
+    def test_lazy_mapping_view(self):
+        """Test values are read-only mapping views, resolved lazily."""
+        profile = factories.ProfileFactory.build()
+        information = profile.information
+        self.assertIsInstance(information, NestedProxyMapping)
+        self.assertIsInstance(information, Mapping)
+        self.assertEqual(
+            list(information["data"]),
+            [
+                "personal_information",
+                "contact_information",
+                "bank_information",
+            ],
+        )
+        self.assertEqual(len(information["data"]), 3)
+        self.assertNotIn("bank_name", information["data"])
+        with self.assertRaises(TypeError):
+            information["data"] = {}
+
+        # Leaves which are not accessed are not resolved
+        with mock.patch.object(
+            Profile,
+            "bank_name",
+            new_callable=mock.PropertyMock,
+            side_effect=AssertionError("bank_name should not be read"),
+        ):
+            self.assertEqual(
+                profile.information["data"]["personal_information"][
+                    "first_name"
+                ],
+                profile.first_name,
+            )
+
+    def test_mapping_view_rendering(self):
+        """Test mapping views convert to dict and render as JSON."""
+        author = factories.AuthorFactory.build()
+        contact_information = author.contact_information
+        data = dict(contact_information)
+        self.assertIsInstance(data, dict)
+        self.assertEqual(
+            dict(data["business_contact_information"]),
+            {
+                "company": author.company,
+                "company_email": author.company_email,
+                "company_phone_number": author.company_phone_number,
+                "company_website": author.company_website,
+            },
+        )
+        self.assertEqual(
+            json.loads(JSONRenderer().render(contact_information)),
+            json.loads(json.dumps(contact_information, default=dict)),
+        )
+        self.assertEqual(
+            repr(contact_information),
+            repr({__k: dict(__v) for __k, __v in contact_information.items()}),
+        )
+
+    def test_mapping_view_to_dict(self):
+        """Test mapping views convert to plain nested dictionaries."""
+        profile = factories.ProfileFactory.build()
+        data = profile.information.to_dict()
+        self.assertIs(type(data), dict)
+        self.assertIs(type(data["data"]), dict)
+        self.assertEqual(
+            json.loads(json.dumps(data)),
+            json.loads(JSONRenderer().render(profile.information)),
+        )
+        self.assertEqual(profile.information.copy(), data)
+        # Shallow conversion keeps the nested views
+        with self.assertRaises(TypeError):
+            json.dumps(dict(profile.information))
+
+    def test_dict_spec_values(self):
+        """Test values of the dictionary form of the spec."""
+        author = factories.AuthorFactory.build()
+        proxy_author = AuthorProxy(
+            **{
+                __f.attname: getattr(author, __f.attname)
+                for __f in Author._meta.concrete_fields
+            }
+        )
+        self.assertEqual(
+            author.contact_information, proxy_author.contact_information
+        )
+        self.assertEqual(
+            author.contact_information["personal_contact_information"],
+            {
+                "email": author.email,
+                "phone_number": author.phone_number,
+                "website": author.website,
+            },
+        )
+
+    def test_dict_spec_sub_proxies(self):
+        """Test sub-proxies of the dictionary form are attached once."""
+        self.assertIsInstance(
+            Author.__dict__["personal_contact_information"], NestedProxyField
+        )
+        self.assertIsInstance(
+            Author.__dict__["business_contact_information"], NestedProxyField
+        )
+        author = factories.AuthorFactory.build()
+        self.assertEqual(
+            author.personal_contact_information,
+            author.contact_information["personal_contact_information"],
+        )
+
+    def test_class_dict_stable_under_concurrent_reads(self):
+        """Test reading from many threads never modifies the class."""
+        number_of_threads = 8
+        number_of_reads = 500
+        authors = factories.AuthorFactory.build_batch(10)
+        profiles = factories.ProfileFactory.build_batch(10)
+        expected = [__a.contact_information for __a in authors]
+        class_dicts = {
+            __model: dict(vars(__model)) for __model in (Author, Profile)
+        }
+        barrier = Barrier(number_of_threads)
+        errors = []
+
+        def read():
+            barrier.wait()
+            try:
+                for __i in range(number_of_reads):
+                    for __author, __expected in zip(authors, expected):
+                        assert __author.contact_information == __expected
+                    for __profile in profiles:
+                        __profile.information
+            except Exception as err:
+                errors.append(err)
+
+        threads = [Thread(target=read) for __i in range(number_of_threads)]
+        for __thread in threads:
+            __thread.start()
+        for __thread in threads:
+            __thread.join()
+
+        self.assertEqual(errors, [])
+        for __model, __class_dict in class_dicts.items():
+            __current = dict(vars(__model))
+            self.assertEqual(__current.keys(), __class_dict.keys())
+            for __key, __value in __class_dict.items():
+                self.assertIs(__current[__key], __value)
+
+    def test_as_object(self):
+        """Test ``as_object`` option."""
+        publisher = factories.PublisherFactory.build()
+        self.assertIsInstance(publisher.address_information, DictProxy)
+        self.assertEqual(publisher.address_information.city, publisher.city)
+        self.assertEqual(
+            pickle.loads(pickle.dumps(publisher.address_information)).city,
+            publisher.city,
+        )
+
+    def test_write(self):
+        """Test assigning a nested mapping."""
+        profile = factories.ProfileFactory.build()
+        bank_account_name = profile.bank_account_name
+        profile.information = {
+            "data": {
+                "personal_information": {"first_name": "Artur"},
+                "contact_information": {
+                    "business_contact_information": {
+                        "company": "GW20e",
+                    },
+                },
+                "bank_information": {"bank_name": "Bank"},
+            }
+        }
+        profile.bank_information = {"bank_account_number": "123"}
+        self.assertEqual(profile.first_name, "Artur")
+        self.assertEqual(profile.company, "GW20e")
+        self.assertEqual(profile.bank_name, "Bank")
+        self.assertEqual(profile.bank_account_number, "123")
+        self.assertEqual(profile.bank_account_name, bank_account_name)
+        self.assertEqual(
+            pop_nested_proxy_dirty_fields(profile),
+            {"first_name", "company", "bank_name", "bank_account_number"},
+        )
+        self.assertEqual(pop_nested_proxy_dirty_fields(profile), set())
+
+    def test_write_dict_spec_and_as_object(self):
+        """Test assigning (dictionary form of the spec, ``as_object``)."""
+        author = factories.AuthorFactory.build()
+        self.assertEqual(
+            Author.contact_information.set_values(
+                author,
+                {"personal_contact_information": {"email": "a@example.com"}},
+            ),
+            {"email"},
+        )
+        self.assertEqual(author.email, "a@example.com")
+        publisher = Publisher()
+        publisher.address_information = DictProxy({"city": "Amsterdam"})
+        self.assertEqual(publisher.address_information.city, "Amsterdam")
+
+    def test_write_unknown_key(self):
+        """Test assigning unknown keys."""
+        book = Book()
+        with self.assertRaises(FieldError):
+            book.publishing_information = {"title": "Title"}
+
+
+@pytest.mark.django_db
+class TestNestedProxyModelFieldDeferred(BaseTestCase):
+    """Test NestedProxyField model field with deferred fields."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up class."""
+        super(TestNestedProxyModelFieldDeferred, cls).setUpTestData()
+        cls.book = Book.objects.get(pk=factories.BookFactory().pk)
+        cls.profile = Profile.objects.get(pk=factories.ProfileFactory().pk)
+
+    def test_no_deferred_fields(self):
+        """Test no queries are made when nothing is deferred."""
+        book = Book.objects.get(pk=self.book.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                dict(book.publishing_information),
+                {
+                    "publication_date": self.book.publication_date,
+                    "isbn": self.book.isbn,
+                    "pages": self.book.pages,
+                },
+            )
+
+    def test_only(self):
+        """Test deferred leaves are loaded in a single query (only)."""
+        book = Book.objects.only("id", "title").get(pk=self.book.pk)
+        with self.assertNumQueries(1):
+            publishing_information = dict(book.publishing_information)
+            self.assertEqual(publishing_information["isbn"], self.book.isbn)
+            self.assertEqual(publishing_information["pages"], self.book.pages)
+        with self.assertNumQueries(1):
+            stock_information = dict(book.stock_information)
+            self.assertEqual(stock_information["state"], self.book.state)
+            self.assertEqual(stock_information["price"], self.book.price)
+        # Fields which are not part of the nested proxy fields stay deferred
+        self.assertIn("description", book.get_deferred_fields())
+
+    def test_defer_depth(self):
+        """Test deferred leaves are loaded in a single query (defer)."""
+        profile = Profile.objects.defer(
+            "first_name", "company_email", "bank_name", "bank_account_name"
+        ).get(pk=self.profile.pk)
+        with self.assertNumQueries(1):
+            data = profile.information["data"]
+            self.assertEqual(
+                data["personal_information"]["first_name"],
+                self.profile.first_name,
+            )
+            self.assertEqual(
+                data["contact_information"]["business_contact_information"][
+                    "company_email"
+                ],
+                self.profile.company_email,
+            )
+            self.assertEqual(
+                dict(data["bank_information"]),
+                {
+                    "bank_name": self.profile.bank_name,
+                    "bank_account_name": self.profile.bank_account_name,
+                    "bank_account_number": self.profile.bank_account_number,
+                },
+            )
+
+    def test_on_deferred_warn(self):
+        """Test ``on_deferred="warn"``."""
+        book = Book.objects.defer("isbn", "pages").get(pk=self.book.pk)
+        with mock.patch.object(
+            Book.publishing_information, "on_deferred", "warn"
+        ):
+            with self.assertWarns(RuntimeWarning):
+                with self.assertNumQueries(1):
+                    self.assertEqual(
+                        book.publishing_information["pages"], self.book.pages
+                    )
+
+    def test_on_deferred_raise(self):
+        """Test ``on_deferred="raise"``."""
+        book = Book.objects.defer("isbn").get(pk=self.book.pk)
+        with mock.patch.object(
+            Book.publishing_information, "on_deferred", "raise"
+        ):
+            with self.assertNumQueries(0):
+                with self.assertRaises(FieldError):
+                    book.publishing_information
@@ -1,12 +1,29 @@
 """
 Test OrderingFilter.
 """
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 import pytest
 from rest_framework import status
 
+from books.models import Book, BookProxy
+from books.viewsets import BookProxyKeysetViewSet, BookProxyViewSet
+
 import factories
 
+from ..filters import (
+    add_tie_breaker,
+    check_ordering_index,
+    compile_ordering_fields,
+    OrderingFilter,
+)
+
+from ..checks import check_ordering_indexes
+
 from .base import BaseRestFrameworkTestCase
 
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
@@ -165,3 +182,138 @@ class TestOrderingFilter(BaseRestFrameworkTestCase):
         :return:
         """
         return self._test_ordering_list(descending=True)
+
+    def test_compile_ordering_fields(self):
+        """Test compile ordering fields."""
+        self.assertEqual(
+            compile_ordering_fields(
+                {
+                    "city": "publisher__city",
+                    "newest": "-publication_date",
+                    "status": ["state", "publication_date"],
+                }
+            ),
+            {
+                "city": ("publisher__city",),
+                "-city": ("-publisher__city",),
+                "newest": ("-publication_date",),
+                "-newest": ("publication_date",),
+                "status": ("state", "publication_date"),
+                "-status": ("-state", "-publication_date"),
+            },
+        )
+
+    def test_ordering_parser(self):
+        """Test ordering parser is compiled once and cached."""
+        view = BookProxyViewSet()
+        parse = OrderingFilter().get_ordering_parser(view)
+        self.assertIs(OrderingFilter().get_ordering_parser(view), parse)
+        parse.cache_clear()
+
+        self.assertEqual(
+            parse("-status, city,unknown"),
+            ("-state", "-publication_date", "publisher__city", "id"),
+        )
+        self.assertIsNone(parse("unknown,-"))
+        parse("-status, city,unknown")
+        self.assertEqual(parse.cache_info().hits, 1)
+        self.assertEqual(
+            parse.cache_info().maxsize, OrderingFilter.ordering_cache_size
+        )
+
+        # Compiled again if ordering fields change
+        view.ordering_fields = {"id": "id"}
+        self.assertEqual(
+            OrderingFilter().get_ordering_parser(view)("-id,city"), ("-id",)
+        )
+        del BookProxyViewSet._ordering_parser
+
+    def test_add_tie_breaker(self):
+        """Test add tie breaker."""
+        self.assertEqual(
+            add_tie_breaker(["user__is_active"], "pk"),
+            ("user__is_active", "pk"),
+        )
+        self.assertEqual(
+            add_tie_breaker(("-user__is_active",), "pk"),
+            ("-user__is_active", "-pk"),
+        )
+        self.assertEqual(add_tie_breaker("-pk", "pk"), ("-pk",))
+        self.assertEqual(add_tie_breaker(("state",), None), ("state",))
+        self.assertIsNone(add_tie_breaker(None, "pk"))
+
+    def test_ordering_tie_breaker(self):
+        """Test tie breaker is appended to every ordering."""
+        for __params, __ordering in (
+            ({"ordering": "-status"}, '"state" DESC'),
+            ({"ordering": "city"}, '"city" ASC'),
+            ({}, None),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = self.client.get(
+                    self.bookproxy_listing_url, __params
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            __sql = context.captured_queries[-1]["sql"]
+            __order_by = __sql[__sql.index("ORDER BY") :]
+            if __ordering:
+                self.assertIn(__ordering, __order_by)
+            self.assertEqual(__order_by.count('"books_book"."id"'), 1)
+
+    def test_check_ordering_index(self):
+        """Test check if the index can serve the ordering."""
+        index_name = "books_book_state_pub_date_idx"
+        for __ordering in (
+            ("state",),
+            ("state", "publication_date", "pk"),
+            ("-state", "-publication_date", "-id"),
+        ):
+            check_ordering_index(BookProxy, index_name, __ordering)
+
+        for __ordering in (
+            ("publication_date",),
+            ("state", "-publication_date"),
+            ("state", "publication_date", "isbn"),
+            ("publisher__city",),
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                check_ordering_index(Book, index_name, __ordering)
+
+        with self.assertRaises(ImproperlyConfigured):
+            check_ordering_index(Book, "unknown", ("state",))
+
+    def test_ordering_indexes(self):
+        """Test declared indexes are checked by the system checks."""
+        self.assertEqual(check_ordering_indexes(), [])
+        for __indexes in (
+            {"city": "books_book_state_pub_date_idx"},
+            {"unknown": "books_book_state_pub_date_idx"},
+            {"status": "unknown"},
+        ):
+            with mock.patch.object(
+                BookProxyViewSet, "ordering_indexes", __indexes
+            ):
+                errors = check_ordering_indexes()
+            # Inherited by the keyset pagination view set
+            self.assertEqual(
+                [(__e.id, __e.obj) for __e in errors],
+                [
+                    ("rest_framework_tricks.E001", BookProxyViewSet),
+                    ("rest_framework_tricks.E001", BookProxyKeysetViewSet),
+                ],
+            )
+
+        with mock.patch.object(BookProxyViewSet, "queryset", None):
+            errors = check_ordering_indexes()
+        self.assertEqual(
+            {__e.id for __e in errors}, {"rest_framework_tricks.W001"}
+        )
+
+        for __ordering_fields in ("__all__", None):
+            with mock.patch.object(
+                BookProxyViewSet, "ordering_fields", __ordering_fields
+            ):
+                errors = check_ordering_indexes()
+            self.assertEqual(
+                {__e.id for __e in errors}, {"rest_framework_tricks.W002"}
+            )
@@ -0,0 +1,174 @@
+"""
+Test KeysetPagination.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import json
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+import pytest
+from rest_framework import status
+
+from books.models import BookProxy
+
+import factories
+
+from ..pagination import build_keyset_filter, KeysetPagination
+
+from .base import BaseRestFrameworkTestCase
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = ("TestKeysetPagination",)
+
+
+@pytest.mark.django_db
+class TestKeysetPagination(BaseRestFrameworkTestCase):
+    """Test KeysetPagination."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up."""
+        super(TestKeysetPagination, cls).setUpClass()
+
+        cls.bookproxy_listing_url = reverse("bookproxykeyset-list", kwargs={})
+        cls.books = factories.BookFactory.create_batch(8, state="published")
+        cls.books += factories.BookFactory.create_batch(3, publisher=None)
+        cls.books += factories.BookFactory.create_batch(
+            2, publisher=factories.PublisherFactory(city=None)
+        )
+
+    def _get_pages(self, ordering, page_size=3):
+        """Walk the pages (following the next, then the previous links).
+
+        :param ordering: Ordering query parameter.
+        :param page_size: Page size.
+        :return: Pages (lists of ids) forward, pages backward and the SQL
+            statements.
+        :rtype: tuple
+        """
+        pages = []
+        url = self.bookproxy_listing_url
+        params = {"ordering": ordering} if ordering else {}
+        with mock.patch.object(KeysetPagination, "page_size", page_size):
+            with CaptureQueriesContext(connection) as context:
+                while url:
+                    response = self.client.get(url, params)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    pages.append(
+                        [__i["id"] for __i in response.data["results"]]
+                    )
+                    params = {}
+                    url = response.data["next"]
+                previous_pages = [pages[-1]]
+                url = response.data["previous"]
+                while url:
+                    response = self.client.get(url)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    previous_pages.insert(
+                        0, [__i["id"] for __i in response.data["results"]]
+                    )
+                    url = response.data["previous"]
+        return pages, previous_pages, context.captured_queries
+
+    def _test_ordering(self, ordering, key, descending=False):
+        """Test pages follow the ordering.
+
+        :param ordering: Ordering query parameter.
+        :param key: Sort key function (of a book, the id excluded).
+        :param descending: Descending ordering.
+        """
+        books = BookProxy.objects.select_related("publisher")
+        expected = [
+            __b.id
+            for __b in sorted(
+                books, key=lambda __b: (key(__b), __b.id), reverse=descending
+            )
+        ]
+        pages, previous_pages, queries = self._get_pages(ordering)
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual(previous_pages, pages)
+        self.assertEqual(len(queries), len(pages) + len(previous_pages) - 1)
+        for __query in queries:
+            self.assertNotIn("OFFSET", __query["sql"])
+
+    def test_default_ordering(self):
+        """Test default ordering of the view."""
+        self._test_ordering(None, lambda __b: 0)
+
+    def test_mapped_ordering(self):
+        """Test mapped ordering (nullable, across relation)."""
+
+        def key(book):
+            city = book.publisher.city if book.publisher else None
+            return (city is None, city or "")
+
+        self._test_ordering("city", key)
+        self._test_ordering("-city", key, descending=True)
+
+    def test_mapped_ordering_list(self):
+        """Test mapped multi-column ordering."""
+
+        def key(book):
+            return (book.state, book.publication_date)
+
+        self._test_ordering("status", key)
+        self._test_ordering("-status", key, descending=True)
+
+    def test_invalid_cursor(self):
+        """Test invalid cursors, cursors of other orderings."""
+        response = self.client.get(self.bookproxy_listing_url, {"cursor": "x"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        with mock.patch.object(KeysetPagination, "page_size", 3):
+            response = self.client.get(
+                self.bookproxy_listing_url, {"ordering": "city"}
+            )
+            response = self.client.get(
+                response.data["next"].replace("ordering=city", "ordering=id")
+            )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_crafted_cursor(self):
+        """Test cursors with values not matching the ordering fields."""
+        with mock.patch.object(KeysetPagination, "page_size", 3):
+            response = self.client.get(self.bookproxy_listing_url)
+            cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"]
+            checksum, reverse, position = json.loads(
+                urlsafe_b64decode(cursor[0].encode("ascii"))
+            )
+            for __value in ("abc", ["abc"], {"abc": 1}):
+                response = self.client.get(
+                    self.bookproxy_listing_url,
+                    {
+                        "cursor": urlsafe_b64encode(
+                            json.dumps(
+                                [checksum, reverse, [__value] * len(position)]
+                            ).encode("ascii")
+                        ).decode("ascii")
+                    },
+                )
+                self.assertEqual(
+                    response.status_code, status.HTTP_404_NOT_FOUND
+                )
+
+    def test_build_keyset_filter(self):
+        """Test filter of the rows following the position."""
+        terms = [("city", True, True), ("id", True, False)]
+        self.assertEqual(
+            build_keyset_filter(terms, [None, 4]),
+            Q(city__isnull=False) | Q(city__isnull=True, id__lt=4),
+        )
+        self.assertEqual(
+            build_keyset_filter(terms, ["Amsterdam", 4]),
+            Q(city__lte="Amsterdam")
+            & (Q(city__lt="Amsterdam") | Q(city="Amsterdam", id__lt=4)),
+        )
+        self.assertIsNone(build_keyset_filter([("city", False, True)], [None]))
@@ -0,0 +1,177 @@
+"""
+Test NestedProxyQuerySet.
+"""
+import pytest
+
+from books.models import Book, Profile
+
+import factories
+
+from ..models.registry import (
+    get_nested_proxy_meta,
+    NestedProxyMeta,
+    ROW_SHAPER_CACHE_SIZE,
+)
+
+from .base import BaseTestCase
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = ("TestNestedProxyQuerySet",)
+
+
+@pytest.mark.django_db
+class TestNestedProxyQuerySet(BaseTestCase):
+    """Test NestedProxyQuerySet."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up class."""
+        super(TestNestedProxyQuerySet, cls).setUpTestData()
+        cls.book = factories.BookFactory()
+        cls.profile = factories.ProfileFactory()
+
+    def test_expand_nested(self):
+        """Test expanding nested proxy field paths."""
+        self.assertEqual(
+            Book.objects.expand_nested(
+                ["id", "title", "publishing_information", "isbn"]
+            ),
+            ["id", "title", "publication_date", "isbn", "pages"],
+        )
+        self.assertEqual(
+            Profile.objects.expand_nested(
+                [
+                    "information.data.bank_information",
+                    "contact_information.personal_contact_information.email",
+                ]
+            ),
+            ["bank_name", "bank_account_name", "bank_account_number", "email"],
+        )
+        self.assertEqual(
+            Profile.objects.expand_nested(["information.data.unknown"]),
+            ["information.data.unknown"],
+        )
+
+    def test_only_nested(self):
+        """Test ``only_nested``."""
+        book = Book.objects.only_nested("id", "publishing_information").get(
+            pk=self.book.pk
+        )
+        self.assertEqual(
+            book.get_deferred_fields(),
+            {
+                __f.attname
+                for __f in Book._meta.concrete_fields
+                if __f.attname
+                not in ("id", "publication_date", "isbn", "pages")
+            },
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                book.publishing_information["isbn"], self.book.isbn
+            )
+
+    def test_defer_nested(self):
+        """Test ``defer_nested``."""
+        profile = Profile.objects.defer_nested("bank_information").get(
+            pk=self.profile.pk
+        )
+        self.assertEqual(
+            profile.get_deferred_fields(),
+            {"bank_name", "bank_account_name", "bank_account_number"},
+        )
+        with self.assertNumQueries(0):
+            profile.personal_information["first_name"]
+        with self.assertNumQueries(1):
+            dict(profile.information["data"]["bank_information"])
+
+    def test_values_nested(self):
+        """Test ``values_nested``."""
+        book = Book.objects.get(pk=self.book.pk)
+        with self.assertNumQueries(1):
+            rows = list(
+                Book.objects.filter(pk=book.pk).values_nested(
+                    "id",
+                    "title",
+                    "publishing_information",
+                    "stock_information",
+                )
+            )
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "id": book.id,
+                    "title": book.title,
+                    "publishing_information": dict(
+                        book.publishing_information
+                    ),
+                    "stock_information": dict(book.stock_information),
+                }
+            ],
+        )
+
+    def test_values_nested_depth(self):
+        """Test ``values_nested`` with more depth and paths."""
+        profile = Profile.objects.get(pk=self.profile.pk)
+        row = next(
+            Profile.objects.filter(pk=profile.pk).values_nested(
+                "id",
+                "information.data.bank_information",
+                "information.data.personal_information.first_name",
+                chunk_size=10,
+            )
+        )
+        self.assertEqual(
+            row,
+            {
+                "id": profile.id,
+                "information": {
+                    "data": {
+                        "bank_information": {
+                            "bank_name": profile.bank_name,
+                            "bank_account_name": profile.bank_account_name,
+                            "bank_account_number": (
+                                profile.bank_account_number
+                            ),
+                        },
+                        "personal_information": {
+                            "first_name": profile.first_name,
+                        },
+                    }
+                },
+            },
+        )
+        rows = list(Profile.objects.values_nested("information"))
+        self.assertEqual(len(rows), Profile.objects.count())
+        self.assertEqual(
+            len(rows[0]["information"]["data"]["contact_information"]), 2
+        )
+
+    def test_row_shaper_cached(self):
+        """Test row shapers are built once per set of names, bounded."""
+        meta = get_nested_proxy_meta(Book)
+        columns, shape_row = meta.get_row_shaper(["id", "stock_information"])
+        self.assertEqual(columns, ("id", "stock_count", "price", "state"))
+        self.assertEqual(
+            shape_row((1, 2, 3, 4)),
+            {
+                "id": 1,
+                "stock_information": {
+                    "stock_count": 2,
+                    "price": 3,
+                    "state": 4,
+                },
+            },
+        )
+        self.assertIs(
+            meta.get_row_shaper(("id", "stock_information"))[1], shape_row
+        )
+        self.assertEqual(
+            NestedProxyMeta._get_row_shaper.cache_info().maxsize,
+            ROW_SHAPER_CACHE_SIZE,
+        )
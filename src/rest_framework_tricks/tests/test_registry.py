@@ -0,0 +1,98 @@
+"""
+Test nested proxy metadata registry.
+"""
+import pytest
+
+from books.models import Author, AuthorProxy, Book, Profile, Tag
+
+from ..models.registry import get_nested_proxy_meta, NestedProxyMeta
+
+from .base import BaseTestCase
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = ("TestRegistry",)
+
+
+@pytest.mark.django_db
+class TestRegistry(BaseTestCase):
+    """Test nested proxy metadata registry."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_populated_on_ready(self):
+        """Test registry is populated when the app is ready."""
+        for __model in (Author, AuthorProxy, Book, Profile):
+            self.assertIsInstance(
+                __model.__dict__["_nested_proxy_meta"], NestedProxyMeta
+            )
+            self.assertIs(
+                get_nested_proxy_meta(__model),
+                __model.__dict__["_nested_proxy_meta"],
+            )
+        self.assertNotIn("_nested_proxy_meta", Tag.__dict__)
+        self.assertEqual(get_nested_proxy_meta(Tag).fields, {})
+
+    def test_tree(self):
+        """Test nested structure."""
+        meta = get_nested_proxy_meta(Book)
+        self.assertEqual(
+            meta.tree["publishing_information"],
+            {
+                "publication_date": "publication_date",
+                "isbn": "isbn",
+                "pages": "pages",
+            },
+        )
+        meta = get_nested_proxy_meta(Author)
+        self.assertEqual(
+            meta.tree["contact_information"]["personal_contact_information"],
+            {
+                "email": "email",
+                "phone_number": "phone_number",
+                "website": "website",
+            },
+        )
+        self.assertEqual(
+            list(get_nested_proxy_meta(Profile).tree["information"]["data"]),
+            [
+                "personal_information",
+                "contact_information",
+                "bank_information",
+            ],
+        )
+
+    def test_leaf_paths(self):
+        """Test flattened leaf to path map."""
+        meta = get_nested_proxy_meta(Profile)
+        self.assertEqual(
+            meta.leaf_paths["information"]["bank_name"],
+            ("information", "data", "bank_information", "bank_name"),
+        )
+        self.assertEqual(
+            meta.leaf_paths["contact_information"]["company_email"],
+            (
+                "contact_information",
+                "business_contact_information",
+                "company_email",
+            ),
+        )
+        self.assertEqual(len(meta.leaf_paths["information"]), 15)
+
+    def test_columns(self):
+        """Test column maps."""
+        meta = get_nested_proxy_meta(Profile)
+        self.assertEqual(
+            meta.columns["bank_information"],
+            ("bank_name", "bank_account_name", "bank_account_number"),
+        )
+        self.assertEqual(
+            meta.proxies_by_column["bank_name"],
+            ("bank_information", "data", "information"),
+        )
+        meta = get_nested_proxy_meta(Book)
+        self.assertEqual(
+            meta.proxies_by_column["price"], ("stock_information",)
+        )
+        self.assertNotIn("title", meta.proxies_by_column)
@@ -0,0 +1,104 @@
+"""
+Test renderers.
+"""
+import json
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+import pytest
+from rest_framework import status
+
+from books.models import Profile
+
+import factories
+
+from ..fields import RawJSON
+from ..models.expressions import nested_proxy_json_object
+from ..renderers import JSONRenderer
+
+from .base import BaseRestFrameworkTestCase
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = ("TestRawJSON",)
+
+
+@pytest.mark.django_db
+class TestRawJSON(BaseRestFrameworkTestCase):
+    """Test JSON built by the database."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up."""
+        super(TestRawJSON, cls).setUpClass()
+        cls.profiles = factories.ProfileFactory.create_batch(3)
+        cls.profile_json_listing_url = reverse("profilejson-list", kwargs={})
+        cls.profile_listing_url = reverse("profile-list", kwargs={})
+
+    def test_render(self):
+        """Test rendering RawJSON values."""
+        data = {
+            "id": 1,
+            "a": RawJSON('{"b": [1, 2], "c": "\u2028"}'),
+            "d": [RawJSON("null"), "e"],
+        }
+        rendered = JSONRenderer().render(data)
+        self.assertEqual(
+            json.loads(rendered),
+            {"id": 1, "a": {"b": [1, 2], "c": "\u2028"}, "d": [None, "e"]},
+        )
+        self.assertNotIn("\u2028".encode(), rendered)
+        self.assertEqual(JSONRenderer().render({"a": 1}), b'{"a":1}')
+
+    def test_nested_proxy_json_object(self):
+        """Test the database builds the nested document."""
+        profile = self.profiles[0]
+        value = (
+            Profile.objects.annotate(
+                bank_information_json=nested_proxy_json_object(
+                    Profile, "information.data.bank_information"
+                ),
+                information_json=nested_proxy_json_object(
+                    Profile, "information"
+                ),
+            )
+            .values_list("bank_information_json", "information_json")
+            .get(pk=profile.pk)
+        )
+        self.assertIsInstance(value[0], str)
+        self.assertEqual(
+            json.loads(value[0]),
+            {
+                "bank_name": profile.bank_name,
+                "bank_account_name": profile.bank_account_name,
+                "bank_account_number": profile.bank_account_number,
+            },
+        )
+        self.assertEqual(
+            json.loads(value[1])["data"]["bank_information"],
+            json.loads(value[0]),
+        )
+        with self.assertRaises(ValueError):
+            nested_proxy_json_object(Profile, "information.data.unknown")
+
+    def test_nested_proxy_json_object_unsupported(self):
+        """Test ``JSONObject`` missing (Django < 3.2)."""
+        with mock.patch(
+            "rest_framework_tricks.models.expressions.JSONObject", None
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                nested_proxy_json_object(Profile, "information")
+
+    def test_listing(self):
+        """Test listing with JSON built by the database."""
+        response = self.client.get(self.profile_json_listing_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = self.client.get(self.profile_listing_url)
+        self.assertEqual(
+            json.loads(response.content)["results"],
+            json.loads(expected.content)["results"],
+        )
@@ -0,0 +1,833 @@
+"""
+Test serializers.
+"""
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+import pytest
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+import factories
+
+from books.models import Author, Book, Profile
+from books.serializers import (
+    AuthorSerializer,
+    BookSerializer,
+    ProfileSerializer,
+)
+
+from ..models.fields import NestedProxyField
+from ..serializers import (
+    ModelSerializer,
+    NestedProxyListSerializer,
+    build_read_plan,
+    build_write_plan,
+    nested_proxy_serializer_for,
+    pop_nested_data,
+)
+from ..serializers.nested_proxy import READ_FIELD, READ_LEAF
+
+from .base import BaseTestCase
+
+__author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
+__copyright__ = "2017-2022 Artur Barseghyan"
+__license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
+__all__ = (
+    "TestFieldCache",
+    "TestNestedProxyListSerializer",
+    "TestNestedProxySerializerFor",
+    "TestReadPlan",
+    "TestUpdate",
+    "TestWritePlan",
+)
+
+
+@pytest.mark.django_db
+class TestWritePlan(BaseTestCase):
+    """Test write plan of nested proxy serializers."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_build_write_plan(self):
+        """Test build write plan."""
+        self.assertEqual(
+            build_write_plan(AuthorSerializer()),
+            {
+                "contact_information": {
+                    "personal_contact_information": {
+                        "email": None,
+                        "phone_number": None,
+                        "website": None,
+                    },
+                    "business_contact_information": {
+                        "company": None,
+                        "company_email": None,
+                        "company_phone_number": None,
+                        "company_website": None,
+                    },
+                },
+            },
+        )
+
+    def test_pop_nested_data(self):
+        """Test pop nested data."""
+        validated_data = {
+            "name": "Name",
+            "contact_information": {
+                "personal_contact_information": {"email": "a@example.com"},
+                "business_contact_information": {"company": "GW20e"},
+            },
+        }
+        self.assertEqual(
+            pop_nested_data(
+                build_write_plan(AuthorSerializer()), validated_data
+            ),
+            {"email": "a@example.com", "company": "GW20e"},
+        )
+        self.assertEqual(validated_data, {"name": "Name"})
+
+    def test_write_plan_cached_per_class(self):
+        """Test write plan is built once per serializer class."""
+
+        class SubBookSerializer(BookSerializer):
+            class Meta(BookSerializer.Meta):
+                fields = ("id", "title", "publishing_information")
+
+        plan = BookSerializer().get_write_plan()
+        self.assertIs(BookSerializer().get_write_plan(), plan)
+        sub_plan = SubBookSerializer().get_write_plan()
+        self.assertIs(SubBookSerializer().get_write_plan(), sub_plan)
+        self.assertEqual(
+            set(plan), {"publishing_information", "stock_information"}
+        )
+        self.assertEqual(set(sub_plan), {"publishing_information"})
+
+    def test_write_plan_of_pruned_instance(self):
+        """Test write plan is built from the fields of the class."""
+
+        class PrunedBookSerializer(BookSerializer):
+            class Meta(BookSerializer.Meta):
+                pass
+
+        serializer = PrunedBookSerializer()
+        del serializer.fields["publishing_information"]
+        self.assertEqual(
+            set(serializer.get_write_plan()),
+            {"publishing_information", "stock_information"},
+        )
+
+        serializer = PrunedBookSerializer(
+            data={
+                "title": "Title",
+                "publishing_information": {
+                    "publication_date": "2020-01-01",
+                    "isbn": "978-0-00-000000-0",
+                    "pages": 100,
+                },
+                "stock_information": {
+                    "stock_count": 1,
+                    "price": "9.99",
+                    "state": "published",
+                },
+            }
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        book = serializer.save()
+        self.assertEqual(book.isbn, "978-0-00-000000-0")
+
+    def test_write_plan_of_dynamic_fields(self):
+        """Test write plan of fields depending on the instance."""
+
+        class DynamicBookSerializer(BookSerializer):
+            def get_fields(self):
+                fields = super().get_fields()
+                if self.context.get("brief"):
+                    del fields["stock_information"]
+                return fields
+
+        serializer = DynamicBookSerializer(context={"brief": True})
+        self.assertEqual(
+            set(serializer.get_write_plan()), {"publishing_information"}
+        )
+        self.assertEqual(
+            set(DynamicBookSerializer().get_write_plan()),
+            {"publishing_information", "stock_information"},
+        )
+        self.assertNotIn(
+            "_nested_proxy_write_plan", DynamicBookSerializer.__dict__
+        )
+
+
+class CatalogueBook(Book):
+    """Book with a relational leaf in a nested proxy field."""
+
+    catalogue = NestedProxyField("isbn", "authors")
+
+    class Meta:
+        """Meta options."""
+
+        app_label = "books"
+        proxy = True
+
+
+class CatalogueSerializer(serializers.ModelSerializer):
+    """Catalogue serializer (relational leaf)."""
+
+    class Meta:
+        """Meta options."""
+
+        model = CatalogueBook
+        fields = ("isbn", "authors")
+        nested_proxy_field = True
+
+
+class CatalogueBookSerializer(ModelSerializer):
+    """Catalogue book serializer."""
+
+    catalogue = CatalogueSerializer(read_only=True)
+
+    class Meta:
+        """Meta options."""
+
+        model = CatalogueBook
+        fields = ("id", "catalogue")
+
+
+class BulkAuthorSerializer(AuthorSerializer):
+    """Author serializer, bulk creating and updating lists."""
+
+    class Meta(AuthorSerializer.Meta):
+        """Meta options."""
+
+        list_serializer_class = NestedProxyListSerializer
+
+
+@pytest.mark.django_db
+class TestNestedProxyListSerializer(BaseTestCase):
+    """Test NestedProxyListSerializer."""
+
+    pytestmark = pytest.mark.django_db
+
+    def _get_data(self, count):
+        """Get data to post.
+
+        :param count: Number of items.
+        :return: List of items.
+        :rtype: list
+        """
+        return [
+            {
+                "salutation": "Dr.",
+                "name": "Author {}".format(__i),
+                "contact_information": {
+                    "personal_contact_information": {
+                        "email": "author{}@example.com".format(__i),
+                    },
+                    "business_contact_information": {
+                        "company": "Company {}".format(__i),
+                    },
+                },
+            }
+            for __i in range(count)
+        ]
+
+    def _get_inserts(self, serializer):
+        """Save the serializer and return the INSERT queries made.
+
+        :param serializer: Serializer.
+        :return: List of SQL statements.
+        :rtype: list
+        """
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with CaptureQueriesContext(connection) as context:
+            serializer.save()
+        return [
+            __query["sql"]
+            for __query in context.captured_queries
+            if __query["sql"].startswith("INSERT")
+        ]
+
+    def test_used_for_many(self):
+        """Test NestedProxyListSerializer is used if set in the ``Meta``."""
+        self.assertIsInstance(
+            BulkAuthorSerializer(many=True), NestedProxyListSerializer
+        )
+
+    def test_not_used_by_default(self):
+        """Test NestedProxyListSerializer is opt-in."""
+        self.assertIs(
+            AuthorSerializer(many=True).__class__, serializers.ListSerializer
+        )
+
+    def test_bulk_create(self):
+        """Test all instances are created in a single query."""
+        serializer = BulkAuthorSerializer(data=self._get_data(5), many=True)
+        self.assertEqual(len(self._get_inserts(serializer)), 1)
+        authors = serializer.instance
+        self.assertEqual(len(authors), 5)
+        if connection.features.can_return_rows_from_bulk_insert:
+            for __author in authors:
+                self.assertIsNotNone(__author.pk)
+        author = Author.objects.get(name="Author 3")
+        self.assertEqual(author.email, "author3@example.com")
+        self.assertEqual(author.company, "Company 3")
+
+    def test_bulk_create_batch_size(self):
+        """Test batch size."""
+
+        class BatchBulkAuthorSerializer(BulkAuthorSerializer):
+            class Meta(BulkAuthorSerializer.Meta):
+                bulk_create_batch_size = 2
+
+        serializer = BatchBulkAuthorSerializer(
+            data=self._get_data(5), many=True
+        )
+        self.assertEqual(len(self._get_inserts(serializer)), 3)
+        self.assertEqual(
+            Author.objects.filter(name__startswith="Author").count(), 5
+        )
+
+    def test_custom_create(self):
+        """Test customised ``create`` of the child serializer is respected."""
+
+        class CustomBulkAuthorSerializer(BulkAuthorSerializer):
+            def create(self, validated_data):
+                validated_data["biography"] = "Custom"
+                return super().create(validated_data)
+
+        serializer = CustomBulkAuthorSerializer(
+            data=self._get_data(2), many=True
+        )
+        self.assertEqual(len(self._get_inserts(serializer)), 2)
+        self.assertEqual(Author.objects.filter(biography="Custom").count(), 2)
+
+    def _get_queries(self, serializer):
+        """Validate and save the serializer, return the SELECT/UPDATE queries.
+
+        :param serializer: Serializer.
+        :return: List of SQL statements.
+        :rtype: list
+        """
+        with CaptureQueriesContext(connection) as context:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            serializer.save()
+        return [
+            __query["sql"]
+            for __query in context.captured_queries
+            if __query["sql"].startswith(("SELECT", "UPDATE"))
+        ]
+
+    def test_bulk_update(self):
+        """Test all instances are fetched and updated in single queries."""
+        authors = factories.AuthorFactory.create_batch(4)
+        serializer = BulkAuthorSerializer(
+            Author.objects.all(),
+            data=[
+                {
+                    "id": authors[0].pk,
+                    "contact_information": {
+                        "personal_contact_information": {
+                            "email": "first@example.com",
+                        },
+                    },
+                },
+                {
+                    "id": authors[2].pk,
+                    "name": "Third",
+                    "contact_information": {
+                        "business_contact_information": {
+                            "company": "GW20e",
+                        },
+                    },
+                },
+            ],
+            many=True,
+            partial=True,
+        )
+        queries = self._get_queries(serializer)
+        self.assertEqual(len(queries), 2)
+        self.assertTrue(queries[0].startswith("SELECT"))
+        self.assertTrue(queries[1].startswith("UPDATE"))
+        for __column in ("email", "name", "company"):
+            self.assertIn('"{}"'.format(__column), queries[1])
+        self.assertNotIn('"biography"', queries[1])
+        self.assertEqual(
+            [__author.pk for __author in serializer.instance],
+            [authors[0].pk, authors[2].pk],
+        )
+
+        authors = [Author.objects.get(pk=__a.pk) for __a in authors]
+        self.assertEqual(authors[0].email, "first@example.com")
+        self.assertEqual(authors[2].name, "Third")
+        self.assertEqual(authors[2].company, "GW20e")
+
+    def test_bulk_update_batch_size(self):
+        """Test batch size of updates."""
+
+        class BatchBulkAuthorSerializer(BulkAuthorSerializer):
+            class Meta(BulkAuthorSerializer.Meta):
+                bulk_update_batch_size = 2
+
+        authors = factories.AuthorFactory.create_batch(5)
+        serializer = BatchBulkAuthorSerializer(
+            authors,
+            data=[
+                {"id": __author.pk, "name": "Author {}".format(__i)}
+                for __i, __author in enumerate(authors)
+            ],
+            many=True,
+            partial=True,
+        )
+        queries = self._get_queries(serializer)
+        self.assertEqual(len(queries), 3)
+        self.assertEqual(Author.objects.get(pk=authors[4].pk).name, "Author 4")
+
+    def test_bulk_update_not_found(self):
+        """Test updating instances which do not exist."""
+        author = factories.AuthorFactory()
+        serializer = BulkAuthorSerializer(
+            Author.objects.all(),
+            data=[{"id": author.pk, "name": "Name"}, {"id": 0, "name": "0"}],
+            many=True,
+            partial=True,
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors[0], {})
+        self.assertIn("id", serializer.errors[1])
+        self.assertNotEqual(Author.objects.get(pk=author.pk).name, "Name")
+
+    def test_bulk_update_invalid_pk(self):
+        """Test updating instances by missing or malformed primary keys."""
+        author = factories.AuthorFactory()
+        for __item in ({"id": "abc"}, {"id": [1]}, {}):
+            serializer = BulkAuthorSerializer(
+                Author.objects.all(),
+                data=[{"id": author.pk, "name": "Name"}, __item],
+                many=True,
+                partial=True,
+            )
+            self.assertFalse(serializer.is_valid())
+            self.assertEqual(serializer.errors[0], {})
+            self.assertIn("id", serializer.errors[1])
+
+    def test_bulk_update_unchanged(self):
+        """Test unchanged instances are not written."""
+        authors = factories.AuthorFactory.create_batch(3)
+        authors = [Author.objects.get(pk=__a.pk) for __a in authors]
+        serializer = BulkAuthorSerializer(
+            authors,
+            data=[
+                {"id": authors[0].pk, "name": authors[0].name},
+                {"id": authors[1].pk, "name": authors[1].name + " Jr."},
+                {"id": authors[2].pk, "salutation": authors[2].salutation},
+            ],
+            many=True,
+            partial=True,
+        )
+        queries = self._get_queries(serializer)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"salutation"', queries[0])
+        self.assertEqual(
+            queries[0].count("WHEN"), 1, "Only one instance is written"
+        )
+        self.assertEqual(serializer.changed_fields, frozenset({"name"}))
+
+        # Nothing changed
+        serializer = BulkAuthorSerializer(
+            authors,
+            data=[{"id": authors[0].pk, "name": authors[0].name}],
+            many=True,
+            partial=True,
+        )
+        self.assertEqual(self._get_queries(serializer), [])
+        self.assertEqual(serializer.changed_fields, frozenset())
+
+
+@pytest.mark.django_db
+class TestUpdate(BaseTestCase):
+    """Test update of a single instance."""
+
+    pytestmark = pytest.mark.django_db
+
+    def _save(self, serializer):
+        """Save the serializer and return the UPDATE queries made.
+
+        :param serializer: Serializer.
+        :return: List of SQL statements.
+        :rtype: list
+        """
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with CaptureQueriesContext(connection) as context:
+            serializer.save()
+        return [
+            __query["sql"]
+            for __query in context.captured_queries
+            if __query["sql"].startswith("UPDATE")
+        ]
+
+    def test_nested_proxy_field_source(self):
+        """Test fields written through a NestedProxyField are saved."""
+
+        class PublishingBookSerializer(ModelSerializer):
+            publishing = serializers.DictField(source="publishing_information")
+
+            class Meta:
+                model = Book
+                fields = ("id", "publishing")
+
+        book = factories.BookFactory()
+        serializer = PublishingBookSerializer(
+            Book.objects.get(pk=book.pk),
+            data={"publishing": {"isbn": "978-0-00-000000-0"}},
+            partial=True,
+        )
+        queries = self._save(serializer)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"isbn"', queries[0])
+        self.assertNotIn('"title"', queries[0])
+        self.assertEqual(serializer.changed_fields, frozenset({"isbn"}))
+        self.assertEqual(
+            Book.objects.get(pk=book.pk).isbn, "978-0-00-000000-0"
+        )
+
+    def test_property_source(self):
+        """Test attributes which are not fields save all the fields."""
+
+        def set_alias(author, value):
+            author.name = value
+
+        class AliasAuthorSerializer(ModelSerializer):
+            alias = serializers.CharField(write_only=True)
+
+            class Meta:
+                model = Author
+                fields = ("id", "alias")
+
+        author = factories.AuthorFactory()
+        with mock.patch.object(
+            Author,
+            "alias",
+            property(lambda __a: __a.name, set_alias),
+            create=True,
+        ):
+            serializer = AliasAuthorSerializer(
+                Author.objects.get(pk=author.pk),
+                data={"alias": "Alias"},
+                partial=True,
+            )
+            queries = self._save(serializer)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"salutation"', queries[0])
+        self.assertIn("name", serializer.changed_fields)
+        self.assertEqual(Author.objects.get(pk=author.pk).name, "Alias")
+
+
+def generic(serializer_class):
+    """Get a copy of the serializer class with compiled representation off.
+
+    :param serializer_class: Serializer class.
+    :return: Serializer class.
+    """
+    meta = type(
+        "Meta",
+        (serializer_class.Meta,),
+        {"compiled_representation": False},
+    )
+    return type(serializer_class.__name__, (serializer_class,), {"Meta": meta})
+
+
+@pytest.mark.django_db
+class TestReadPlan(BaseTestCase):
+    """Test read plan (compiled representation) of serializers."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up class."""
+        super(TestReadPlan, cls).setUpTestData()
+        factories.BookFactory.create_batch(3)
+        factories.ProfileFactory.create_batch(3)
+
+    def test_same_representation(self):
+        """Test representation is the same as the generic one."""
+        context = {"request": APIRequestFactory().get("/")}
+        for __serializer_class, __queryset in (
+            (ProfileSerializer, Profile.objects.all()),
+            (AuthorSerializer, Author.objects.all()),
+            (BookSerializer, Book.objects.all()),
+        ):
+            self.assertEqual(
+                __serializer_class(
+                    __queryset, many=True, context=context
+                ).data,
+                generic(__serializer_class)(
+                    __queryset, many=True, context=context
+                ).data,
+            )
+
+    def test_build_read_plan(self):
+        """Test nested proxy leaves are read from the instance."""
+        steps, size = build_read_plan(AuthorSerializer())
+        self.assertEqual(size, 4)
+        leaves = [__s[2] for __s in steps if __s[0] == READ_LEAF]
+        self.assertEqual(
+            leaves,
+            [
+                "email",
+                "phone_number",
+                "website",
+                "company",
+                "company_email",
+                "company_phone_number",
+                "company_website",
+            ],
+        )
+        self.assertEqual(
+            [__s[2] for __s in steps if __s[0] == READ_FIELD],
+            ["id", "salutation", "name", "birth_date", "biography"],
+        )
+
+    def test_relational_leaf(self):
+        """Test leaves customising ``get_attribute`` are not flattened."""
+        book = CatalogueBook.objects.get(pk=factories.BookFactory().pk)
+        book.authors.set(factories.AuthorFactory.create_batch(2))
+        serializer = CatalogueBookSerializer(book)
+        self.assertEqual(
+            serializer.data["catalogue"],
+            {
+                "isbn": book.isbn,
+                "authors": list(book.authors.values_list("pk", flat=True)),
+            },
+        )
+        steps, _size = build_read_plan(serializer)
+        self.assertEqual(
+            [(__s[0], __s[2]) for __s in steps],
+            [(READ_FIELD, "id"), (READ_FIELD, "catalogue")],
+        )
+
+    def test_nested_proxy_values_not_built(self):
+        """Test nested proxy field values are not built."""
+        profile = Profile.objects.first()
+        with mock.patch.object(
+            Profile.information,
+            "compile",
+            side_effect=AssertionError("information should not be built"),
+        ), mock.patch.dict(Profile.information._getters, clear=True):
+            data = ProfileSerializer(profile).data
+        self.assertEqual(
+            data["information"]["data"]["bank_information"]["bank_name"],
+            profile.bank_name,
+        )
+
+    def test_deferred(self):
+        """Test deferred leaves are loaded in a single query."""
+        profile = Profile.objects.defer("first_name", "bank_name").first()
+        with self.assertNumQueries(1):
+            data = ProfileSerializer(profile).data
+        self.assertEqual(
+            data["information"]["data"]["personal_information"]["first_name"],
+            Profile.objects.get(pk=profile.pk).first_name,
+        )
+
+    def test_custom_nested_representation(self):
+        """Test customised nested representation is respected."""
+
+        class InformationSerializer(
+            ProfileSerializer._declared_fields["information"].__class__
+        ):
+            def to_representation(self, instance):
+                return "custom"
+
+        class CustomProfileSerializer(ProfileSerializer):
+            information = InformationSerializer(required=False)
+
+        profile = Profile.objects.first()
+        self.assertEqual(
+            CustomProfileSerializer(profile).data["information"], "custom"
+        )
+
+
+@pytest.mark.django_db
+class TestFieldCache(BaseTestCase):
+    """Test fields of nested proxy serializers are built once per class."""
+
+    pytestmark = pytest.mark.django_db
+
+    def test_fields_cloned(self):
+        """Test fields are built once and cloned for every instance."""
+        first = ProfileSerializer()
+        second = ProfileSerializer()
+        self.assertEqual(list(first.fields), list(second.fields))
+        self.assertIn(
+            "_nested_proxy_field_prototypes", vars(ProfileSerializer)
+        )
+
+        with mock.patch.object(
+            serializers.ModelSerializer,
+            "build_field",
+            side_effect=AssertionError("fields should not be built"),
+        ):
+            serializer = ProfileSerializer()
+            data = serializer.fields["information"].fields["data"]
+
+        self.assertIsNot(data, first.fields["information"].fields["data"])
+        self.assertIs(data.parent, serializer.fields["information"])
+        self.assertIs(data.root, serializer)
+        self.assertEqual(
+            data.fields["bank_information"].fields["bank_name"].source_attrs,
+            ["bank_name"],
+        )
+
+    def test_custom_get_fields(self):
+        """Test nested serializers with customised get_fields."""
+        information_class = ProfileSerializer._declared_fields[
+            "information"
+        ].__class__
+
+        class InformationSerializer(information_class):
+            def get_fields(self):
+                fields = super().get_fields()
+                fields["extra"] = serializers.CharField(
+                    default="extra", source="*", read_only=True
+                )
+                return fields
+
+        class CustomProfileSerializer(ProfileSerializer):
+            information = InformationSerializer(required=False)
+
+        serializer = CustomProfileSerializer()
+        self.assertIn("extra", serializer.fields["information"].fields)
+        self.assertNotIn(
+            "_nested_proxy_field_prototypes", vars(InformationSerializer)
+        )
+
+    def test_custom_field_names(self):
+        """Test fields depending on the context are not cached."""
+
+        class CtxSerializer(BookSerializer):
+            def get_field_names(self, declared_fields, info):
+                if self.context.get("short"):
+                    return ["id"]
+                return super().get_field_names(declared_fields, info)
+
+        self.assertEqual(
+            list(CtxSerializer(context={"short": True}).fields), ["id"]
+        )
+        self.assertIn("title", CtxSerializer(context={}).fields)
+        self.assertNotIn("_nested_proxy_field_prototypes", vars(CtxSerializer))
+
+    def test_static_fields_option(self):
+        """Test ``static_fields`` option of the ``Meta``."""
+
+        class TitleSerializer(BookSerializer):
+            def build_field(self, field_name, info, model_class, depth):
+                field_class, field_kwargs = super().build_field(
+                    field_name, info, model_class, depth
+                )
+                if field_name == "title":
+                    field_kwargs["help_text"] = "Title"
+                return field_class, field_kwargs
+
+        class StaticTitleSerializer(TitleSerializer):
+            class Meta(TitleSerializer.Meta):
+                static_fields = True
+
+        for __serializer_class, __cached in (
+            (TitleSerializer, False),
+            (StaticTitleSerializer, True),
+        ):
+            serializer = __serializer_class()
+            self.assertEqual(serializer.fields["title"].help_text, "Title")
+            self.assertEqual(
+                "_nested_proxy_field_prototypes" in vars(__serializer_class),
+                __cached,
+            )
+
+
+@pytest.mark.django_db
+class TestNestedProxySerializerFor(BaseTestCase):
+    """Test nested proxy serializers generated from the model."""
+
+    pytestmark = pytest.mark.django_db
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up class."""
+        super(TestNestedProxySerializerFor, cls).setUpTestData()
+        factories.ProfileFactory.create_batch(3)
+
+        class GeneratedProfileSerializer(ModelSerializer):
+            information = nested_proxy_serializer_for(Profile, "information")(
+                required=False
+            )
+
+            class Meta:
+                model = Profile
+                fields = ("id", "information")
+
+        cls.serializer_class = GeneratedProfileSerializer
+
+    def test_cached(self):
+        """Test serializer classes are generated once and shared."""
+        serializer_class = nested_proxy_serializer_for(Profile, "information")
+        self.assertIs(
+            nested_proxy_serializer_for(Profile, "information"),
+            serializer_class,
+        )
+        self.assertEqual(
+            serializer_class.__name__, "ProfileInformationSerializer"
+        )
+        self.assertIs(
+            serializer_class._declared_fields["data"].__class__,
+            nested_proxy_serializer_for(Profile, "data"),
+        )
+        self.assertIs(
+            nested_proxy_serializer_for(Profile, "information.data"),
+            nested_proxy_serializer_for(Profile, "information.data"),
+        )
+
+    def test_invalid_path(self):
+        """Test paths which are not nested proxy field paths."""
+        for __path in ("first_name", "information.data.bank_name", "wrong"):
+            with self.assertRaises(ValueError):
+                nested_proxy_serializer_for(Profile, __path)
+
+    def test_same_as_declared(self):
+        """Test output and write plan match the declared serializers."""
+        queryset = Profile.objects.all()
+        self.assertEqual(
+            self.serializer_class(queryset, many=True).data,
+            ProfileSerializer(queryset, many=True).data,
+        )
+        self.assertEqual(
+            build_write_plan(self.serializer_class()),
+            build_write_plan(ProfileSerializer()),
+        )
+
+    def test_write(self):
+        """Test writing using generated serializers."""
+        serializer = self.serializer_class(
+            data={
+                "information": {
+                    "data": {
+                        "personal_information": {
+                            "salutation": "Dr.",
+                            "first_name": "Artur",
+                            "last_name": "Barseghyan",
+                        },
+                        "contact_information": {
+                            "personal_contact_information": {
+                                "email": "artur@example.com",
+                            },
+                        },
+                    }
+                }
+            }
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        profile = Profile.objects.get(pk=serializer.save().pk)
+        self.assertEqual(profile.first_name, "Artur")
+        self.assertEqual(profile.email, "artur@example.com")
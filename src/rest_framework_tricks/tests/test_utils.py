@@ -1,6 +1,10 @@
 """
 Test utils.
 """
+from collections.abc import Mapping
+import json
+import pickle
+
 import pytest
 
 from ..utils import DictProxy
@@ -33,3 +37,72 @@ class TestUtils(BaseTestCase):
             self.assertEqual(getattr(__dict_proxy, __key), __dict[__key])
 
         print(__dict_proxy)
+
+    def test_dict_proxy_mapping(self):
+        """Test DictProxy mapping protocol."""
+        __dict = {
+            "name": self.faker.name(),
+            "date": self.faker.date(),
+        }
+
+        __dict_proxy = DictProxy(__dict)
+
+        self.assertIsInstance(__dict_proxy, Mapping)
+        self.assertEqual(__dict_proxy["name"], __dict["name"])
+        self.assertEqual(list(__dict_proxy), list(__dict))
+        self.assertEqual(len(__dict_proxy), 2)
+        self.assertIn("date", __dict_proxy)
+        self.assertEqual(dict(__dict_proxy), __dict)
+        self.assertIsNone(__dict_proxy.missing)
+        with self.assertRaises(KeyError):
+            __dict_proxy["missing"]
+        with self.assertRaises(AttributeError):
+            __dict_proxy.__dict__
+
+    def test_dict_proxy_identity(self):
+        """Test DictProxy equality and hashing are by identity."""
+        __dict = {"name": self.faker.name()}
+
+        __dict_proxy = DictProxy(__dict)
+
+        self.assertEqual(__dict_proxy, __dict_proxy)
+        self.assertNotEqual(__dict_proxy, DictProxy(__dict))
+        self.assertNotEqual(__dict_proxy, __dict)
+        self.assertIn(__dict_proxy, {__dict_proxy})
+        self.assertNotIn(DictProxy(__dict), {__dict_proxy})
+
+    def test_dict_proxy_nested(self):
+        """Test nested DictProxy."""
+        __dict = {"data": {"bank_information": {"bank_name": "Bank"}}}
+
+        __dict_proxy = DictProxy(__dict)
+
+        self.assertEqual(__dict_proxy.data.bank_information.bank_name, "Bank")
+        self.assertIsInstance(__dict_proxy.data, DictProxy)
+        self.assertIs(__dict_proxy["data"], __dict["data"])
+
+    def test_dict_proxy_str(self):
+        """Test DictProxy string form."""
+        __dict = {"data": DictProxy({"name": self.faker.name()})}
+
+        __dict_proxy = DictProxy(__dict)
+
+        self.assertEqual(
+            json.loads(str(__dict_proxy)),
+            {"data": {"name": __dict["data"]["name"]}},
+        )
+        self.assertIs(str(__dict_proxy), str(__dict_proxy))
+        self.assertEqual(repr(__dict_proxy), str(__dict_proxy))
+
+    def test_dict_proxy_pickle(self):
+        """Test DictProxy pickling."""
+        __dict = {
+            "name": self.faker.name(),
+            "data": DictProxy({"date": self.faker.date()}),
+        }
+
+        __dict_proxy = pickle.loads(pickle.dumps(DictProxy(__dict)))
+
+        self.assertIsInstance(__dict_proxy, DictProxy)
+        self.assertEqual(__dict_proxy.name, __dict["name"])
+        self.assertEqual(__dict_proxy.data.date, __dict["data"]["date"])
@@ -2,6 +2,7 @@
 Utils.
 """
 
+from collections.abc import Mapping
 import json
 
 __author__ = "Artur Barseghyan <artur.barseghyan@gmail.com>"
@@ -10,9 +11,46 @@ __license__ = "GPL-2.0-only OR LGPL-2.1-or-later"
 __all__ = ("DictProxy",)
 
 
-class DictProxy:
+def to_json_default(obj):
+    """Default for ``json.dumps``, encoding mappings without copying dicts.
+
+    :param obj: Object ``json.dumps`` can't encode.
+    :return: Object ``json.dumps`` can encode.
+    """
+    if isinstance(obj, DictProxy):
+        return obj._mapping
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(
+            obj.__class__.__name__
+        )
+    )
+
+
+def to_dict(mapping):
+    """Convert (nested) mappings into (nested) dicts.
+
+    :param mapping: Mapping.
+    :return: Dictionary.
+    :rtype: dict
+    """
+    return {
+        __key: to_dict(__value) if isinstance(__value, Mapping) else __value
+        for __key, __value in mapping.items()
+    }
+
+
+class DictProxy(Mapping):
     """Dictionary proxy.
 
+    Read-only. Items are available both as attributes (nested mappings are
+    wrapped into ``DictProxy`` on access) and through the mapping protocol.
+    The string form is JSON, computed once. Note, that mapping methods
+    (``get``, ``items``, ``keys``, ``values``) shadow items with the same
+    names when accessed as attributes. Equality and hashing are by identity
+    (as they used to be), compare ``dict(value)`` to compare the items.
+
     Example:
 
     >>> from rest_framework_tricks.utils import DictProxy
@@ -26,13 +64,47 @@ class DictProxy:
     >>> __dict_proxy = DictProxy(__dict)
     """
 
+    __slots__ = ("_mapping", "_str")
+
     def __init__(self, mapping):
-        self.__mapping = mapping
+        self._mapping = mapping
+        self._str = None
 
     def __getattr__(self, item):
-        return self.__mapping.get(item, None)
+        # Do not proxy special attributes (pickle, copy, etc.)
+        if item.startswith("__"):
+            raise AttributeError(item)
+        value = self._mapping.get(item, None)
+        if isinstance(value, Mapping) and not isinstance(value, DictProxy):
+            return DictProxy(value)
+        return value
+
+    def __getitem__(self, key):
+        return self._mapping[key]
+
+    def __iter__(self):
+        return iter(self._mapping)
+
+    def __len__(self):
+        return len(self._mapping)
+
+    def __contains__(self, key):
+        return key in self._mapping
+
+    def __reduce__(self):
+        mapping = self._mapping
+        if mapping.__class__ is not dict:
+            mapping = to_dict(mapping)
+        return DictProxy, (mapping,)
 
     def __str__(self):
-        return json.dumps(self.__mapping)
+        if self._str is None:
+            self._str = json.dumps(self._mapping, default=to_json_default)
+        return self._str
 
     __repr__ = __str__
+
+    # Keep the identity semantics, Mapping makes the proxy unhashable
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__